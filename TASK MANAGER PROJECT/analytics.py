@@ -1,143 +1,224 @@
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-from task_manager import TaskManager
-from time_tracker import TimeTracker
-from habit_tracker import HabitTracker
-
-
-class Analytics:
-    def __init__(self, db_path="task_manager.db"):
-        self.task_manager = TaskManager(db_path)
-        self.time_tracker = TimeTracker(db_path)
-        self.habit_tracker = HabitTracker(db_path)
-
-    def get_productivity_insights(self, days=7):
-        """Get comprehensive productivity insights"""
-        task_stats = self.task_manager.get_task_statistics()
-        time_stats = self.time_tracker.get_time_statistics(days)
-        habit_stats = self.habit_tracker.get_habit_statistics()
-
-        insights = {
-            'task_completion_rate': task_stats['completion_rate'],
-            'total_time_tracked': time_stats['total_time_minutes'],
-            'habit_completion_rate': habit_stats['completion_rate'],
-            'average_streak': habit_stats['average_streak'],
-            'overdue_tasks': task_stats['overdue_tasks'],
-            'total_habits': habit_stats['total_habits']
-        }
-
-        # Calculate productivity score (0-100)
-        productivity_score = self._calculate_productivity_score(insights)
-        insights['productivity_score'] = productivity_score
-
-        return insights
-
-    def _calculate_productivity_score(self, insights):
-        """Calculate overall productivity score"""
-        score = 0
-
-        # Task completion contributes 40%
-        task_score = min(insights['task_completion_rate'], 100)
-        score += task_score * 0.4
-
-        # Habit completion contributes 30%
-        habit_score = insights['habit_completion_rate']
-        score += habit_score * 0.3
-
-        # Time tracking contributes 20% (normalized)
-        time_score = min(insights['total_time_tracked'] / 60, 100)  # Normalize to 100
-        score += time_score * 0.2
-
-        # Overdue tasks penalty -10%
-        overdue_penalty = min(insights['overdue_tasks'] * 5, 10)
-        score -= overdue_penalty
-
-        return max(0, min(100, round(score)))
-
-    def generate_task_completion_chart(self):
-        """Generate task completion chart"""
-        stats = self.task_manager.get_task_statistics()
-
-        if not stats['status_distribution']:
-            return None
-
-        labels = list(stats['status_distribution'].keys())
-        sizes = list(stats['status_distribution'].values())
-
-        plt.figure(figsize=(8, 6))
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
-        plt.title('Task Status Distribution')
-        plt.axis('equal')
-
-        return plt
-
-    def generate_time_tracking_chart(self, days=7):
-        """Generate time tracking chart"""
-        stats = self.time_tracker.get_time_statistics(days)
-
-        if not stats['daily_breakdown']:
-            return None
-
-        dates = [item['date'] for item in stats['daily_breakdown']]
-        times = [item['total_time'] / 60 for item in stats['daily_breakdown']]  # Convert to hours
-
-        plt.figure(figsize=(10, 6))
-        plt.bar(dates, times)
-        plt.title('Time Tracked (Last 7 Days)')
-        plt.xlabel('Date')
-        plt.ylabel('Hours')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        return plt
-
-    def generate_habit_streak_chart(self):
-        """Generate habit streak chart"""
-        habits = self.habit_tracker.get_all_habits()
-
-        if not habits:
-            return None
-
-        habit_names = [habit.name for habit in habits]
-        streaks = [habit.streak_count for habit in habits]
-
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(habit_names, streaks)
-        plt.title('Current Habit Streaks')
-        plt.xlabel('Habits')
-        plt.ylabel('Streak (days)')
-        plt.xticks(rotation=45)
-
-        # Add value labels on bars
-        for bar, streak in zip(bars, streaks):
-            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                     str(streak), ha='center', va='bottom')
-
-        plt.tight_layout()
-        return plt
-
-    def get_recommendations(self):
-        """Get personalized productivity recommendations"""
-        insights = self.get_productivity_insights()
-        recommendations = []
-
-        if insights['task_completion_rate'] < 50:
-            recommendations.append("📋 Focus on completing pending tasks to improve your completion rate")
-
-        if insights['overdue_tasks'] > 0:
-            recommendations.append("⏰ You have overdue tasks. Consider rescheduling or prioritizing them")
-
-        if insights['total_time_tracked'] < 300:  # Less than 5 hours
-            recommendations.append("⏱️ Try tracking more time using the Pomodoro timer")
-
-        if insights['habit_completion_rate'] < 60:
-            recommendations.append("🔄 Consistency is key! Try to maintain your habit streaks")
-
-        if insights['productivity_score'] > 80:
-            recommendations.append("🎉 Great job! Your productivity is excellent. Keep it up!")
-        elif insights['productivity_score'] > 60:
-            recommendations.append("👍 Good progress! Small improvements can boost your productivity further")
-        else:
-            recommendations.append("💪 Let's work on building better habits and task management")
-
+from datetime import datetime, timedelta
+from task_manager import TaskManager
+from time_tracker import TimeTracker
+from habit_tracker import HabitTracker
+from productivity_history import ProductivityHistory
+from downsample import downsample_series
+
+
+# Most points a time series chart draws, whatever the range
+CHART_POINT_BUDGET = 200
+
+# Ranges with at most this many buckets are drawn as bars, longer ones as a line
+MAX_BARS = 31
+
+
+def _pyplot():
+    """matplotlib is imported on the first chart, so insights alone stay light (e.g. for the CLI)"""
+    import matplotlib.pyplot as plt
+    return plt
+
+
+class Analytics:
+    def __init__(self, db_path="task_manager.db"):
+        self.task_manager = TaskManager(db_path)
+        self.time_tracker = TimeTracker(db_path)
+        self.habit_tracker = HabitTracker(db_path)
+        self.history = ProductivityHistory(db_path)
+
+    def get_productivity_insights(self, days=7):
+        """Get comprehensive productivity insights"""
+        task_stats = self.task_manager.get_task_statistics()
+        time_stats = self.time_tracker.get_time_statistics(days)
+        habit_stats = self.habit_tracker.get_habit_statistics()
+
+        return self._build_insights(task_stats, time_stats, habit_stats)
+
+    def _build_insights(self, task_stats, time_stats, habit_stats):
+        """Combine task, time and habit statistics into insights"""
+        insights = {
+            'task_completion_rate': task_stats['completion_rate'],
+            'total_time_tracked': time_stats['total_time_minutes'],
+            'habit_completion_rate': habit_stats['completion_rate'],
+            'average_streak': habit_stats['average_streak'],
+            'overdue_tasks': task_stats['overdue_tasks'],
+            'total_habits': habit_stats['total_habits']
+        }
+
+        # Calculate productivity score (0-100)
+        productivity_score = self._calculate_productivity_score(insights)
+        insights['productivity_score'] = productivity_score
+
+        return insights
+
+    def _calculate_productivity_score(self, insights):
+        """Calculate overall productivity score"""
+        score = 0
+
+        # Task completion contributes 40%
+        task_score = min(insights['task_completion_rate'], 100)
+        score += task_score * 0.4
+
+        # Habit completion contributes 30%
+        habit_score = insights['habit_completion_rate']
+        score += habit_score * 0.3
+
+        # Time tracking contributes 20% (normalized)
+        time_score = min(insights['total_time_tracked'] / 60, 100)  # Normalize to 100
+        score += time_score * 0.2
+
+        # Overdue tasks penalty -10%
+        overdue_penalty = min(insights['overdue_tasks'] * 5, 10)
+        score -= overdue_penalty
+
+        return max(0, min(100, round(score)))
+
+    def generate_task_completion_chart(self):
+        """Generate task completion chart"""
+        stats = self.task_manager.get_task_statistics()
+
+        if not stats['status_distribution']:
+            return None
+
+        labels = list(stats['status_distribution'].keys())
+        sizes = list(stats['status_distribution'].values())
+
+        plt = _pyplot()
+        plt.figure(figsize=(8, 6))
+        plt.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
+        plt.title('Task Status Distribution')
+        plt.axis('equal')
+
+        return plt
+
+    def generate_time_tracking_chart(self, days=7, start_date=None, end_date=None,
+                                     max_points=CHART_POINT_BUDGET):
+        """Generate time tracking chart for the last `days` days or start_date..end_date
+
+        Long ranges are summed into weeks, months or years in the database
+        and thinned with LTTB, so the chart never draws more than max_points.
+        """
+        if start_date is None:
+            title = f'Time Tracked (Last {days} Days)'
+            start_date = (end_date or datetime.now()) - timedelta(days=days - 1)
+        else:
+            title = f'Time Tracked ({start_date:%Y-%m-%d} to {end_date or datetime.now():%Y-%m-%d})'
+        bucket, series = self.time_tracker.get_time_series(start_date, end_date)
+
+        if not any(seconds for _, seconds in series):
+            return None
+
+        series = downsample_series(series, max_points)
+        dates = [datetime.fromisoformat(day) for day, _ in series]
+        hours = [seconds / 3600 for _, seconds in series]
+
+        plt = _pyplot()
+        plt.figure(figsize=(10, 6))
+        if len(series) <= MAX_BARS:
+            plt.bar([day.strftime('%Y-%m-%d') for day in dates], hours)
+        else:
+            plt.plot(dates, hours)
+        plt.title(title)
+        plt.xlabel('Date')
+        plt.ylabel(f'Hours per {bucket}')
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+
+        return plt
+
+    def generate_habit_streak_chart(self):
+        """Generate habit streak chart"""
+        habits = self.habit_tracker.get_all_habits()
+
+        if not habits:
+            return None
+
+        habit_names = [habit.name for habit in habits]
+        streaks = [habit.streak_count for habit in habits]
+
+        plt = _pyplot()
+        plt.figure(figsize=(10, 6))
+        bars = plt.bar(habit_names, streaks)
+        plt.title('Current Habit Streaks')
+        plt.xlabel('Habits')
+        plt.ylabel('Streak (days)')
+        plt.xticks(rotation=45)
+
+        # Add value labels on bars
+        for bar, streak in zip(bars, streaks):
+            plt.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
+                     str(streak), ha='center', va='bottom')
+
+        plt.tight_layout()
+        return plt
+
+    def get_duration_percentiles(self, days=30):
+        """Percentiles of session lengths (seconds) and task completion times (minutes)"""
+        return {
+            'sessions': self.time_tracker.get_session_percentiles(days),
+            'sessions_by_type': self.time_tracker.get_session_percentiles_by_type(days),
+            'tasks': self.task_manager.get_completion_percentiles(days),
+            'tasks_by_category': self.task_manager.get_completion_percentiles_by_category(days)
+        }
+
+    def record_daily_snapshot(self):
+        """Store today's insights in the history, backfilling any days missed since the last run"""
+        return self.history.record(self.get_productivity_insights(), self._calculate_productivity_score)
+
+    def get_score_history(self, days=365):
+        """Get the recorded daily insights of the last `days` days, oldest first"""
+        return self.history.get_history(days)
+
+    def generate_score_trend_chart(self, days=365):
+        """Generate productivity score trend chart"""
+        history = self.get_score_history(days)
+
+        if not history:
+            return None
+
+        points = downsample_series([(row['day'], row['productivity_score']) for row in history],
+                                   CHART_POINT_BUDGET)
+        dates = [datetime.fromisoformat(day) for day, _ in points]
+        scores = [score for _, score in points]
+
+        plt = _pyplot()
+        plt.figure(figsize=(10, 6))
+        plt.plot(dates, scores, marker='o' if len(history) <= 31 else None)
+        plt.title(f'Productivity Score (Last {days} Days)')
+        plt.xlabel('Date')
+        plt.ylabel('Score')
+        plt.ylim(0, 100)
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+
+        return plt
+
+    def get_recommendations(self):
+        """Get personalized productivity recommendations"""
+        insights = self.get_productivity_insights()
+        return self._recommendations_for(insights)
+
+    def _recommendations_for(self, insights):
+        """Build recommendations from productivity insights"""
+        recommendations = []
+
+        if insights['task_completion_rate'] < 50:
+            recommendations.append("📋 Focus on completing pending tasks to improve your completion rate")
+
+        if insights['overdue_tasks'] > 0:
+            recommendations.append("⏰ You have overdue tasks. Consider rescheduling or prioritizing them")
+
+        if insights['total_time_tracked'] < 300:  # Less than 5 hours
+            recommendations.append("⏱️ Try tracking more time using the Pomodoro timer")
+
+        if insights['habit_completion_rate'] < 60:
+            recommendations.append("🔄 Consistency is key! Try to maintain your habit streaks")
+
+        if insights['productivity_score'] > 80:
+            recommendations.append("🎉 Great job! Your productivity is excellent. Keep it up!")
+        elif insights['productivity_score'] > 60:
+            recommendations.append("👍 Good progress! Small improvements can boost your productivity further")
+        else:
+            recommendations.append("💪 Let's work on building better habits and task management")
+
         return recommendations
\ No newline at end of file
@@ -0,0 +1,471 @@
+"""Headless HTTP/JSON API over the task, time and habit managers
+
+Usage:
+
+    python api_server.py --port 8080
+    python api_server.py --db data/team.db --pool-size 16 --max-concurrency 64
+
+Endpoints (JSON request and response bodies):
+
+    GET    /tasks?status=&category=     List tasks
+    POST   /tasks                       Create a task
+    GET    /tasks/overdue               Overdue tasks
+    GET    /tasks/stats                 Task statistics
+    GET    /tasks/percentiles?days=30&category=    Completion time percentiles (minutes)
+    GET    /tasks/unblocked             Open tasks with no open dependencies
+    GET    /tasks/critical-path?task_id=    Longest chain of dependent open tasks
+    GET    /tasks/<id>                  One task
+    PATCH  /tasks/<id>                  Update task fields
+    DELETE /tasks/<id>                  Delete a task
+    POST   /tasks/<id>/start            Mark a task in progress
+    POST   /tasks/<id>/complete         {"actual_duration": minutes}
+    GET    /tasks/<id>/dependencies     Tasks it waits for and tasks waiting for it
+    POST   /tasks/<id>/dependencies     {"depends_on": id} or {"subtask": id}; 409 on a cycle
+    DELETE /tasks/<id>/dependencies/<other id>    Stop waiting for a task
+    GET    /timer?owner=                State of an owner's Pomodoro timer
+    POST   /timer/start                 {"owner", "task_id", "break"}
+    POST   /timer/pause, /timer/resume, /timer/stop    {"owner"}
+    GET    /time/stats?days=7           Time tracking statistics
+    GET    /time/percentiles?days=30&session_type=    Session length percentiles (seconds)
+    GET    /habits                      List habits
+    POST   /habits                      Create a habit
+    POST   /habits/<id>/complete        Mark a habit done today
+    GET    /habits/stats                Habit statistics
+    GET    /analytics/insights?days=7   Productivity insights
+    GET    /analytics/recommendations   Recommendations
+
+List and statistics responses carry an ETag; a client that sends it back in
+If-None-Match gets 304 Not Modified while the data is unchanged.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from database import Database
+from dependency_graph import DependencyCycle
+from task_manager import TaskManager
+from time_tracker import TimeTracker
+from habit_tracker import Habit, HabitTracker
+from timer_service import TimerService
+from importer import InvalidRecord, task_from_record
+
+
+logger = logging.getLogger("task_manager.api")
+
+MAX_BODY_SIZE = 1024 * 1024
+
+# Task fields PATCH /tasks/<id> may change
+UPDATABLE_FIELDS = ('title', 'description', 'status', 'priority', 'due_date', 'completed_date',
+                    'estimated_duration', 'actual_duration', 'category', 'tags', 'recurring',
+                    'recurrence_pattern')
+
+
+class ApiError(Exception):
+    """An error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def task_json(task):
+    data = task.to_dict()
+    data['tags'] = task.tags
+    return data
+
+
+def _int_arg(value, name, default=None):
+    if value is None or value == "":
+        if default is None:
+            raise ApiError(400, f"{name} is required")
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{name} must be an integer")
+
+
+class TaskManagerApi:
+    """Maps (method, path) to manager calls; knows nothing about HTTP itself
+
+    One instance serves all request threads. The managers only hold a
+    db_path, so sharing them is safe; TimeTracker keeps per-user timer state
+    and is therefore created once per owner.
+    """
+
+    def __init__(self, db_path="task_manager.db"):
+        self.db_path = db_path
+        self.task_manager = TaskManager(db_path)
+        self.habit_tracker = HabitTracker(db_path)
+        self.timers = TimerService.shared(db_path)
+        self._trackers = {}
+        self._analytics = None
+        self._lock = threading.Lock()
+
+        # (method, path pattern, handler, cacheable)
+        self.routes = [
+            ('GET', r'/tasks', self.list_tasks, True),
+            ('POST', r'/tasks', self.create_task, False),
+            ('GET', r'/tasks/overdue', self.overdue_tasks, True),
+            ('GET', r'/tasks/stats', self.task_stats, True),
+            ('GET', r'/tasks/percentiles', self.task_percentiles, True),
+            ('GET', r'/tasks/unblocked', self.unblocked_tasks, True),
+            ('GET', r'/tasks/critical-path', self.critical_path, True),
+            ('GET', r'/tasks/(\d+)', self.get_task, True),
+            ('PATCH', r'/tasks/(\d+)', self.update_task, False),
+            ('DELETE', r'/tasks/(\d+)', self.delete_task, False),
+            ('POST', r'/tasks/(\d+)/start', self.start_task, False),
+            ('POST', r'/tasks/(\d+)/complete', self.complete_task, False),
+            ('GET', r'/tasks/(\d+)/dependencies', self.get_dependencies, True),
+            ('POST', r'/tasks/(\d+)/dependencies', self.add_dependency, False),
+            ('DELETE', r'/tasks/(\d+)/dependencies/(\d+)', self.remove_dependency, False),
+            ('GET', r'/timer', self.timer_status, False),
+            ('POST', r'/timer/(start|pause|resume|stop)', self.timer_action, False),
+            ('GET', r'/time/stats', self.time_stats, True),
+            ('GET', r'/time/percentiles', self.time_percentiles, True),
+            ('GET', r'/habits', self.list_habits, True),
+            ('POST', r'/habits', self.create_habit, False),
+            ('POST', r'/habits/(\d+)/complete', self.complete_habit, False),
+            ('GET', r'/habits/stats', self.habit_stats, True),
+            ('GET', r'/analytics/insights', self.insights, True),
+            ('GET', r'/analytics/recommendations', self.recommendations, True),
+        ]
+        self._compiled = [(method, re.compile(pattern + r'/?$'), handler, cacheable)
+                          for method, pattern, handler, cacheable in self.routes]
+
+    def dispatch(self, method, path, query, body):
+        """Return (status, payload, cacheable) for a request"""
+        allowed = False
+        for route_method, pattern, handler, cacheable in self._compiled:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            status, payload = handler(query, body or {}, *match.groups())
+            return status, payload, cacheable
+
+        if allowed:
+            raise ApiError(405, f"{method} not allowed on {path}")
+        raise ApiError(404, f"No such endpoint: {path}")
+
+    # Tasks
+    def list_tasks(self, query, body):
+        tasks = self.task_manager.get_all_tasks(query.get('status'), query.get('category'))
+        return 200, [task_json(task) for task in tasks]
+
+    def create_task(self, query, body):
+        try:
+            task = task_from_record(body)
+        except InvalidRecord as e:
+            raise ApiError(400, str(e))
+        task_id = self.task_manager.create_task(task)
+        return 201, task_json(self.task_manager.get_task(task_id))
+
+    def overdue_tasks(self, query, body):
+        return 200, [task_json(task) for task in self.task_manager.get_overdue_tasks()]
+
+    def task_stats(self, query, body):
+        return 200, self.task_manager.get_task_statistics()
+
+    def unblocked_tasks(self, query, body):
+        return 200, [task_json(task) for task in self.task_manager.get_unblocked_tasks()]
+
+    def critical_path(self, query, body):
+        task_id = query.get('task_id')
+        return 200, self.task_manager.get_critical_path(_int_arg(task_id, 'task_id') if task_id else None)
+
+    def get_dependencies(self, query, body, task_id):
+        task = self._task(task_id)
+        graph = self.task_manager.dependencies
+        return 200, {
+            'depends_on': [{'task_id': other, 'kind': kind} for other, kind in graph.get_dependencies(task.id)],
+            'dependents': [{'task_id': other, 'kind': kind} for other, kind in graph.get_dependents(task.id)]
+        }
+
+    def add_dependency(self, query, body, task_id):
+        task = self._task(task_id)
+        try:
+            if body.get('subtask') is not None:
+                added = self.task_manager.add_subtask(task.id, _int_arg(body.get('subtask'), 'subtask'))
+            else:
+                added = self.task_manager.add_dependency(task.id, _int_arg(body.get('depends_on'), 'depends_on'))
+        except DependencyCycle as e:
+            raise ApiError(409, str(e))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        return (201 if added else 200), {'added': added}
+
+    def remove_dependency(self, query, body, task_id, depends_on):
+        self.task_manager.remove_dependency(int(task_id), int(depends_on))
+        return 200, {'removed': True}
+
+    def task_percentiles(self, query, body):
+        days = _int_arg(query.get('days'), 'days', 30)
+        return 200, self.task_manager.get_completion_percentiles(days, query.get('category'))
+
+    def get_task(self, query, body, task_id):
+        return 200, task_json(self._task(task_id))
+
+    def update_task(self, query, body, task_id):
+        task = self._task(task_id)
+        fields = [field for field in body if field in UPDATABLE_FIELDS]
+        if not fields:
+            raise ApiError(400, "No updatable fields given")
+
+        # Validate the task as it would be after the update, the same way new tasks are
+        try:
+            updated = task_from_record(dict(task_json(task), **body))
+        except InvalidRecord as e:
+            raise ApiError(400, str(e))
+
+        self.task_manager.update_task(task.id, **{field: getattr(updated, field) for field in fields})
+        return 200, task_json(self._task(task_id))
+
+    def delete_task(self, query, body, task_id):
+        self._task(task_id)
+        self.task_manager.delete_task(int(task_id))
+        return 200, {'deleted': int(task_id)}
+
+    def start_task(self, query, body, task_id):
+        self._task(task_id)
+        self.task_manager.start_task(int(task_id))
+        return 200, task_json(self._task(task_id))
+
+    def complete_task(self, query, body, task_id):
+        self._task(task_id)
+        actual_duration = _int_arg(body.get('actual_duration'), 'actual_duration', 0)
+        self.task_manager.mark_task_complete(int(task_id), actual_duration)
+        return 200, task_json(self._task(task_id))
+
+    def _task(self, task_id):
+        task = self.task_manager.get_task(int(task_id))
+        if task is None:
+            raise ApiError(404, f"Task {task_id} not found")
+        return task
+
+    # Time tracking
+    def timer_status(self, query, body):
+        return 200, self._timer_json(self._tracker(query.get('owner')))
+
+    def timer_action(self, query, body, action):
+        tracker = self._tracker(body.get('owner') or query.get('owner'))
+
+        if action == 'start':
+            if body.get('break'):
+                started = tracker.start_break()
+            else:
+                task_id = body.get('task_id')
+                started = tracker.start_pomodoro(_int_arg(task_id, 'task_id') if task_id else None)
+            if not started:
+                raise ApiError(409, "A timer is already running for this owner")
+        elif action == 'pause':
+            if not tracker.pause_timer():
+                raise ApiError(409, "No running timer to pause")
+        elif action == 'resume':
+            if not tracker.resume_timer():
+                raise ApiError(409, "No paused timer to resume")
+        else:
+            if not tracker.is_running:
+                raise ApiError(409, "No timer to stop")
+            tracker.stop_timer()
+
+        return 200, self._timer_json(tracker)
+
+    def time_stats(self, query, body):
+        days = _int_arg(query.get('days'), 'days', 7)
+        return 200, self._tracker(None).get_time_statistics(days)
+
+    def time_percentiles(self, query, body):
+        days = _int_arg(query.get('days'), 'days', 30)
+        return 200, self._tracker(None).get_session_percentiles(days, query.get('session_type'))
+
+    def _tracker(self, owner):
+        owner = owner or 'default'
+        with self._lock:
+            tracker = self._trackers.get(owner)
+            if tracker is None:
+                tracker = self._trackers[owner] = TimeTracker(self.db_path, self.timers, owner)
+            return tracker
+
+    def _timer_json(self, tracker):
+        minutes, seconds = tracker.get_remaining_time()
+        return {
+            'owner': tracker.owner,
+            'running': tracker.is_running,
+            'paused': tracker.is_paused,
+            'session_type': tracker.current_session_type if tracker.is_running else None,
+            'task_id': tracker.current_task_id if tracker.is_running else None,
+            'remaining_seconds': minutes * 60 + seconds
+        }
+
+    # Habits
+    def list_habits(self, query, body):
+        return 200, [habit.to_dict() for habit in self.habit_tracker.get_all_habits()]
+
+    def create_habit(self, query, body):
+        name = str(body.get('name') or '').strip()
+        if not name:
+            raise ApiError(400, "name is required")
+        habit = Habit(name=name, description=body.get('description') or "",
+                      frequency=body.get('frequency') or "daily")
+        habit_id = self.habit_tracker.create_habit(habit)
+        return 201, self.habit_tracker.get_habit(habit_id).to_dict()
+
+    def complete_habit(self, query, body, habit_id):
+        if self.habit_tracker.get_habit(int(habit_id)) is None:
+            raise ApiError(404, f"Habit {habit_id} not found")
+        completed = self.habit_tracker.mark_habit_complete(int(habit_id))
+        return 200, {'completed': bool(completed),
+                     'habit': self.habit_tracker.get_habit(int(habit_id)).to_dict()}
+
+    def habit_stats(self, query, body):
+        return 200, self.habit_tracker.get_habit_statistics()
+
+    # Analytics
+    def insights(self, query, body):
+        days = _int_arg(query.get('days'), 'days', 7)
+        return 200, self._get_analytics().get_productivity_insights(days)
+
+    def recommendations(self, query, body):
+        return 200, self._get_analytics().get_recommendations()
+
+    def _get_analytics(self):
+        with self._lock:
+            if self._analytics is None:
+                from analytics import Analytics  # Only load when analytics are requested
+                self._analytics = Analytics(self.db_path)
+            return self._analytics
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    server_version = "TaskManagerAPI/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive for clients that poll
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            body = self._read_body()
+            with self.server.slots:
+                status, payload, cacheable = self.server.api.dispatch(method, url.path, query, body)
+        except ApiError as e:
+            status, payload, cacheable = e.status, {'error': e.message}, False
+        except Exception:
+            logger.exception("Error handling %s %s", method, self.path)
+            status, payload, cacheable = 500, {'error': "Internal server error"}, False
+
+        data = json.dumps(payload, default=str).encode('utf-8')
+
+        etag = None
+        if cacheable and status == 200:
+            etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+            if etag in self._if_none_match():
+                self._send(304, b'', etag)
+                return
+        self._send(status, data, etag)
+
+    def _read_body(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise ApiError(400, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise ApiError(413, "Request body too large")
+        if not length:
+            return None
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return body
+
+    def _if_none_match(self):
+        header = self.headers.get('If-None-Match') or ''
+        return {tag.strip().replace('W/', '', 1) for tag in header.split(',')}
+
+    def _send(self, status, data, etag=None):
+        self.send_response(status)
+        if status >= 400:
+            # The request body may be unread, so the connection cannot carry another request
+            self.send_header('Connection', 'close')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Thread-per-connection server; at most max_concurrency requests run at once"""
+
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog; the default of 5 drops bursts of clients
+
+    def __init__(self, address, api, max_concurrency=32):
+        super().__init__(address, ApiRequestHandler)
+        self.api = api
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+
+
+def create_server(db_path="task_manager.db", host="127.0.0.1", port=8080, pool_size=8,
+                  max_concurrency=32):
+    """Build a server whose managers share one connection pool"""
+    Database.enable_pool(db_path, pool_size)
+    return ApiServer((host, port), TaskManagerApi(db_path), max_concurrency)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the task manager as a JSON API")
+    parser.add_argument('--db', default='task_manager.db', help="Database file to serve")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--pool-size', type=int, default=8, help="Shared database connections")
+    parser.add_argument('--max-concurrency', type=int, default=32,
+                        help="Requests handled at the same time")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    server = create_server(args.db, args.host, args.port, args.pool_size, args.max_concurrency)
+    print(f"Serving {args.db} on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        Database.disable_pool(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from task_manager import TaskManager
+from time_tracker import TimeTracker
+from habit_tracker import HabitTracker
+
+
+class DatabaseExecutor:
+    """Runs blocking manager calls on dedicated threads with a bounded queue
+
+    At most max_pending calls may be queued or running at once; further
+    callers wait (without blocking the event loop) until a slot frees up.
+    Cancelling an awaiting task drops the call if it has not started yet;
+    a call that is already running finishes and its result is discarded.
+    """
+
+    def __init__(self, max_workers=4, max_pending=64):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._slots = None
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on a database thread and await the result"""
+        if self._slots is None:
+            # Created lazily so it belongs to the loop that uses it
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait=True):
+        """Stop the worker threads once queued calls are done"""
+        self._executor.shutdown(wait=wait)
+
+
+class _AsyncManager:
+    """Exposes every public method of a manager as a coroutine"""
+
+    def __init__(self, manager, executor=None):
+        self._manager = manager
+        self._owns_executor = executor is None
+        self.executor = executor or DatabaseExecutor()
+
+    def __getattr__(self, name):
+        attr = getattr(self._manager, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.executor.run(attr, *args, **kwargs)
+
+        return call
+
+    def close(self):
+        """Shut down the executor if this facade created it"""
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class AsyncTaskManager(_AsyncManager):
+    def __init__(self, db_path="task_manager.db", executor=None):
+        super().__init__(TaskManager(db_path), executor)
+
+
+class AsyncTimeTracker(_AsyncManager):
+    def __init__(self, db_path="task_manager.db", executor=None):
+        super().__init__(TimeTracker(db_path), executor)
+
+
+class AsyncHabitTracker(_AsyncManager):
+    def __init__(self, db_path="task_manager.db", executor=None):
+        super().__init__(HabitTracker(db_path), executor)
+
+
+class AsyncAnalytics(_AsyncManager):
+    def __init__(self, db_path="task_manager.db", executor=None):
+        from analytics import Analytics  # Only load when needed
+        super().__init__(Analytics(db_path), executor)
+
+    async def get_productivity_insights(self, days=7):
+        """Get productivity insights, running the three statistics queries in parallel"""
+        analytics = self._manager
+        task_stats, time_stats, habit_stats = await asyncio.gather(
+            self.executor.run(analytics.task_manager.get_task_statistics),
+            self.executor.run(analytics.time_tracker.get_time_statistics, days),
+            self.executor.run(analytics.habit_tracker.get_habit_statistics)
+        )
+        return analytics._build_insights(task_stats, time_stats, habit_stats)
+
+    async def get_recommendations(self):
+        """Get recommendations based on freshly computed insights"""
+        insights = await self.get_productivity_insights()
+        return self._manager._recommendations_for(insights)
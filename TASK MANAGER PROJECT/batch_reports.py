@@ -0,0 +1,183 @@
+"""Generate productivity reports for many databases in parallel
+
+Usage:
+
+    python batch_reports.py data/users/*.db --output reports
+    python batch_reports.py data/users --days 30 --workers 8
+
+For every database a directory named after it receives insights.json
+(insights and recommendations) and one PNG per chart. Each report is built
+in a worker process with its own non-interactive matplotlib state, so the
+reports render side by side instead of one after another. A summary.json
+listing every report is written last.
+
+The databases are opened read-only, so a report run never changes them;
+one that has not been upgraded yet (open it with the app, or run
+repair.py on it) gets an error entry in the summary. Derived data such as
+the time rollups is not built during a report either, so run repair.py
+first on databases last written by an old version.
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Chart file name -> Analytics method that draws it
+REPORT_CHARTS = {
+    'task_completion.png': 'generate_task_completion_chart',
+    'time_tracking.png': 'generate_time_tracking_chart',
+    'habit_streaks.png': 'generate_habit_streak_chart',
+}
+
+
+def _init_worker():
+    """Select the Agg backend before anything in the worker imports pyplot"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render_report(db_path, report_dir, days=7, dpi=100):
+    """Write the report of one database into report_dir and return its summary"""
+    from database import Database
+
+    Database.enable_read_only(db_path)
+    try:
+        return _render_report(db_path, report_dir, days, dpi)
+    finally:
+        Database.disable_read_only(db_path)
+
+
+def _render_report(db_path, report_dir, days, dpi):
+    from analytics import Analytics
+
+    started = time.perf_counter()
+    try:
+        analytics = Analytics(db_path)
+        insights = analytics.get_productivity_insights(days)  # Reads every table an upgrade adds
+    except sqlite3.OperationalError as e:
+        raise RuntimeError(f"{db_path} needs upgrading before it can be reported on ({e})") from e
+
+    import matplotlib.pyplot as plt
+    os.makedirs(report_dir, exist_ok=True)
+
+    report = {
+        'database': db_path,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'days': days,
+        'insights': insights,
+        'recommendations': analytics._recommendations_for(insights)
+    }
+    with open(os.path.join(report_dir, 'insights.json'), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    charts = []
+    for file_name, method in REPORT_CHARTS.items():
+        generate = getattr(analytics, method)
+        chart = generate(days) if method == 'generate_time_tracking_chart' else generate()
+        if chart is None:
+            continue  # Nothing to draw for this database
+        chart.savefig(os.path.join(report_dir, file_name), dpi=dpi)
+        plt.close('all')
+        charts.append(file_name)
+
+    return {
+        'database': db_path,
+        'report_dir': report_dir,
+        'productivity_score': insights['productivity_score'],
+        'charts': charts,
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+def report_names(db_paths):
+    """Map each database to a unique report directory name based on its file name"""
+    names = {}
+    used = set()
+    for db_path in db_paths:
+        base = os.path.splitext(os.path.basename(db_path))[0]
+        name = base
+        suffix = 2
+        while name in used:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        used.add(name)
+        names[db_path] = name
+    return names
+
+
+def run_batch(db_paths, output_dir, days=7, workers=None, dpi=100, progress=None):
+    """Render reports for all databases with a process pool and return their summaries
+
+    A database whose report fails gets an entry with an 'error' key instead
+    of stopping the batch.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = report_names(db_paths)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(render_report, db_path, os.path.join(output_dir, names[db_path]), days, dpi):
+                db_path
+            for db_path in db_paths
+        }
+        for future in as_completed(futures):
+            db_path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'database': db_path, 'error': f"{type(e).__name__}: {e}"}
+            results.append(result)
+            if progress:
+                progress(len(results), len(db_paths), result)
+
+    results.sort(key=lambda item: item['database'])
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return results
+
+
+def find_databases(paths):
+    """Expand directories and glob patterns into a sorted list of database files"""
+    found = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found.update(glob.glob(os.path.join(path, '*.db')))
+        else:
+            found.update(match for match in glob.glob(path) if os.path.isfile(match))
+    return sorted(found)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate reports for many task manager databases")
+    parser.add_argument('databases', nargs='+', help="Database files, directories or glob patterns")
+    parser.add_argument('--output', default='reports', help="Directory to write reports into")
+    parser.add_argument('--days', type=int, default=7, help="Days of time tracking to report on")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--dpi', type=int, default=100, help="Resolution of the chart images")
+    args = parser.parse_args(argv)
+
+    db_paths = find_databases(args.databases)
+    if not db_paths:
+        parser.exit(1, "No database files found\n")
+
+    def progress(done, total, result):
+        status = result.get('error') or f"score {result['productivity_score']}"
+        sys.stderr.write(f"[{done}/{total}] {result['database']}: {status}\n")
+
+    started = time.perf_counter()
+    results = run_batch(db_paths, args.output, args.days, args.workers, args.dpi, progress)
+    failed = sum(1 for result in results if 'error' in result)
+    print(f"Wrote {len(results) - failed} reports to {args.output} "
+          f"({failed} failed) in {time.perf_counter() - started:.1f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
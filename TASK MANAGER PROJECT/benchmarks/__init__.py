@@ -0,0 +1 @@
+"""Synthetic workloads and timings for the task manager's hot paths"""
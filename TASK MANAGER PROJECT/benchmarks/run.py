@@ -0,0 +1,147 @@
+"""Time the hot entry points against synthetic databases
+
+Usage (from the project directory):
+
+    python -m benchmarks.run --scales 1k,100k --output results.json
+    python -m benchmarks.run --scales 1k --compare results.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from benchmarks.workload import WorkloadSpec, ensure_database
+from task_manager import TaskManager
+from time_tracker import TimeTracker
+from habit_tracker import HabitTracker
+
+
+SCALE_SUFFIXES = {'k': 1000, 'm': 1000000}
+
+
+def parse_scale(value):
+    """Parse '1k', '100k', '1M' or a plain number of tasks"""
+    value = value.strip().lower()
+    if value and value[-1] in SCALE_SUFFIXES:
+        return int(float(value[:-1]) * SCALE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+def benchmark_cases(db_path):
+    """Return (name, callable) pairs for the entry points being timed"""
+    from analytics import Analytics
+
+    task_manager = TaskManager(db_path)
+    time_tracker = TimeTracker(db_path)
+    habit_tracker = HabitTracker(db_path)
+    analytics = Analytics(db_path)
+
+    return [
+        ('get_all_tasks', task_manager.get_all_tasks),
+        ('get_task_statistics', task_manager.get_task_statistics),
+        ('get_overdue_tasks', task_manager.get_overdue_tasks),
+        ('get_time_statistics', time_tracker.get_time_statistics),
+        ('get_habit_statistics', habit_tracker.get_habit_statistics),
+        ('get_productivity_insights', analytics.get_productivity_insights),
+    ]
+
+
+def time_call(func, repeat):
+    """Run func repeat times and summarize the wall-clock timings in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'max': max(timings)
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales, repeat=5, data_dir="bench_data", seed=42, only=None, log=print):
+    """Benchmark every entry point at every scale and return a JSON-ready report"""
+    results = []
+
+    for tasks in scales:
+        spec = WorkloadSpec(tasks=tasks, seed=seed)
+        log(f"Preparing database for {tasks} tasks...")
+        start = time.perf_counter()
+        db_path = ensure_database(data_dir, spec)
+        log(f"  ready in {time.perf_counter() - start:.1f}s ({db_path})")
+
+        for name, func in benchmark_cases(db_path):
+            if only and name not in only:
+                continue
+            # Fewer repetitions for the very large scales
+            timing = time_call(func, repeat if tasks < 1000000 else max(1, repeat // 2))
+            results.append({'scale': tasks, 'name': name, 'workload': spec.to_dict(), **timing})
+            log(f"  {name:<28} median {timing['median'] * 1000:10.2f} ms")
+
+    return {
+        'revision': _git_revision(),
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def compare_reports(baseline, current):
+    """Return rows of (scale, name, baseline median, current median, ratio)"""
+    previous = {(item['scale'], item['name']): item['median'] for item in baseline['results']}
+    rows = []
+    for item in current['results']:
+        key = (item['scale'], item['name'])
+        if key in previous:
+            rows.append((item['scale'], item['name'], previous[key], item['median'],
+                         item['median'] / previous[key] if previous[key] else float('inf')))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the task manager's hot entry points")
+    parser.add_argument('--scales', default='1k,100k,1M',
+                        help="Comma separated task counts, e.g. 1k,100k,1M")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per entry point")
+    parser.add_argument('--seed', type=int, default=42, help="Seed of the workload generator")
+    parser.add_argument('--data-dir', default='bench_data', help="Where generated databases are kept")
+    parser.add_argument('--only', help="Comma separated entry point names to run")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    scales = [parse_scale(value) for value in args.scales.split(',') if value.strip()]
+    only = set(args.only.split(',')) if args.only else None
+    report = run_benchmarks(scales, args.repeat, args.data_dir, args.seed, only)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('revision') or args.compare}:")
+        for scale, name, before, after, ratio in compare_reports(baseline, report):
+            print(f"  {scale:>8} {name:<28} {before * 1000:10.2f} ms -> {after * 1000:10.2f} ms  x{ratio:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import json
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from database import Database
+
+
+CATEGORIES = ["Work", "Personal", "Health", "Learning", "Errands", "Finance", "Home", "Social"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+PRIORITY_WEIGHTS = [30, 45, 20, 5]
+TAGS = ["meeting", "email", "review", "deep-work", "call", "planning", "quick", "waiting"]
+HABIT_NAMES = ["Exercise", "Read", "Meditate", "Journal", "Walk", "Stretch", "Hydrate", "Practice"]
+
+BATCH_SIZE = 10000
+
+
+class WorkloadSpec:
+    """Size and shape of a synthetic database"""
+
+    def __init__(self, tasks=1000, sessions=None, habits=None, completions=None,
+                 history_days=365, seed=42):
+        self.tasks = tasks
+        self.sessions = tasks if sessions is None else sessions
+        self.habits = min(max(tasks // 1000, 5), 100) if habits is None else habits
+        self.completions = tasks // 2 if completions is None else completions
+        self.history_days = history_days
+        self.seed = seed
+
+    def to_dict(self):
+        return {
+            'tasks': self.tasks,
+            'sessions': self.sessions,
+            'habits': self.habits,
+            'completions': self.completions,
+            'history_days': self.history_days,
+            'seed': self.seed
+        }
+
+    def file_name(self):
+        return "bench_{tasks}t_{sessions}s_{habits}h_{completions}c_{history_days}d_{seed}.db".format(
+            **self.to_dict())
+
+
+def _zipf_weights(count, skew=1.2):
+    """Weights for a few popular and many rare choices"""
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def _batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _task_rows(spec, rng, now):
+    category_weights = _zipf_weights(len(CATEGORIES))
+    history = timedelta(days=spec.history_days)
+
+    for _ in range(spec.tasks):
+        created = now - history * rng.random() ** 0.5  # Skewed towards recent tasks
+        age_days = (now - created).days
+
+        # Older tasks are more likely to be done
+        roll = rng.random()
+        if roll < min(0.85, 0.2 + age_days / spec.history_days):
+            status = "completed"
+        elif roll < 0.9:
+            status = "pending"
+        elif roll < 0.97:
+            status = "in_progress"
+        else:
+            status = "cancelled"
+
+        due_date = None
+        if rng.random() < 0.7:
+            # Most deadlines land within a couple of weeks of creation
+            due_date = created + timedelta(hours=rng.expovariate(1 / 96))
+
+        completed_date = None
+        actual_duration = 0
+        if status == "completed":
+            completed_date = min(created + timedelta(hours=rng.expovariate(1 / 72)), now)
+            actual_duration = int(rng.lognormvariate(3.3, 0.8))
+
+        tags = rng.sample(TAGS, rng.choice([0, 0, 1, 1, 2, 3]))
+
+        yield (
+            f"Task {rng.randrange(10 ** 6)}",
+            "Synthetic task" if rng.random() < 0.5 else "",
+            status,
+            rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+            created.isoformat(),
+            due_date.isoformat() if due_date else None,
+            completed_date.isoformat() if completed_date else None,
+            rng.choice([0, 15, 25, 30, 45, 60, 90, 120]),
+            actual_duration,
+            rng.choices(CATEGORIES, category_weights)[0],
+            json.dumps(tags),
+            False,
+            None
+        )
+
+
+def _session_rows(spec, rng, now):
+    history_seconds = spec.history_days * 86400
+
+    for _ in range(spec.sessions):
+        start = now - timedelta(seconds=history_seconds * rng.random() ** 0.7)
+        if rng.random() < 0.75:
+            session_type = "pomodoro_work"
+            duration = int(rng.gauss(25 * 60, 5 * 60))
+            task_id = rng.randint(1, spec.tasks) if spec.tasks and rng.random() < 0.8 else None
+        else:
+            session_type = "pomodoro_break"
+            duration = int(rng.gauss(5 * 60, 60))
+            task_id = None
+
+        duration = max(duration, 1)
+        yield (
+            task_id,
+            start.isoformat(),
+            (start + timedelta(seconds=duration)).isoformat(),
+            duration,
+            session_type
+        )
+
+
+def _habit_rows(spec, rng, now):
+    for index in range(spec.habits):
+        created = now - timedelta(days=rng.randint(1, spec.history_days))
+        yield (
+            f"{HABIT_NAMES[index % len(HABIT_NAMES)]} #{index + 1}",
+            "Synthetic habit",
+            "daily",
+            rng.randint(0, 30),
+            created.isoformat(),
+            (now - timedelta(days=rng.randint(0, 3))).isoformat()
+        )
+
+
+def _completion_rows(spec, rng, now):
+    if not spec.habits:
+        return
+    habit_weights = _zipf_weights(spec.habits, skew=0.8)
+    habit_ids = list(range(1, spec.habits + 1))
+
+    for _ in range(spec.completions):
+        completed = now - timedelta(days=spec.history_days * rng.random() ** 1.5,
+                                    seconds=rng.randint(0, 86399))
+        yield rng.choices(habit_ids, habit_weights)[0], completed.isoformat()
+
+
+def workload_day():
+    """Reference time for generated data: the start of today
+
+    Data is laid out relative to it so that "last 7 days" style queries hit
+    a realistic amount of rows; the same seed gives the same data all day.
+    """
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def generate_database(db_path, spec, now=None):
+    """Create a database at db_path filled according to spec (deterministic for a seed)"""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    Database(db_path)  # Create the schema
+    rng = random.Random(spec.seed)
+    now = now or workload_day()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        statements = [
+            ('''INSERT INTO tasks (title, description, status, priority, created_date, due_date,
+                                   completed_date, estimated_duration, actual_duration, category,
+                                   tags, recurring, recurrence_pattern)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', _task_rows(spec, rng, now)),
+            ('''INSERT INTO time_sessions (task_id, start_time, end_time, duration, session_type)
+                VALUES (?, ?, ?, ?, ?)''', _session_rows(spec, rng, now)),
+            ('''INSERT INTO habits (name, description, frequency, streak_count, created_date, last_completed)
+                VALUES (?, ?, ?, ?, ?, ?)''', _habit_rows(spec, rng, now)),
+            ('''INSERT INTO habit_completions (habit_id, completed_date)
+                VALUES (?, ?)''', _completion_rows(spec, rng, now)),
+        ]
+
+        for query, rows in statements:
+            for batch in _batched(rows):
+                conn.executemany(query, batch)
+            conn.commit()
+    finally:
+        conn.close()
+
+    return db_path
+
+
+def ensure_database(data_dir, spec):
+    """Return the path of a database for spec, generating it only if missing"""
+    os.makedirs(data_dir, exist_ok=True)
+    now = workload_day()
+    db_path = os.path.join(data_dir, f"{now:%Y%m%d}_{spec.file_name()}")
+    if not os.path.exists(db_path):
+        generate_database(db_path + ".tmp", spec, now)
+        os.replace(db_path + ".tmp", db_path)
+    return db_path
@@ -0,0 +1,282 @@
+"""Command-line interface for scripts and cron jobs
+
+Usage:
+
+    python cli.py add "Write report" --priority high --due 2026-11-01 --category work
+    python cli.py list --status pending
+    python cli.py list --unblocked       # open tasks not waiting for any other
+    python cli.py done 42 --minutes 30
+    python cli.py stats --days 30
+    python cli.py track start 42          # Pomodoro on task 42
+    python cli.py track stop
+    python cli.py habit done Exercise
+    generate_titles | python cli.py add -              # one title or JSON record per line
+    cat finished_ids.txt | python cli.py done -
+
+Only the task, time and habit managers are imported; Tk and matplotlib
+never are, so a call starts in a few tens of milliseconds. Reading from
+stdin ("-") applies all lines in one transaction. --json prints machine
+readable output; --db selects the database file.
+"""
+import argparse
+import json
+import sys
+
+
+def _task_manager(args):
+    from task_manager import TaskManager
+    return TaskManager(args.db)
+
+
+def _time_tracker(args):
+    from time_tracker import TimeTracker
+    return TimeTracker(args.db, owner=args.owner)
+
+
+def _habit_tracker(args):
+    from habit_tracker import HabitTracker
+    return HabitTracker(args.db)
+
+
+def _print(args, data, text):
+    print(json.dumps(data, indent=2, default=str) if args.json else text)
+
+
+def _stdin_lines():
+    for line in sys.stdin:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a whole number: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _task_record(args):
+    return {
+        'title': args.title, 'description': args.description, 'priority': args.priority,
+        'due_date': args.due, 'category': args.category, 'tags': args.tags,
+        'estimated_duration': args.estimate
+    }
+
+
+# Tasks
+def cmd_add(args):
+    from importer import InvalidRecord, task_from_record
+
+    task_manager = _task_manager(args)
+    if args.title != '-':
+        try:
+            task_id = task_manager.create_task(task_from_record(_task_record(args)))
+        except InvalidRecord as e:
+            args.parser.exit(1, f"Invalid task: {e}\n")
+        _print(args, {'id': task_id}, task_id)
+        return
+
+    # One title or JSON task record per line, stored together
+    task_ids = []
+    with task_manager.db.transaction():
+        for number, line in enumerate(_stdin_lines(), 1):
+            try:
+                record = json.loads(line) if line.startswith('{') else dict(_task_record(args), title=line)
+                task_ids.append(task_manager.create_task(task_from_record(record)))
+            except json.JSONDecodeError as e:
+                args.parser.exit(1, f"Line {number}: invalid task: not valid JSON ({e.msg}); nothing was added\n")
+            except InvalidRecord as e:
+                args.parser.exit(1, f"Line {number}: invalid task: {e}; nothing was added\n")
+    _print(args, {'ids': task_ids}, f"Added {len(task_ids)} tasks")
+
+
+def cmd_list(args):
+    task_manager = _task_manager(args)
+    if args.unblocked:
+        tasks = [task for task in task_manager.get_unblocked_tasks()
+                 if not args.category or task.category == args.category]
+    else:
+        tasks = task_manager.iter_tasks(args.status, args.category)
+    if args.json:
+        print(json.dumps([dict(task.to_dict(), tags=task.tags) for task in tasks], indent=2))
+        return
+    for task in tasks:
+        due = f" due {task.due_date:%Y-%m-%d %H:%M}" if task.due_date else ""
+        category = f" [{task.category}]" if task.category else ""
+        print(f"{task.id:>6}  {task.status:<11} {task.priority:<6} {task.title}{category}{due}")
+
+
+def cmd_done(args):
+    task_manager = _task_manager(args)
+    if args.task_id != '-':
+        task_id = _task_id(args, args.task_id)
+        if not task_manager.get_task(task_id):
+            args.parser.exit(1, f"No task {task_id}\n")
+        task_manager.mark_task_complete(task_id, args.minutes)
+        _print(args, {'completed': [task_id]}, f"Completed task {task_id}")
+        return
+
+    # One task id per line, optionally followed by the minutes spent
+    completed = []
+    with task_manager.db.transaction():
+        for line in _stdin_lines():
+            task_id, _, minutes = line.partition(' ')
+            task_id = _task_id(args, task_id)
+            minutes = minutes.strip()
+            if minutes and not minutes.isdigit():
+                args.parser.exit(1, f"Task {task_id}: minutes must be a number; nothing was completed\n")
+            if task_manager.mark_task_complete(task_id, int(minutes) if minutes else args.minutes):
+                completed.append(task_id)
+    _print(args, {'completed': completed}, f"Completed {len(completed)} tasks")
+
+
+def _task_id(args, value):
+    if not value.isdigit():
+        args.parser.exit(1, f"Not a task id: {value!r}; nothing was changed\n")
+    return int(value)
+
+
+def cmd_stats(args):
+    from analytics import Analytics  # Charts would import matplotlib; insights do not
+
+    analytics = Analytics(args.db)
+    insights = analytics.get_productivity_insights(args.days)
+    stats = {
+        'insights': insights,
+        'tasks': analytics.task_manager.get_task_statistics(),
+        'time': analytics.time_tracker.get_time_statistics(args.days),
+        'habits': analytics.habit_tracker.get_habit_statistics(),
+        'recommendations': analytics._recommendations_for(insights)
+    }
+    text = '\n'.join([
+        f"Productivity score: {insights['productivity_score']}",
+        f"Tasks: {stats['tasks']['total_tasks']} total, {insights['task_completion_rate']}% completed, "
+        f"{insights['overdue_tasks']} overdue",
+        f"Time tracked (last {args.days} days): {insights['total_time_tracked']} min",
+        f"Habits: {insights['total_habits']} total, {insights['habit_completion_rate']}% done today, "
+        f"average streak {insights['average_streak']}",
+    ] + [f"- {recommendation}" for recommendation in stats['recommendations']])
+    _print(args, stats, text)
+
+
+# Time tracking
+def cmd_track(args):
+    tracker = _time_tracker(args)
+
+    if args.action == 'start':
+        tracker.set_pomodoro_durations(args.minutes, args.break_minutes)
+        started = (tracker.start_break() if args.task_id == 'break'
+                   else tracker.start_pomodoro(_task_id(args, args.task_id) if args.task_id else None))
+        if not started:
+            args.parser.exit(1, "A timer is already running; stop it first\n")
+        _print(args, {'session_id': tracker.current_session, 'seconds': tracker.duration},
+               f"Started session {tracker.current_session} ({tracker.duration // 60} min)")
+
+    elif args.action == 'stop':
+        if not tracker.is_running:
+            args.parser.exit(1, "No timer is running\n")
+        session_id = tracker.current_session
+        elapsed = int(tracker.timer.elapsed())
+        tracker.stop_timer()
+        _print(args, {'session_id': session_id, 'seconds': elapsed},
+               f"Stopped session {session_id} after {elapsed // 60} min {elapsed % 60} s")
+
+    else:
+        if not tracker.is_running:
+            _print(args, {'running': False}, "No timer is running")
+            return
+        minutes, seconds = tracker.get_remaining_time()
+        _print(args, {'running': True, 'paused': tracker.is_paused, 'session_id': tracker.current_session,
+                      'task_id': tracker.current_task_id, 'remaining_seconds': minutes * 60 + seconds},
+               f"Session {tracker.current_session}: {minutes:02d}:{seconds:02d} left"
+               + (" (paused)" if tracker.is_paused else ""))
+
+
+# Habits
+def cmd_habit(args):
+    habit_tracker = _habit_tracker(args)
+    habits = habit_tracker.get_all_habits()
+
+    if args.action == 'list':
+        if args.json:
+            print(json.dumps([habit.to_dict() for habit in habits], indent=2))
+            return
+        for habit in habits:
+            print(f"{habit.id:>6}  streak {habit.streak_count:<4} {habit.name}")
+        return
+
+    names = [args.habit] if args.habit != '-' else list(_stdin_lines())
+    by_name = {habit.name.lower(): habit.id for habit in habits}
+    done = []
+    with habit_tracker.db.transaction():
+        for name in names:
+            habit_id = int(name) if name.isdigit() else by_name.get(name.lower())
+            if habit_id is None:
+                args.parser.exit(1, f"No habit named {name!r}; nothing was marked\n")
+            if habit_tracker.mark_habit_complete(habit_id):
+                done.append(habit_id)
+    _print(args, {'completed': done}, f"Marked {len(done)} of {len(names)} habits done today")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Task manager command-line interface")
+    parser.add_argument('--db', default="task_manager.db", help="Database file")
+    parser.add_argument('--json', action='store_true', help="Print JSON")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Add a task ('-' reads one per line from stdin)")
+    add.add_argument('title')
+    add.add_argument('--description', default="")
+    add.add_argument('--priority', default="medium", help="low, medium, high or urgent")
+    add.add_argument('--due', help="Due date, e.g. 2026-11-01 or 2026-11-01T17:00")
+    add.add_argument('--category', default="")
+    add.add_argument('--tags', default="", help="Comma-separated tags")
+    add.add_argument('--estimate', type=int, default=0, help="Estimated minutes")
+    add.set_defaults(func=cmd_add)
+
+    list_tasks = commands.add_parser('list', help="List tasks")
+    list_tasks.add_argument('--status', help="pending, in_progress, completed or cancelled")
+    list_tasks.add_argument('--category')
+    list_tasks.add_argument('--unblocked', action='store_true', help="Only open tasks with no open dependencies")
+    list_tasks.set_defaults(func=cmd_list)
+
+    done = commands.add_parser('done', help="Complete a task ('-' reads ids from stdin)")
+    done.add_argument('task_id')
+    done.add_argument('--minutes', type=int, default=0, help="Minutes spent (default: the tracked time)")
+    done.set_defaults(func=cmd_done)
+
+    stats = commands.add_parser('stats', help="Productivity statistics")
+    stats.add_argument('--days', type=_positive_int, default=7)
+    stats.set_defaults(func=cmd_stats)
+
+    track = commands.add_parser('track', help="Start, stop or show the Pomodoro timer")
+    track.add_argument('action', choices=('start', 'stop', 'status'))
+    track.add_argument('task_id', nargs='?', help="Task to track, or 'break'")
+    track.add_argument('--minutes', type=_positive_int, default=25, help="Session length")
+    track.add_argument('--break-minutes', type=_positive_int, default=5)
+    track.add_argument('--owner', default="default", help="Whose timer (one per owner)")
+    track.set_defaults(func=cmd_track)
+
+    habit = commands.add_parser('habit', help="Mark habits done or list them")
+    habit.add_argument('action', choices=('done', 'list'))
+    habit.add_argument('habit', nargs='?', help="Habit id or name ('-' reads them from stdin)")
+    habit.set_defaults(func=cmd_habit)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.parser = parser
+    if args.command == 'habit' and args.action == 'done' and not args.habit:
+        parser.error("habit done needs a habit id or name")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
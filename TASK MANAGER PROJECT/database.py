@@ -1,130 +1,922 @@
-import sqlite3
-import os
-from datetime import datetime
-
-
-class Database:
-    def __init__(self, db_path="task_manager.db"):
-        self.db_path = db_path
-        self._init_database()
-
-    def _init_database(self):
-        """Initialize all database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Tasks table
-        cursor.execute('''
-                       CREATE TABLE IF NOT EXISTS tasks
-                       (
-                           id
-                           INTEGER
-                           PRIMARY
-                           KEY
-                           AUTOINCREMENT,
-                           title
-                           TEXT
-                           NOT
-                           NULL,
-                           description
-                           TEXT,
-                           status
-                           TEXT
-                           NOT
-                           NULL
-                           DEFAULT
-                           'pending',
-                           priority
-                           TEXT
-                           NOT
-                           NULL
-                           DEFAULT
-                           'medium',
-                           created_date
-                           TIMESTAMP
-                           NOT
-                           NULL,
-                           due_date
-                           TIMESTAMP,
-                           completed_date
-                           TIMESTAMP,
-                           estimated_duration
-                           INTEGER
-                           DEFAULT
-                           0,
-                           actual_duration
-                           INTEGER
-                           DEFAULT
-                           0,
-                           category
-                           TEXT,
-                           tags
-                           TEXT,
-                           recurring
-                           BOOLEAN
-                           DEFAULT
-                           FALSE,
-                           recurrence_pattern
-                           TEXT
-                       )
-                       ''')
-
-        # Time tracking table
-        cursor.execute('''
-                       CREATE TABLE IF NOT EXISTS time_sessions
-                       (
-                           id
-                           INTEGER
-                           PRIMARY
-                           KEY
-                           AUTOINCREMENT,
-                           task_id
-                           INTEGER,
-                           start_time
-                           TIMESTAMP
-                           NOT
-                           NULL,
-                           end_time
-                           TIMESTAMP,
-                           duration
-                           INTEGER
-                           DEFAULT
-                           0,
-                           session_type
-                           TEXT
-                           DEFAULT
-                           'pomodoro',
-                           FOREIGN
-                           KEY
-                       (
-                           task_id
-                       ) REFERENCES tasks
-                       (
-                           id
-                       )
-                           )
-                       ''')
-
-        conn.commit()
-        conn.close()
-
-    def execute_query(self, query, params=()):
-        """Execute a query and return results"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-
-        if query.strip().upper().startswith('SELECT'):
-            results = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
-            conn.close()
-            return [dict(zip(columns, row)) for row in results]
-        else:
-            conn.commit()
-            last_id = cursor.lastrowid
-            conn.close()
-            return last_id
-
-    def get_connection(self):
-        """Get database connection"""
+import atexit
+import sqlite3
+import os
+import pathlib
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+
+# Tables whose inserts, updates and deletes are recorded in the changes table (row_id is the rowid)
+CHANGE_TRACKED_TABLES = ('tasks', 'time_sessions', 'habits', 'habit_completions', 'task_dependencies')
+
+# How long changes are kept; a sync cursor older than this has to resync in full
+CHANGE_RETENTION = timedelta(days=30)
+
+# Each process prunes expired changes of a database at most this often (seconds)
+CHANGE_PRUNE_INTERVAL = 3600
+
+
+def rebuild_tracked_time(cursor):
+    """Recompute tasks.tracked_seconds from time_sessions in one grouped pass"""
+    cursor.execute("UPDATE tasks SET tracked_seconds = 0 WHERE tracked_seconds != 0")
+    totals = cursor.execute('''
+                            SELECT SUM(duration), task_id
+                            FROM time_sessions
+                            WHERE task_id IS NOT NULL \
+                              AND duration > 0
+                            GROUP BY task_id \
+                            ''').fetchall()
+    cursor.executemany("UPDATE tasks SET tracked_seconds = ? WHERE id = ?", totals)
+
+
+def begin_write(conn):
+    """Take the write lock before a read-modify-write on conn
+
+    Python's sqlite3 only begins a transaction at the first INSERT, UPDATE
+    or DELETE, so a SELECT ahead of it runs unlocked and two writers can
+    both read the old row. Inside Database.transaction() the enclosing
+    transaction is used as it is; SQLite then refuses a conflicting write
+    with "database is locked" instead of losing it.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+class ConnectionPool:
+    """A bounded set of connections to one database file, shared between threads
+
+    Connections are opened lazily, at most size of them exist, and acquire()
+    waits up to timeout seconds for one to be released. The database is
+    switched to WAL mode so readers do not block the writer.
+    """
+
+    def __init__(self, db_path, size=8, timeout=30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        """Take a connection, opening one if none is idle"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free database connection for {self.db_path} after {self.timeout}s")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        """Give a connection back to the pool"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+
+class MemoryDatabase:
+    """An in-memory database that stands in for a database file
+
+    All Database objects opened on the same name share its single
+    connection, one thread at a time. The file at snapshot_path is loaded on
+    start, and the data is copied back to it with the SQLite backup API
+    every snapshot_interval seconds (when something changed) and at exit.
+    """
+
+    def __init__(self, snapshot_path=None, snapshot_interval=None):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.RLock()
+        self._depth = 0  # Nesting of acquire() in the owning thread
+        self._saved_changes = 0
+        self._stopped = threading.Event()
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            source = sqlite3.connect(snapshot_path)
+            try:
+                source.backup(self._conn)
+            finally:
+                source.close()
+
+        if snapshot_path:
+            atexit.register(self.snapshot)
+            if snapshot_interval:
+                thread = threading.Thread(target=self._snapshot_loop, name="db-snapshot")
+                thread.daemon = True
+                thread.start()
+
+    def acquire(self):
+        """Take the shared connection; blocks while another thread uses it"""
+        self._lock.acquire()
+        self._depth += 1
+        return self._conn
+
+    def release(self, conn):
+        """Hand the shared connection back"""
+        self._depth -= 1
+        if self._depth == 0 and conn.in_transaction:
+            conn.rollback()  # Uncommitted work of a failed call
+        self._lock.release()
+
+    def connection(self):
+        """A connection for a caller that closes it when done"""
+        return _SharedConnection(self)
+
+    def snapshot(self, path=None):
+        """Copy the database to path (default: snapshot_path); returns False if nothing changed"""
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError("No snapshot path given")
+
+        with self._lock:
+            changes = self._conn.total_changes
+            if path == self.snapshot_path and changes == self._saved_changes and os.path.exists(path):
+                return False
+
+            # Write beside the target and swap it in, so a crash never leaves half a file
+            temp_path = path + ".tmp"
+            target = sqlite3.connect(temp_path)
+            try:
+                self._conn.backup(target)
+            finally:
+                target.close()
+            os.replace(temp_path, path)
+
+            if path == self.snapshot_path:
+                self._saved_changes = changes
+        return True
+
+    def close(self, snapshot=True):
+        """Stop periodic snapshots, optionally take a last one, and drop the data"""
+        self._stopped.set()
+        if self.snapshot_path:
+            atexit.unregister(self.snapshot)
+            if snapshot:
+                self.snapshot()
+        with self._lock:
+            self._conn.close()
+
+    def _snapshot_loop(self):
+        while not self._stopped.wait(self.snapshot_interval):
+            self.snapshot()
+
+
+class _SharedConnection:
+    """Proxy for MemoryDatabase.connection(); close() only gives the connection back"""
+
+    def __init__(self, memory):
+        self._memory = memory
+        self._conn = memory.acquire()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._memory.release(conn)
+
+
+class _SavepointConnection:
+    """What get_connection() returns inside Database.transaction()
+
+    A `with` block becomes a savepoint of the surrounding transaction and
+    close() leaves the connection open, so code written for its own
+    connection joins the group commit unchanged.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.execute("SAVEPOINT nested")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._conn.execute("ROLLBACK TO nested")
+        self._conn.execute("RELEASE nested")
+        return False
+
+    def close(self):
+        pass
+
+
+class _InstrumentedConnection:
+    """What get_connection() returns while instrumentation is installed
+
+    execute() and executemany() are timed and recorded like the Database
+    helpers. Only the statement itself is timed, so reads through a
+    connection count no rows and leave out the time spent fetching;
+    statements run on cursor() objects are not recorded.
+    """
+
+    def __init__(self, conn, instrumentation):
+        self._conn = conn
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def execute(self, query, params=()):
+        start = time.perf_counter()
+        cursor = self._conn.execute(query, params)
+        self._instrumentation.record(query, params, time.perf_counter() - start, max(cursor.rowcount, 0))
+        return cursor
+
+    def executemany(self, query, params):
+        start = time.perf_counter()
+        cursor = self._conn.executemany(query, params)
+        self._instrumentation.record(query, (), time.perf_counter() - start, max(cursor.rowcount, 0))
+        return cursor
+
+
+class Database:
+    # Shared QueryInstrumentation, None when disabled
+    instrumentation = None
+
+    # db_path -> ConnectionPool used by every Database on that file
+    _pools = {}
+
+    # Per thread: db_path -> connection of the open transaction()
+    _local = threading.local()
+
+    # db_paths whose connections are opened read-only (see enable_read_only)
+    _read_only = set()
+
+    # db_path -> time.monotonic() when this process last pruned its expired changes
+    _pruned_at = {}
+
+    @classmethod
+    def set_instrumentation(cls, instrumentation):
+        """Install (or with None, remove) query instrumentation for all databases"""
+        cls.instrumentation = instrumentation
+        return instrumentation
+
+    @classmethod
+    def enable_pool(cls, db_path="task_manager.db", size=8, timeout=30.0):
+        """Serve the queries of all Database objects on db_path from one shared pool"""
+        pool = cls._pools.get(db_path)
+        if pool is None:
+            pool = cls._pools[db_path] = ConnectionPool(db_path, size, timeout)
+        return pool
+
+    @classmethod
+    def disable_pool(cls, db_path="task_manager.db"):
+        """Go back to a connection per query on db_path"""
+        pool = cls._pools.pop(db_path, None)
+        if pool is not None:
+            pool.close()
+
+    @classmethod
+    def open_memory(cls, db_path=":memory:", snapshot_path=None, snapshot_interval=60):
+        """Run every Database on db_path in memory
+
+        db_path is only a name here; pass snapshot_path (which may be the
+        same file) to load from and persist to disk.
+        """
+        memory = cls._pools.get(db_path)
+        if not isinstance(memory, MemoryDatabase):
+            memory = cls._pools[db_path] = MemoryDatabase(snapshot_path, snapshot_interval)
+        return memory
+
+    @classmethod
+    def close_memory(cls, db_path=":memory:", snapshot=True):
+        """Persist (if configured) and drop an in-memory database"""
+        memory = cls._pools.pop(db_path, None)
+        if memory is not None:
+            memory.close(snapshot)
+
+    @classmethod
+    def enable_read_only(cls, db_path):
+        """Open every later connection to db_path read-only, e.g. to report on a user's data
+
+        The schema is neither created nor migrated, so the file has to be
+        up to date already; derived tables that were never built are not
+        seeded either. Anything that tries to write raises
+        sqlite3.OperationalError.
+        """
+        cls._read_only.add(db_path)
+
+    @classmethod
+    def disable_read_only(cls, db_path):
+        """Open later connections to db_path for writing again"""
+        cls._read_only.discard(db_path)
+
+    @property
+    def read_only(self):
+        """Whether connections to this database are opened read-only"""
+        return self.db_path in Database._read_only
+
+    def __init__(self, db_path="task_manager.db"):
+        self.db_path = db_path
+        if db_path == ":memory:" and db_path not in Database._pools:
+            Database.open_memory(db_path)
+        if db_path not in Database._read_only:
+            self._init_database()
+
+    def _init_database(self):
+        """Initialize all database tables"""
+        conn = self._acquire()
+        try:
+            self._create_tables(conn.cursor())
+            self._prune_expired_changes(conn)
+            if conn is not self._current_transaction():
+                conn.commit()
+        finally:
+            self._release(conn)
+
+    def _create_tables(self, cursor):
+        """Create any missing tables"""
+        # Tasks table
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS tasks
+                       (
+                           id
+                           INTEGER
+                           PRIMARY
+                           KEY
+                           AUTOINCREMENT,
+                           title
+                           TEXT
+                           NOT
+                           NULL,
+                           description
+                           TEXT,
+                           status
+                           TEXT
+                           NOT
+                           NULL
+                           DEFAULT
+                           'pending',
+                           priority
+                           TEXT
+                           NOT
+                           NULL
+                           DEFAULT
+                           'medium',
+                           created_date
+                           TIMESTAMP
+                           NOT
+                           NULL,
+                           due_date
+                           TIMESTAMP,
+                           completed_date
+                           TIMESTAMP,
+                           estimated_duration
+                           INTEGER
+                           DEFAULT
+                           0,
+                           actual_duration
+                           INTEGER
+                           DEFAULT
+                           0,
+                           category
+                           TEXT,
+                           tags
+                           TEXT,
+                           recurring
+                           BOOLEAN
+                           DEFAULT
+                           FALSE,
+                           recurrence_pattern
+                           TEXT,
+                           tracked_seconds
+                           INTEGER
+                           NOT
+                           NULL
+                           DEFAULT
+                           0
+                       )
+                       ''')
+
+        # Databases created before tracked_seconds get the column, filled in below
+        task_columns = {row[1] for row in cursor.execute("PRAGMA table_info(tasks)")}
+        missing_tracked_time = 'tracked_seconds' not in task_columns
+        if missing_tracked_time:
+            cursor.execute("ALTER TABLE tasks ADD COLUMN tracked_seconds INTEGER NOT NULL DEFAULT 0")
+
+        # Time tracking table
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS time_sessions
+                       (
+                           id
+                           INTEGER
+                           PRIMARY
+                           KEY
+                           AUTOINCREMENT,
+                           task_id
+                           INTEGER,
+                           start_time
+                           TIMESTAMP
+                           NOT
+                           NULL,
+                           end_time
+                           TIMESTAMP,
+                           duration
+                           INTEGER
+                           DEFAULT
+                           0,
+                           session_type
+                           TEXT
+                           DEFAULT
+                           'pomodoro',
+                           FOREIGN
+                           KEY
+                       (
+                           task_id
+                       ) REFERENCES tasks
+                       (
+                           id
+                       )
+                           )
+                       ''')
+
+        # Time per day, session type and task (task_id 0 = no task), kept by TimeTracker
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS time_rollups
+                       (
+                           day           TEXT    NOT NULL,
+                           session_type  TEXT    NOT NULL,
+                           task_id       INTEGER NOT NULL DEFAULT 0,
+                           total_seconds INTEGER NOT NULL DEFAULT 0,
+                           session_count INTEGER NOT NULL DEFAULT 0,
+                           PRIMARY KEY (day, session_type, task_id)
+                       )
+                       ''')
+
+        # Covers the per-day sums of long-range charts without reading the table rows
+        cursor.execute('''
+                       CREATE INDEX IF NOT EXISTS time_rollups_day_seconds
+                           ON time_rollups (day, session_type, total_seconds)
+                       ''')
+
+        # Task dependencies: task_id waits for depends_on (see dependency_graph)
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS task_dependencies
+                       (
+                           task_id      INTEGER   NOT NULL,
+                           depends_on   INTEGER   NOT NULL,
+                           kind         TEXT      NOT NULL DEFAULT 'blocks',
+                           created_date TIMESTAMP NOT NULL,
+                           PRIMARY KEY (task_id, depends_on),
+                           FOREIGN KEY (task_id) REFERENCES tasks (id),
+                           FOREIGN KEY (depends_on) REFERENCES tasks (id)
+                       )
+                       ''')
+        cursor.execute('''
+                       CREATE INDEX IF NOT EXISTS task_dependencies_depends_on
+                           ON task_dependencies (depends_on, kind)
+                       ''')
+        cursor.execute('''
+                       CREATE TRIGGER IF NOT EXISTS tasks_delete_dependencies
+                           AFTER DELETE ON tasks
+                       BEGIN
+                           DELETE FROM task_dependencies WHERE task_id = OLD.id OR depends_on = OLD.id;
+                       END
+                       ''')
+
+        # Running and paused timers of TimerService
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS timers
+                       (
+                           id           INTEGER PRIMARY KEY AUTOINCREMENT,
+                           owner        TEXT,
+                           task_id      INTEGER,
+                           session_id   INTEGER,
+                           session_type TEXT,
+                           duration     INTEGER   NOT NULL,
+                           remaining    REAL      NOT NULL,
+                           state        TEXT      NOT NULL,
+                           ends_at      TIMESTAMP,
+                           started_at   TIMESTAMP NOT NULL,
+                           updated_at   TIMESTAMP NOT NULL
+                       )
+                       ''')
+
+        # Habit tables (used by HabitTracker)
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS habits
+                       (
+                           id             INTEGER PRIMARY KEY AUTOINCREMENT,
+                           name           TEXT      NOT NULL,
+                           description    TEXT,
+                           frequency      TEXT      NOT NULL DEFAULT 'daily',
+                           streak_count   INTEGER   NOT NULL DEFAULT 0,
+                           created_date   TIMESTAMP NOT NULL,
+                           last_completed TIMESTAMP
+                       )
+                       ''')
+
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS habit_completions
+                       (
+                           id             INTEGER PRIMARY KEY AUTOINCREMENT,
+                           habit_id       INTEGER   NOT NULL,
+                           completed_date TIMESTAMP NOT NULL,
+                           FOREIGN KEY (habit_id) REFERENCES habits (id)
+                       )
+                       ''')
+
+        # One row of productivity insights per day (see ProductivityHistory)
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS productivity_history
+                       (
+                           day                   TEXT PRIMARY KEY,
+                           productivity_score    INTEGER   NOT NULL,
+                           task_completion_rate  REAL      NOT NULL,
+                           total_time_tracked    INTEGER   NOT NULL,
+                           habit_completion_rate REAL      NOT NULL,
+                           average_streak        REAL      NOT NULL,
+                           overdue_tasks         INTEGER   NOT NULL,
+                           total_habits          INTEGER   NOT NULL,
+                           recorded_at           TIMESTAMP NOT NULL
+                       )
+                       ''')
+
+        # Running duration statistics per (category, priority), updated as tasks complete
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS duration_stats
+                       (
+                           category    TEXT    NOT NULL,
+                           priority    TEXT    NOT NULL,
+                           count       INTEGER NOT NULL DEFAULT 0,
+                           mean_actual REAL    NOT NULL DEFAULT 0,
+                           m2_actual   REAL    NOT NULL DEFAULT 0,
+                           ratio_count INTEGER NOT NULL DEFAULT 0,
+                           mean_ratio  REAL    NOT NULL DEFAULT 0,
+                           m2_ratio    REAL    NOT NULL DEFAULT 0,
+                           PRIMARY KEY (category, priority)
+                       )
+                       ''')
+
+        # Daily duration histograms per kind and key (see sketches.LogHistogram)
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS duration_sketches
+                       (
+                           day       TEXT    NOT NULL,
+                           kind      TEXT    NOT NULL,
+                           key       TEXT    NOT NULL,
+                           count     INTEGER NOT NULL,
+                           total     REAL    NOT NULL,
+                           min_value REAL,
+                           max_value REAL,
+                           bins      TEXT    NOT NULL,
+                           PRIMARY KEY (kind, day, key)
+                       )
+                       ''')
+
+        # Change feed; seq is never reused, so it works as a sync cursor (kept for CHANGE_RETENTION)
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS changes
+                       (
+                           seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                           table_name TEXT      NOT NULL,
+                           row_id     INTEGER   NOT NULL,
+                           operation  TEXT      NOT NULL,
+                           changed_at TIMESTAMP NOT NULL
+                       )
+                       ''')
+
+        cursor.execute('''
+                       CREATE INDEX IF NOT EXISTS changes_table_seq
+                           ON changes (table_name, seq)
+                       ''')
+
+        for table in CHANGE_TRACKED_TABLES:
+            for operation, row in (('insert', 'NEW'), ('update', 'NEW'), ('delete', 'OLD')):
+                cursor.execute(f'''
+                               CREATE TRIGGER IF NOT EXISTS {table}_{operation}_change
+                                   AFTER {operation.upper()} ON {table}
+                               BEGIN
+                                   INSERT INTO changes (table_name, row_id, operation, changed_at)
+                                   VALUES ('{table}', {row}.rowid, '{operation}',
+                                           strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+                               END
+                               ''')
+
+        # Keep tasks.tracked_seconds equal to the sum of their closed sessions
+        cursor.execute('''
+                       CREATE TRIGGER IF NOT EXISTS time_sessions_insert_tracked
+                           AFTER INSERT ON time_sessions
+                           WHEN NEW.task_id IS NOT NULL AND NEW.duration > 0
+                       BEGIN
+                           UPDATE tasks SET tracked_seconds = tracked_seconds + NEW.duration WHERE id = NEW.task_id;
+                       END
+                       ''')
+        cursor.execute('''
+                       CREATE TRIGGER IF NOT EXISTS time_sessions_update_tracked
+                           AFTER UPDATE OF task_id, duration ON time_sessions
+                       BEGIN
+                           UPDATE tasks SET tracked_seconds = tracked_seconds - OLD.duration
+                           WHERE id = OLD.task_id AND OLD.duration > 0;
+                           UPDATE tasks SET tracked_seconds = tracked_seconds + NEW.duration
+                           WHERE id = NEW.task_id AND NEW.duration > 0;
+                       END
+                       ''')
+        cursor.execute('''
+                       CREATE TRIGGER IF NOT EXISTS time_sessions_delete_tracked
+                           AFTER DELETE ON time_sessions
+                           WHEN OLD.task_id IS NOT NULL AND OLD.duration > 0
+                       BEGIN
+                           UPDATE tasks SET tracked_seconds = tracked_seconds - OLD.duration WHERE id = OLD.task_id;
+                       END
+                       ''')
+
+        if missing_tracked_time:
+            rebuild_tracked_time(cursor)
+
+    def execute_query(self, query, params=()):
+        """Execute a query and return results"""
+        if query.strip().upper().startswith('SELECT'):
+            columns, results = self._select(query, params)
+            return [dict(zip(columns, row)) for row in results]
+
+        instrumentation = Database.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+
+        conn = self._acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+
+            if conn is not self._current_transaction():
+                conn.commit()
+            last_id = cursor.lastrowid
+        finally:
+            self._release(conn)
+        if instrumentation is not None:
+            instrumentation.record(query, params, time.perf_counter() - start, max(cursor.rowcount, 0))
+        return last_id
+
+    def fetch_all(self, query, params=(), row_factory=None):
+        """Run a SELECT and return its rows as tuples, or mapped through row_factory"""
+        _, results = self._select(query, params)
+        if row_factory is None:
+            return results
+        return [row_factory(row) for row in results]
+
+    def iter_query(self, query, params=(), row_factory=None, batch_size=1000):
+        """Stream the rows of a SELECT in fetchmany batches"""
+        instrumentation = Database.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        row_count = 0
+
+        conn = self._acquire()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                if row_factory is None:
+                    yield from rows
+                else:
+                    for row in rows:
+                        yield row_factory(row)
+        finally:
+            self._release(conn)
+            if instrumentation is not None:
+                # Includes the time the consumer spent between batches
+                instrumentation.record(query, params, time.perf_counter() - start, row_count)
+
+    def _select(self, query, params):
+        """Run a SELECT and return (column names, row tuples)"""
+        instrumentation = Database.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+
+        conn = self._acquire()
+        try:
+            cursor = conn.execute(query, params)
+            results = cursor.fetchall()
+            columns = [desc[0] for desc in cursor.description]
+        finally:
+            self._release(conn)
+
+        if instrumentation is not None:
+            instrumentation.record(query, params, time.perf_counter() - start, len(results))
+        return columns, results
+
+    def changes_since(self, seq=0, tables=None, limit=None):
+        """Get changes recorded after seq, oldest first
+
+        Each change is a dict with seq, table_name, row_id, operation
+        ('insert', 'update' or 'delete') and changed_at. Pass the seq of the
+        last change you processed to continue from there. Changes older
+        than CHANGE_RETENTION are pruned, so check a stored cursor against
+        oldest_change() before relying on it.
+        """
+        query = "SELECT seq, table_name, row_id, operation, changed_at FROM changes WHERE seq > ?"
+        params = [seq]
+
+        if tables:
+            query += f" AND table_name IN ({', '.join('?' * len(tables))})"
+            params.extend(tables)
+
+        query += " ORDER BY seq"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return self.execute_query(query, params)
+
+    def latest_change(self):
+        """Get the seq of the newest change (0 if none), e.g. to start syncing from now"""
+        # sqlite_sequence still holds the last seq after the log was pruned
+        rows = self.fetch_all("SELECT seq FROM sqlite_sequence WHERE name = 'changes'")
+        return rows[0][0] if rows else 0
+
+    def oldest_change(self):
+        """Get the seq of the oldest change still kept (latest_change() + 1 if none are)
+
+        A consumer whose cursor is below oldest_change() - 1 missed pruned
+        changes and has to resync in full.
+        """
+        rows = self.fetch_all("SELECT MIN(seq) FROM changes")
+        return rows[0][0] if rows[0][0] is not None else self.latest_change() + 1
+
+    def prune_changes(self, before_seq):
+        """Drop changes up to and including before_seq once every consumer has seen them"""
+        self.execute_query("DELETE FROM changes WHERE seq <= ?", (before_seq,))
+
+    @contextmanager
+    def transaction(self):
+        """Run everything this thread does on db_path until the block ends as one commit
+
+        Queries from any Database on the same file, including ones that
+        would normally commit on their own, join the transaction. Nested
+        calls reuse the outer transaction.
+        """
+        active = self._active_transactions()
+        conn = active.get(self.db_path)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        active[self.db_path] = conn
+        callbacks = self._commit_callbacks()[self.db_path] = []
+        try:
+            conn.execute("BEGIN")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            del active[self.db_path]
+            del self._commit_callbacks()[self.db_path]
+            self._release(conn)
+
+        for callback in callbacks:
+            callback()
+
+    @contextmanager
+    def savepoint(self):
+        """Run part of this thread's transaction() so that an error undoes only that part
+
+        The error is raised again; after_commit() callbacks registered in
+        the block are dropped along with its writes.
+        """
+        conn = self._current_transaction()
+        if conn is None:
+            raise RuntimeError("savepoint() needs an enclosing transaction()")
+        callbacks = self._commit_callbacks()[self.db_path]
+        registered = len(callbacks)
+        conn.execute("SAVEPOINT part")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO part")
+            conn.execute("RELEASE part")
+            del callbacks[registered:]
+            raise
+        conn.execute("RELEASE part")
+
+    def after_commit(self, callback):
+        """Call callback() once the current write is visible to other connections
+
+        That is right away, or when this thread's transaction() commits.
+        """
+        callbacks = self._commit_callbacks().get(self.db_path)
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
+    def _active_transactions(self):
+        active = getattr(Database._local, 'transactions', None)
+        if active is None:
+            active = Database._local.transactions = {}
+        return active
+
+    def _commit_callbacks(self):
+        callbacks = getattr(Database._local, 'commit_callbacks', None)
+        if callbacks is None:
+            callbacks = Database._local.commit_callbacks = {}
+        return callbacks
+
+    def _current_transaction(self):
+        return self._active_transactions().get(self.db_path)
+
+    def _prune_expired_changes(self, conn):
+        """Drop changes older than CHANGE_RETENTION, at most every CHANGE_PRUNE_INTERVAL
+
+        Only the expired rows at the start of the feed are visited, so a
+        prune costs nothing when there is nothing to drop.
+        """
+        now = time.monotonic()
+        pruned_at = Database._pruned_at.get(self.db_path)
+        if pruned_at is not None and now - pruned_at < CHANGE_PRUNE_INTERVAL:
+            return
+        Database._pruned_at[self.db_path] = now
+
+        conn.execute('''
+                     DELETE
+                     FROM changes
+                     WHERE seq < IFNULL((SELECT seq FROM changes WHERE changed_at >= ? ORDER BY seq LIMIT 1),
+                                        (SELECT MAX(seq) + 1 FROM changes)) \
+                     ''', ((datetime.now() - CHANGE_RETENTION).isoformat(),))
+
+    def get_connection(self):
+        """Get database connection"""
+        conn = self._current_transaction()
+        if conn is not None:
+            conn = _SavepointConnection(conn)
+        elif isinstance(Database._pools.get(self.db_path), MemoryDatabase):
+            conn = Database._pools[self.db_path].connection()
+        else:
+            conn = self._connect()
+
+        instrumentation = Database.instrumentation
+        if instrumentation is not None:
+            return _InstrumentedConnection(conn, instrumentation)
+        return conn
+
+    def _acquire(self):
+        conn = self._current_transaction()
+        if conn is not None:
+            return conn
+        pool = Database._pools.get(self.db_path)
+        if pool is None:
+            return self._connect()
+        return pool.acquire()
+
+    def _release(self, conn):
+        if conn is self._current_transaction():
+            return
+        pool = Database._pools.get(self.db_path)
+        if pool is None:
+            conn.close()
+        else:
+            pool.release(conn)
+
+    def _connect(self):
+        if self.db_path in Database._read_only:
+            return sqlite3.connect(pathlib.Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro", uri=True)
         return sqlite3.connect(self.db_path)
\ No newline at end of file
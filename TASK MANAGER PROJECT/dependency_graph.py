@@ -0,0 +1,305 @@
+import threading
+from datetime import datetime
+from database import Database, begin_write
+
+
+class DependencyKind:
+    BLOCKS = "blocks"  # depends_on has to be finished before task_id can start
+    SUBTASK = "subtask"  # depends_on is a subtask of task_id, which finishes after it
+
+
+class DependencyCycle(ValueError):
+    """Adding a dependency would make a task (indirectly) wait for itself"""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Dependency cycle: " + " -> ".join(str(task_id) for task_id in cycle))
+
+
+class DependencyGraph:
+    """Dependencies between tasks, with a topological order kept up to date
+
+    Edges live in task_dependencies; the graph keeps them in memory
+    together with a position per task such that every task comes after
+    the tasks it depends on. Adding an edge that respects the order costs
+    O(1); otherwise only the tasks between the two positions are visited
+    and reordered (Pearce-Kelly), which is also how cycles are found, so
+    no insert walks the whole graph. Unblocked tasks are answered by an
+    indexed query on task_dependencies.
+
+    The graph is loaded on first use and read again whenever the change
+    feed shows task_dependencies rows written elsewhere (another process,
+    or a deleted task). Edits hold the database write lock from that check
+    until their row is stored, so the cycle check always sees every stored
+    edge. Use shared() to get the process-wide instance of a database.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path="task_manager.db"):
+        """Return the process-wide graph for a database"""
+        with cls._shared_lock:
+            graph = cls._shared.get(db_path)
+            if graph is None:
+                graph = cls._shared[db_path] = cls(db_path)
+            return graph
+
+    def __init__(self, db_path="task_manager.db"):
+        self.db = Database(db_path)
+        self._lock = threading.RLock()
+        self._successors = None  # task -> tasks that depend on it
+        self._predecessors = None  # task -> tasks it depends on
+        self._order = None  # task -> position; predecessors always have smaller positions
+        self._next_position = 0
+        self._seen_change = None  # seq of the newest task_dependencies change the graph includes
+
+    # Editing
+    def add_dependency(self, task_id, depends_on, kind=DependencyKind.BLOCKS):
+        """Make task_id wait for depends_on; raises DependencyCycle if depends_on already waits for task_id"""
+        if task_id == depends_on:
+            raise DependencyCycle([task_id, task_id])
+
+        with self._lock:
+            added = False
+            conn = self.db.get_connection()
+            try:
+                with conn:
+                    begin_write(conn)  # No other process can add an edge until this one is stored
+                    if len(conn.execute("SELECT id FROM tasks WHERE id IN (?, ?)",
+                                        (task_id, depends_on)).fetchall()) < 2:
+                        raise ValueError(f"Unknown task: {task_id} or {depends_on}")
+                    if kind == DependencyKind.SUBTASK:
+                        parent = conn.execute(
+                            "SELECT task_id FROM task_dependencies WHERE depends_on = ? AND kind = ?",
+                            (depends_on, DependencyKind.SUBTASK)
+                        ).fetchone()
+                        if parent is not None and parent[0] != task_id:
+                            raise ValueError(f"Task {depends_on} is already a subtask of task {parent[0]}")
+
+                    self._refresh(conn)
+                    if task_id in self._successors.get(depends_on, ()):
+                        return False
+
+                    self._insert_edge(depends_on, task_id)  # Raises DependencyCycle before changing anything
+                    added = True
+                    conn.execute('''
+                                 INSERT INTO task_dependencies (task_id, depends_on, kind, created_date)
+                                 VALUES (?, ?, ?, ?) \
+                                 ''', (task_id, depends_on, kind, datetime.now().isoformat()))
+                    self._seen_change = self._latest_change(conn)
+            except Exception:
+                if added:
+                    self.reload()  # The edge is in memory but was not stored
+                raise
+            finally:
+                conn.close()
+            return True
+
+    def add_subtask(self, parent_id, subtask_id):
+        """Make subtask_id a subtask of parent_id; a task has at most one parent"""
+        return self.add_dependency(parent_id, subtask_id, DependencyKind.SUBTASK)
+
+    def remove_dependency(self, task_id, depends_on):
+        """Stop task_id from waiting for depends_on"""
+        with self._lock:
+            conn = self.db.get_connection()
+            try:
+                with conn:
+                    begin_write(conn)
+                    # Edit the loaded graph only if it was current; otherwise it is read again on next use
+                    current = self._order is not None and self._latest_change(conn) == self._seen_change
+                    conn.execute("DELETE FROM task_dependencies WHERE task_id = ? AND depends_on = ?",
+                                 (task_id, depends_on))
+                    if current:
+                        self._remove_edge(depends_on, task_id)
+                        self._seen_change = self._latest_change(conn)
+            except Exception:
+                self.reload()
+                raise
+            finally:
+                conn.close()
+
+    def reload(self):
+        """Forget the in-memory graph; it is read again on next use"""
+        with self._lock:
+            self._successors = self._predecessors = self._order = None
+            self._seen_change = None
+
+    # Queries
+    def get_dependencies(self, task_id):
+        """[(task id, kind)] that task_id waits for"""
+        return self.db.fetch_all("SELECT depends_on, kind FROM task_dependencies WHERE task_id = ?",
+                                 (task_id,))
+
+    def get_dependents(self, task_id):
+        """[(task id, kind)] waiting for task_id"""
+        return self.db.fetch_all("SELECT task_id, kind FROM task_dependencies WHERE depends_on = ?",
+                                 (task_id,))
+
+    def get_unblocked_tasks(self):
+        """Open tasks none of whose dependencies are still open"""
+        from task_manager import TASK_SELECT, Task, TaskStatus  # task_manager imports this module
+
+        query = f'''
+                SELECT {TASK_SELECT}
+                FROM tasks
+                WHERE status IN (?, ?)
+                  AND NOT EXISTS (SELECT 1
+                                  FROM task_dependencies d
+                                           JOIN tasks blocker ON blocker.id = d.depends_on
+                                  WHERE d.task_id = tasks.id
+                                    AND blocker.status IN (?, ?))
+                ORDER BY created_date DESC \
+                '''
+        open_statuses = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+        return self.db.fetch_all(query, open_statuses + open_statuses, Task.from_row)
+
+    def get_critical_path(self, task_id=None):
+        """Longest chain of open tasks by estimated_duration
+
+        Returns {'tasks': [ids, first to last], 'minutes': total}. With
+        task_id, the chain is the longest one that ends at that task.
+        """
+        from task_manager import TaskStatus  # task_manager imports this module
+
+        minutes = dict(self.db.fetch_all("SELECT id, estimated_duration FROM tasks WHERE status IN (?, ?)",
+                                         (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)))
+        with self._lock:
+            self._refresh()
+            order = self._order
+            predecessors = self._predecessors
+
+            # One pass in topological order; tasks without edges are chains of their own
+            finish = {}
+            previous = {}
+            for node in sorted((node for node in order if node in minutes), key=order.__getitem__):
+                best = None
+                for predecessor in predecessors.get(node, ()):
+                    if predecessor in finish and (best is None or finish[predecessor] > finish[best]):
+                        best = predecessor
+                finish[node] = (minutes[node] or 0) + (finish[best] if best is not None else 0)
+                previous[node] = best
+
+        for node, duration in minutes.items():
+            if node not in finish:
+                finish[node] = duration or 0
+                previous[node] = None
+
+        if task_id is None:
+            if not finish:
+                return {'tasks': [], 'minutes': 0}
+            task_id = max(finish, key=finish.__getitem__)
+        elif task_id not in finish:
+            return {'tasks': [], 'minutes': 0}
+
+        path = []
+        node = task_id
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        path.reverse()
+        return {'tasks': path, 'minutes': finish[task_id]}
+
+    # Incremental topological order (Pearce-Kelly)
+    def _insert_edge(self, source, target):
+        """Add source -> target (target waits for source), reordering the affected region"""
+        order = self._order
+        for node in (source, target):
+            if node not in order:
+                order[node] = self._next_position
+                self._next_position += 1
+                self._successors[node] = set()
+                self._predecessors[node] = set()
+
+        lower, upper = order[target], order[source]
+        if lower < upper:
+            forward = self._forward_region(target, upper, source)
+            backward = self._backward_region(source, lower)
+            # Everything that must precede source keeps its relative order, then everything after target
+            backward.sort(key=order.__getitem__)
+            forward.sort(key=order.__getitem__)
+            nodes = backward + forward
+            for node, position in zip(nodes, sorted(order[node] for node in nodes)):
+                order[node] = position
+
+        self._successors[source].add(target)
+        self._predecessors[target].add(source)
+
+    def _remove_edge(self, source, target):
+        self._successors.get(source, set()).discard(target)
+        self._predecessors.get(target, set()).discard(source)
+
+    def _forward_region(self, start, upper, source):
+        """Tasks reachable from start with positions up to upper; raises DependencyCycle on reaching source"""
+        order = self._order
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for successor in self._successors[node]:
+                if successor == source:
+                    cycle = [source, node]
+                    while parents[cycle[-1]] is not None:
+                        cycle.append(parents[cycle[-1]])
+                    # In blocking order: source blocks start, which (indirectly) blocks source again
+                    raise DependencyCycle([source] + list(reversed(cycle)))
+                if successor not in parents and order[successor] < upper:
+                    parents[successor] = node
+                    stack.append(successor)
+        return list(parents)
+
+    def _backward_region(self, start, lower):
+        """Tasks that reach start with positions from lower on"""
+        order = self._order
+        seen = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for predecessor in self._predecessors[node]:
+                if predecessor not in seen and order[predecessor] > lower:
+                    seen.add(predecessor)
+                    stack.append(predecessor)
+        return list(seen)
+
+    def _latest_change(self, conn):
+        return conn.execute("SELECT MAX(seq) FROM changes WHERE table_name = 'task_dependencies'").fetchone()[0]
+
+    def _refresh(self, conn=None):
+        """Load the graph, or load it again if task_dependencies changed since it was loaded"""
+        if conn is None:
+            conn = self.db.get_connection()
+            try:
+                return self._refresh(conn)
+            finally:
+                conn.close()
+
+        latest = self._latest_change(conn)  # Before the edges: a write in between only causes another load
+        if self._order is not None and latest == self._seen_change:
+            return
+        edges = conn.execute("SELECT depends_on, task_id FROM task_dependencies").fetchall()
+        successors, predecessors = {}, {}
+        for source, target in edges:
+            successors.setdefault(source, set()).add(target)
+            successors.setdefault(target, set())
+            predecessors.setdefault(target, set()).add(source)
+            predecessors.setdefault(source, set())
+
+        # Kahn's algorithm for the starting order
+        waiting = {node: len(sources) for node, sources in predecessors.items()}
+        ready = sorted(node for node, count in waiting.items() if count == 0)
+        order = {}
+        while ready:
+            node = ready.pop()
+            order[node] = len(order)
+            for successor in successors[node]:
+                waiting[successor] -= 1
+                if waiting[successor] == 0:
+                    ready.append(successor)
+        for node in predecessors:
+            order.setdefault(node, len(order))  # Only if rows written elsewhere formed a cycle
+
+        self._successors, self._predecessors, self._order = successors, predecessors, order
+        self._next_position = len(order)
+        self._seen_change = latest
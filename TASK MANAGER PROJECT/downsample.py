@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta
+
+
+# Bucket sizes, smallest first, and the SQLite expression mapping a day to its bucket's first day
+BUCKETS = ('day', 'week', 'month', 'year')
+BUCKET_SQL = {
+    'day': "day",
+    'week': "DATE(day, '-6 days', 'weekday 1')",  # Monday of the week
+    'month': "STRFTIME('%Y-%m-01', day)",
+    'year': "STRFTIME('%Y-01-01', day)",
+}
+
+
+def bucket_start(day, bucket):
+    """First day of the bucket containing day"""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    if bucket == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket(day, bucket):
+    """First day of the bucket after the one starting on day"""
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    if bucket == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    if bucket == 'year':
+        return date(day.year + 1, 1, 1)
+    return day + timedelta(days=1)
+
+
+def bucket_starts(start_day, end_day, bucket):
+    """First days of every bucket overlapping start_day..end_day"""
+    starts = []
+    day = bucket_start(start_day, bucket)
+    while day <= end_day:
+        starts.append(day)
+        day = next_bucket(day, bucket)
+    return starts
+
+
+def choose_bucket(start_day, end_day, max_buckets):
+    """Smallest bucket size that covers the range in at most max_buckets buckets"""
+    days = (end_day - start_day).days + 1
+    approximate_days = {'day': 1, 'week': 7, 'month': 30.44, 'year': 365.25}
+    for bucket in BUCKETS:
+        if days / approximate_days[bucket] <= max_buckets:
+            return bucket
+    return BUCKETS[-1]
+
+
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets downsampling of [(x, y)] sorted by x
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    slices in between, the point forming the largest triangle with the
+    point kept before it and the average of the next slice. Peaks and
+    dips survive, which plain averaging or striding would flatten.
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    every = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        # Average of the next slice (the last point for the final slice)
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        next_slice = points[next_start:next_end] or points[-1:]
+        avg_x = sum(x for x, _ in next_slice) / len(next_slice)
+        avg_y = sum(y for _, y in next_slice) / len(next_slice)
+
+        # Point of this slice with the largest triangle
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        prev_x, prev_y = points[previous]
+        best = start
+        best_area = -1
+        for index in range(start, end):
+            x, y = points[index]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best_area = area
+                best = index
+
+        sampled.append(points[best])
+        previous = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def downsample_series(series, max_points):
+    """LTTB over [(day, value)] with date or ISO string days; returns the kept pairs"""
+    if len(series) <= max_points:
+        return list(series)
+    indexed = [(index, value) for index, (_, value) in enumerate(series)]
+    return [series[index] for index, _ in lttb(indexed, max_points)]
+
+
+def to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
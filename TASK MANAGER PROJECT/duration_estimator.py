@@ -0,0 +1,232 @@
+import math
+from database import Database, begin_write
+
+
+# Tasks the statistics learn from: completed ones (the parameter) with time entered or tracked
+OBSERVED_TASKS = "status = ? AND (actual_duration > 0 OR tracked_seconds > 0)"
+
+STATS_COLUMNS = ('count', 'mean_actual', 'm2_actual', 'ratio_count', 'mean_ratio', 'm2_ratio')
+
+STATS_UPSERT = '''
+               INSERT OR REPLACE INTO duration_stats
+                   (category, priority, count, mean_actual, m2_actual, ratio_count, mean_ratio, m2_ratio)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?) \
+               '''
+
+
+class RunningStats:
+    """Count, mean and sum of squared deviations, updated one value at a time (Welford)"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine with the statistics of another group (Chan et al.)"""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class DurationEstimator:
+    """Learns how long tasks really take, per category and priority
+
+    For every completed task it updates running statistics of the actual
+    duration and of the actual/estimated ratio in one duration_stats row,
+    so each completion costs O(1) no matter how many tasks exist.
+    Predictions use the most specific group with at least min_samples
+    completions: category and priority, then category, then priority,
+    then everything.
+    """
+
+    def __init__(self, db_path="task_manager.db", min_samples=3):
+        self.db = Database(db_path)
+        self.min_samples = min_samples
+        self._ensure_stats()
+
+    def observe(self, category, priority, estimated, actual):
+        """Add one completed task's durations (minutes) to the statistics"""
+        if not actual or actual <= 0:
+            return False
+        key = (category or "", priority)
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                begin_write(conn)  # Two completions in one group must not both read the old row
+                row = conn.execute(
+                    f"SELECT {', '.join(STATS_COLUMNS)} FROM duration_stats WHERE category = ? AND priority = ?",
+                    key
+                ).fetchone()
+                actual_stats, ratio_stats = self._unpack(row) if row else (RunningStats(), RunningStats())
+                actual_stats.add(actual)
+                if estimated and estimated > 0:
+                    ratio_stats.add(actual / estimated)
+                conn.execute(STATS_UPSERT, key + self._pack(actual_stats, ratio_stats))
+        finally:
+            conn.close()
+        return True
+
+    def predict(self, category, priority, estimated=0, groups=None, resolved=None):
+        """Predict a task's duration: dict with minutes, stddev, samples and basis
+
+        groups (from _load) and a resolved dict let many predictions share
+        one read of the stats and one fallback lookup per (category, priority).
+        """
+        groups = self._load() if groups is None else groups
+        key = (category or "", priority)
+        if resolved is None or key not in resolved:
+            found = self._group(groups, *key)
+            if resolved is not None:
+                resolved[key] = found
+        else:
+            found = resolved[key]
+        actual_stats, ratio_stats = found
+
+        if estimated and estimated > 0 and ratio_stats.count >= self.min_samples:
+            return {
+                'minutes': round(estimated * ratio_stats.mean, 1),
+                'stddev': round(estimated * ratio_stats.stddev, 1),
+                'samples': ratio_stats.count,
+                'basis': 'estimate_ratio'
+            }
+        if actual_stats.count >= self.min_samples:
+            return {
+                'minutes': round(actual_stats.mean, 1),
+                'stddev': round(actual_stats.stddev, 1),
+                'samples': actual_stats.count,
+                'basis': 'history'
+            }
+        return {'minutes': estimated or 0, 'stddev': None, 'samples': 0, 'basis': 'estimate'}
+
+    def predict_task(self, task):
+        """Predict the duration of a Task"""
+        return self.predict(task.category, task.priority, task.estimated_duration)
+
+    def predict_pending(self):
+        """Predict the remaining work: per-task predictions plus total minutes and its stddev
+
+        The total's spread assumes tasks vary independently.
+        """
+        from task_manager import TaskStatus  # task_manager imports this module
+
+        query = '''
+                SELECT id, category, priority, estimated_duration
+                FROM tasks
+                WHERE status IN (?, ?) \
+                '''
+        groups = self._load()
+        resolved = {}
+        predictions = []
+        total = variance = 0.0
+        for task_id, category, priority, estimated in self.db.iter_query(
+                query, (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)):
+            prediction = self.predict(category, priority, estimated, groups, resolved)
+            prediction['task_id'] = task_id
+            predictions.append(prediction)
+            total += prediction['minutes']
+            variance += (prediction['stddev'] or 0) ** 2
+
+        return {
+            'tasks': predictions,
+            'total_minutes': round(total, 1),
+            'stddev_minutes': round(math.sqrt(variance), 1)
+        }
+
+    def get_statistics(self):
+        """Get the statistics of every (category, priority) group"""
+        return [
+            {
+                'category': category,
+                'priority': priority,
+                'completed': actual_stats.count,
+                'mean_minutes': round(actual_stats.mean, 1),
+                'stddev_minutes': round(actual_stats.stddev, 1),
+                'mean_ratio': round(ratio_stats.mean, 2) if ratio_stats.count else None
+            }
+            for (category, priority), (actual_stats, ratio_stats) in sorted(self._load().items())
+        ]
+
+    def rebuild(self):
+        """Recompute all statistics from completed tasks in one pass"""
+        from task_manager import SPENT_MINUTES, TaskStatus  # task_manager imports this module
+
+        groups = {}
+        query = f'''
+                SELECT category, priority, estimated_duration, {SPENT_MINUTES}
+                FROM tasks
+                WHERE {OBSERVED_TASKS} \
+                '''
+        for category, priority, estimated, actual in self.db.iter_query(query, (TaskStatus.COMPLETED,),
+                                                                        batch_size=10000):
+            stats = groups.get((category or "", priority))
+            if stats is None:
+                stats = groups[(category or "", priority)] = (RunningStats(), RunningStats())
+            stats[0].add(actual)
+            if estimated and estimated > 0:
+                stats[1].add(actual / estimated)
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM duration_stats")
+                conn.executemany(STATS_UPSERT, (key + self._pack(*stats) for key, stats in groups.items()))
+        finally:
+            conn.close()
+
+    def _ensure_stats(self):
+        """Seed the statistics of databases that have completed tasks but no stats yet"""
+        if self.db.read_only or self.db.fetch_all("SELECT 1 FROM duration_stats LIMIT 1"):
+            return
+        from task_manager import TaskStatus  # task_manager imports this module
+
+        if self.db.fetch_all(f"SELECT 1 FROM tasks WHERE {OBSERVED_TASKS} LIMIT 1", (TaskStatus.COMPLETED,)):
+            self.rebuild()
+
+    def _load(self):
+        """Read all groups: {(category, priority): (actual, ratio) RunningStats}"""
+        rows = self.db.fetch_all(f"SELECT category, priority, {', '.join(STATS_COLUMNS)} FROM duration_stats")
+        return {(row[0], row[1]): self._unpack(row[2:]) for row in rows}
+
+    def _group(self, stats, category, priority):
+        """Statistics of the most specific group with enough samples"""
+        selectors = (
+            lambda key: key == (category, priority),
+            lambda key: key[0] == category,
+            lambda key: key[1] == priority,
+            lambda key: True,
+        )
+
+        for selector in selectors:
+            actual_stats, ratio_stats = RunningStats(), RunningStats()
+            for key, (group_actual, group_ratio) in stats.items():
+                if selector(key):
+                    actual_stats.merge(group_actual)
+                    ratio_stats.merge(group_ratio)
+            if actual_stats.count >= self.min_samples:
+                return actual_stats, ratio_stats
+
+        return actual_stats, ratio_stats
+
+    def _unpack(self, row):
+        count, mean_actual, m2_actual, ratio_count, mean_ratio, m2_ratio = row
+        return RunningStats(count, mean_actual, m2_actual), RunningStats(ratio_count, mean_ratio, m2_ratio)
+
+    def _pack(self, actual_stats, ratio_stats):
+        return (actual_stats.count, actual_stats.mean, actual_stats.m2,
+                ratio_stats.count, ratio_stats.mean, ratio_stats.m2)
@@ -0,0 +1,148 @@
+"""Stream tables out of the database as CSV, JSONL or Parquet
+
+Usage:
+
+    python export.py --format csv --output exports
+    python export.py --format parquet --tables tasks,time_sessions --output exports
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from database import Database
+
+
+EXPORT_TABLES = ('tasks', 'time_sessions', 'habits', 'habit_completions')
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# SQLite declared type -> pyarrow type name
+PARQUET_TYPES = {
+    'INTEGER': 'int64',
+    'BOOLEAN': 'int64',
+    'REAL': 'float64',
+}
+
+
+class Exporter:
+    """Writes tables chunk by chunk so memory use does not grow with table size"""
+
+    def __init__(self, db_path="task_manager.db", chunk_size=10000):
+        self.db = Database(db_path)
+        self.chunk_size = chunk_size
+
+    def export_table(self, table, path, fmt='csv', progress=None):
+        """Export one table to path and return the number of rows written"""
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.execute(f"SELECT * FROM {table} ORDER BY id")
+            columns = [desc[0] for desc in cursor.description]
+            chunks = self._chunks(cursor)
+
+            if fmt == 'csv':
+                return self._write_csv(path, columns, chunks, progress)
+            if fmt == 'jsonl':
+                return self._write_jsonl(path, columns, chunks, progress)
+            return self._write_parquet(path, columns, self._column_types(conn, table), chunks, progress)
+        finally:
+            conn.close()
+
+    def export_all(self, output_dir, fmt='csv', tables=EXPORT_TABLES, progress=None):
+        """Export several tables into output_dir, returning {table: row count}"""
+        os.makedirs(output_dir, exist_ok=True)
+        counts = {}
+        for table in tables:
+            path = os.path.join(output_dir, f"{table}.{fmt}")
+            counts[table] = self.export_table(table, path, fmt, progress)
+        return counts
+
+    def _chunks(self, cursor):
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                return
+            yield rows
+
+    def _column_types(self, conn, table):
+        return {row[1]: (row[2] or '').upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+
+    def _write_csv(self, path, columns, chunks, progress):
+        written = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for rows in chunks:
+                writer.writerows(rows)
+                written += len(rows)
+                if progress:
+                    progress(written)
+        return written
+
+    def _write_jsonl(self, path, columns, chunks, progress):
+        written = 0
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+        with open(path, 'w', encoding='utf-8') as f:
+            for rows in chunks:
+                f.write(''.join(encode(dict(zip(columns, row))) + '\n' for row in rows))
+                written += len(rows)
+                if progress:
+                    progress(written)
+        return written
+
+    def _write_parquet(self, path, columns, column_types, chunks, progress):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow); "
+                               "csv and jsonl work without it")
+
+        schema = pa.schema([
+            (column, getattr(pa, PARQUET_TYPES.get(column_types.get(column), 'string'))())
+            for column in columns
+        ])
+
+        written = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for rows in chunks:
+                # Each chunk becomes one row group
+                data = {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+                writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                written += len(rows)
+                if progress:
+                    progress(written)
+        return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export task manager data")
+    parser.add_argument('--db', default='task_manager.db', help="Database file to export from")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    parser.add_argument('--tables', default=','.join(EXPORT_TABLES),
+                        help="Comma separated tables to export")
+    parser.add_argument('--output', default='exports', help="Output directory")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows fetched per chunk")
+    args = parser.parse_args(argv)
+
+    tables = [table.strip() for table in args.tables.split(',') if table.strip()]
+    exporter = Exporter(args.db, args.chunk_size)
+
+    for table in tables:
+        start = time.perf_counter()
+        path = os.path.join(args.output, f"{table}.{args.format}")
+        os.makedirs(args.output, exist_ok=True)
+        try:
+            count = exporter.export_table(table, path, args.format)
+        except (ValueError, RuntimeError, sqlite3.Error) as e:
+            parser.exit(1, f"Export of {table} failed: {e}\n")
+        print(f"{table}: {count} rows -> {path} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""Bulk import tasks and time sessions from CSV or JSONL files
+
+Usage:
+
+    python importer.py tasks old_tool_export.csv
+    python importer.py time_sessions sessions.jsonl --batch-size 5000
+
+Rows are committed in batches together with a progress marker, so an
+interrupted import picks up after the last committed batch when the same
+command is run again (use --restart to start over).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from database import Database
+from task_manager import Task, TaskStatus, Priority, overdue_cache
+from time_tracker import add_session_rollups
+
+
+IMPORT_KINDS = ('tasks', 'time_sessions')
+MAX_REPORTED_ERRORS = 1000
+
+TASK_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+TASK_PRIORITIES = (Priority.LOW, Priority.MEDIUM, Priority.HIGH, Priority.URGENT)
+
+TASK_INSERT = '''
+              INSERT INTO tasks (title, description, status, priority, created_date, due_date,
+                                 completed_date, estimated_duration, actual_duration, category,
+                                 tags, recurring, recurrence_pattern)
+              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) \
+              '''
+
+SESSION_INSERT = '''
+                 INSERT INTO time_sessions (task_id, start_time, end_time, duration, session_type)
+                 VALUES (?, ?, ?, ?, ?) \
+                 '''
+
+
+class InvalidRecord(ValueError):
+    """A row that cannot be imported"""
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def parse_date(value):
+    """Parse an ISO date/time into the naive local time the database stores
+
+    A trailing Z or a UTC offset is converted to local time, so stored
+    dates always compare with datetime.now(). Raises ValueError.
+    """
+    value = str(value).strip()
+    if value[-1:] in ('Z', 'z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        try:
+            parsed = parsed.astimezone().replace(tzinfo=None)
+        except OverflowError:
+            raise ValueError(f"Date out of range: {value!r}")
+    return parsed
+
+
+def _date(value, field):
+    value = _text(value)
+    if not value:
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:
+        raise InvalidRecord(f"{field}: not an ISO date/time: {value!r}")
+
+
+def _int(value, field):
+    value = _text(value)
+    if not value:
+        return 0
+    try:
+        return int(float(value))
+    except (ValueError, OverflowError):
+        raise InvalidRecord(f"{field}: not a number: {value!r}")
+
+
+def _bool(value):
+    return _text(value).lower() in ('1', 'true', 'yes', 'y')
+
+
+def _tags(value):
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    value = _text(value)
+    if value.startswith('['):
+        try:
+            return [str(tag) for tag in json.loads(value)]
+        except ValueError:
+            pass
+    return [tag.strip() for tag in value.split(',') if tag.strip()]
+
+
+def task_from_record(record):
+    """Validate a record and return it as a Task"""
+    title = _text(record.get('title'))
+    if not title:
+        raise InvalidRecord("title is required")
+
+    status = _text(record.get('status')).lower().replace(' ', '_') or TaskStatus.PENDING
+    if status not in TASK_STATUSES:
+        raise InvalidRecord(f"status: unknown value {status!r}")
+
+    priority = _text(record.get('priority')).lower() or Priority.MEDIUM
+    if priority not in TASK_PRIORITIES:
+        raise InvalidRecord(f"priority: unknown value {priority!r}")
+
+    return Task(
+        title=title,
+        description=_text(record.get('description')),
+        status=status,
+        priority=priority,
+        created_date=_date(record.get('created_date'), 'created_date'),
+        due_date=_date(record.get('due_date'), 'due_date'),
+        completed_date=_date(record.get('completed_date'), 'completed_date'),
+        estimated_duration=_int(record.get('estimated_duration'), 'estimated_duration'),
+        actual_duration=_int(record.get('actual_duration'), 'actual_duration'),
+        category=_text(record.get('category')),
+        tags=_tags(record.get('tags')),
+        recurring=_bool(record.get('recurring')),
+        recurrence_pattern=_text(record.get('recurrence_pattern')) or None
+    )
+
+
+def task_row(record):
+    """Validate a record and return the parameters of TASK_INSERT"""
+    data = task_from_record(record).to_dict()
+    return (
+        data['title'], data['description'], data['status'], data['priority'],
+        data['created_date'], data['due_date'], data['completed_date'],
+        data['estimated_duration'], data['actual_duration'], data['category'],
+        data['tags'], data['recurring'], data['recurrence_pattern']
+    )
+
+
+def session_row(record):
+    """Validate a record and return the parameters of SESSION_INSERT"""
+    start_time = _date(record.get('start_time'), 'start_time')
+    if start_time is None:
+        raise InvalidRecord("start_time is required")
+
+    end_time = _date(record.get('end_time'), 'end_time')
+    duration = _int(record.get('duration'), 'duration')
+    if end_time and not duration:
+        duration = int((end_time - start_time).total_seconds())
+    if duration < 0:
+        raise InvalidRecord("duration: end_time is before start_time")
+    if duration and not end_time:
+        # A closed session: tracked_seconds counts it, so the rollups must too
+        end_time = start_time + timedelta(seconds=duration)
+
+    task_id = _text(record.get('task_id'))
+    return (
+        _int(task_id, 'task_id') if task_id else None,
+        start_time.isoformat(),
+        end_time.isoformat() if end_time else None,
+        duration,
+        _text(record.get('session_type')) or 'pomodoro'
+    )
+
+
+def add_batch_rollups(conn, batch):
+    """Keep time_rollups in step with imported sessions (the tracked_seconds trigger counts the same ones)"""
+    add_session_rollups(conn, ((row[0], row[1], row[3], row[4]) for row in batch if row[3] > 0))
+
+
+# kind -> (row builder, insert statement, extra work done in the batch transaction)
+ROW_BUILDERS = {
+    'tasks': (task_row, TASK_INSERT, None),
+    'time_sessions': (session_row, SESSION_INSERT, add_batch_rollups),
+}
+
+
+def read_records(path, fmt=None):
+    """Yield (line number, record dict) from a CSV or JSONL file, one at a time"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+
+    if fmt == 'csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+    elif fmt in ('jsonl', 'ndjson', 'json'):
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, InvalidRecord(f"invalid JSON: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, InvalidRecord("expected a JSON object per line")
+                    continue
+                yield line_number, record
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+class Importer:
+    """Imports records in batches, each committed with its resume position"""
+
+    def __init__(self, db_path="task_manager.db", batch_size=1000, strict=False, progress=None):
+        self.db = Database(db_path)
+        self.batch_size = batch_size
+        self.strict = strict
+        self.progress = progress
+        self.errors = []  # (line number, message) of the first skipped rows
+        self.skipped = 0
+        self._init_progress_table()
+
+    def _init_progress_table(self):
+        self.db.execute_query('''
+                              CREATE TABLE IF NOT EXISTS import_progress
+                              (
+                                  source      TEXT PRIMARY KEY,
+                                  kind        TEXT      NOT NULL,
+                                  source_size INTEGER   NOT NULL,
+                                  records     INTEGER   NOT NULL DEFAULT 0,
+                                  imported    INTEGER   NOT NULL DEFAULT 0,
+                                  finished    BOOLEAN   NOT NULL DEFAULT FALSE,
+                                  updated_at  TIMESTAMP NOT NULL
+                              )
+                              ''')
+
+    def import_file(self, kind, path, fmt=None, restart=False):
+        """Import a file and return a summary dict
+
+        Already committed records are skipped when resuming.
+        """
+        if kind not in ROW_BUILDERS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        build_row, insert, after_insert = ROW_BUILDERS[kind]
+
+        source = os.path.abspath(path)
+        source_size = os.path.getsize(path)
+        done_records, imported = self._resume_position(source, kind, source_size, restart)
+
+        self.errors = []
+        self.skipped = 0
+        started = time.perf_counter()
+        conn = self.db.get_connection()
+        try:
+            records = 0
+            batch = []
+            for records, (line_number, record) in enumerate(read_records(path, fmt), 1):
+                if records <= done_records:
+                    continue  # Committed by an earlier run
+
+                try:
+                    if isinstance(record, Exception):
+                        raise record
+                    batch.append(build_row(record))
+                except InvalidRecord as e:
+                    if self.strict:
+                        raise ValueError(f"{path}:{line_number}: {e}")
+                    self.skipped += 1
+                    if len(self.errors) < MAX_REPORTED_ERRORS:
+                        self.errors.append((line_number, str(e)))
+
+                if records - done_records >= self.batch_size:
+                    imported += self._commit_batch(conn, insert, after_insert, batch, source, kind,
+                                                   source_size, records, imported)
+                    done_records = records
+                    batch = []
+
+            imported += self._commit_batch(conn, insert, after_insert, batch, source, kind,
+                                           source_size, max(records, done_records), imported,
+                                           finished=True)
+        finally:
+            conn.close()
+
+        return {
+            'source': source,
+            'kind': kind,
+            'imported': imported,
+            'skipped': self.skipped,
+            'seconds': round(time.perf_counter() - started, 2)
+        }
+
+    def _resume_position(self, source, kind, source_size, restart):
+        rows = self.db.fetch_all(
+            "SELECT kind, source_size, records, imported, finished FROM import_progress WHERE source = ?",
+            (source,)
+        )
+        if restart or not rows:
+            return 0, 0
+
+        previous_kind, previous_size, records, imported, finished = rows[0]
+        if previous_kind != kind or previous_size != source_size:
+            raise ValueError(f"{source} changed since the last import; use restart=True to start over")
+        if finished:
+            raise ValueError(f"{source} was already imported; use restart=True to import it again")
+        return records, imported
+
+    def _commit_batch(self, conn, insert, after_insert, batch, source, kind, source_size, records,
+                      imported, finished=False):
+        """Insert a batch and record the resume position in one transaction"""
+        with conn:
+            if batch:
+                conn.executemany(insert, batch)
+                if after_insert:
+                    after_insert(conn, batch)
+            conn.execute('''
+                         INSERT OR REPLACE INTO import_progress
+                             (source, kind, source_size, records, imported, finished, updated_at)
+                         VALUES (?, ?, ?, ?, ?, ?, ?) \
+                         ''', (source, kind, source_size, records, imported + len(batch), finished,
+                               datetime.now().isoformat()))
+        if batch and kind == 'tasks':
+            overdue_cache.invalidate(self.db.db_path)
+
+        if self.progress:
+            self.progress(records, imported + len(batch))
+        return len(batch)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import tasks or time sessions from CSV/JSONL")
+    parser.add_argument('kind', choices=IMPORT_KINDS)
+    parser.add_argument('path', help="CSV or JSONL file")
+    parser.add_argument('--db', default='task_manager.db', help="Database file to import into")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Defaults to the file extension")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Records per committed batch")
+    parser.add_argument('--strict', action='store_true', help="Stop at the first invalid row")
+    parser.add_argument('--restart', action='store_true', help="Ignore earlier progress for this file")
+    args = parser.parse_args(argv)
+
+    def progress(records, imported):
+        sys.stderr.write(f"\r{records} records read, {imported} imported")
+        sys.stderr.flush()
+
+    importer = Importer(args.db, args.batch_size, args.strict, progress)
+    try:
+        summary = importer.import_file(args.kind, args.path, args.format, args.restart)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"\nImport failed: {e}\n")
+
+    sys.stderr.write("\n")
+    for line_number, message in importer.errors[:20]:
+        print(f"  line {line_number}: {message}")
+    if importer.skipped > 20:
+        print(f"  ... and {importer.skipped - 20} more")
+    print(f"Imported {summary['imported']} {args.kind} ({summary['skipped']} skipped) "
+          f"in {summary['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
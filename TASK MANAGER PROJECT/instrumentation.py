@@ -0,0 +1,166 @@
+import logging
+import os
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+
+
+slow_query_logger = logging.getLogger("task_manager.slow_queries")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are skipped when looking for the caller of a query
+_INTERNAL_FILES = {os.path.abspath(__file__), os.path.abspath(os.path.join(os.path.dirname(__file__), "database.py"))}
+
+
+def normalize_sql(query):
+    """Reduce a statement to its shape so that calls group together"""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _PLACEHOLDER_LIST.sub("?, ...", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def find_caller():
+    """Return 'Class.method' (or 'module.function') of the code that issued a query"""
+    frame = sys._getframe(1)
+    while frame is not None and os.path.abspath(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+
+    if frame is None:
+        return None
+
+    owner = frame.f_locals.get('self')
+    if owner is not None:
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class StatementStats:
+    """Running counters for one normalized statement"""
+
+    def __init__(self, sql, sample_size):
+        self.sql = sql
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=sample_size)  # Most recent latencies
+
+    def record(self, elapsed, rows):
+        self.calls += 1
+        self.total_time += elapsed
+        self.rows += rows
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.samples.append(elapsed)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self):
+        return {
+            'sql': self.sql,
+            'calls': self.calls,
+            'rows': self.rows,
+            'total_ms': round(self.total_time * 1000, 3),
+            'avg_ms': round(self.total_time * 1000 / self.calls, 3) if self.calls else 0,
+            'max_ms': round(self.max_time * 1000, 3),
+            'p50_ms': round(self.percentile(0.5) * 1000, 3),
+            'p95_ms': round(self.percentile(0.95) * 1000, 3),
+            'p99_ms': round(self.percentile(0.99) * 1000, 3)
+        }
+
+
+class QueryInstrumentation:
+    """Collects per-statement timings and a slow-query log
+
+    Install it with Database.set_instrumentation(); Database only calls
+    record() while one is installed. Statements run with the Database
+    helpers and with execute()/executemany() on connections from
+    get_connection() are recorded (connections opened before it was
+    installed are not). Percentiles are computed over the most recent
+    sample_size calls of each statement.
+    """
+
+    def __init__(self, slow_threshold_ms=100, sample_size=1024, slow_log_size=200):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self.sample_size = sample_size
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._statements = {}
+        self._normalized = {}  # Raw query text -> normalized form
+        self._lock = threading.Lock()
+
+    def record(self, query, params, elapsed, rows):
+        """Record one executed statement"""
+        sql = self._normalized.get(query)
+        if sql is None:
+            if len(self._normalized) > 10000:
+                self._normalized.clear()
+            sql = self._normalized[query] = normalize_sql(query)
+
+        with self._lock:
+            stats = self._statements.get(sql)
+            if stats is None:
+                stats = self._statements[sql] = StatementStats(sql, self.sample_size)
+            stats.record(elapsed, rows)
+
+        if elapsed >= self.slow_threshold:
+            self._log_slow_query(sql, params, elapsed, rows)
+
+    def _log_slow_query(self, sql, params, elapsed, rows):
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'sql': sql,
+            'params': repr(tuple(params))[:200],
+            'duration_ms': round(elapsed * 1000, 3),
+            'rows': rows,
+            'caller': find_caller()
+        }
+        self.slow_queries.append(entry)
+        slow_query_logger.warning("Slow query (%.1f ms, %d rows) from %s: %s",
+                                  entry['duration_ms'], rows, entry['caller'], sql)
+
+    def snapshot(self, order_by='total_ms', limit=None):
+        """Return statement statistics as dicts, most expensive first"""
+        with self._lock:
+            statements = [stats.to_dict() for stats in self._statements.values()]
+        statements.sort(key=lambda item: item[order_by], reverse=True)
+        return statements[:limit] if limit else statements
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries.clear()
+
+
+def enable_instrumentation(slow_threshold_ms=100, log_file=None, **kwargs):
+    """Install a QueryInstrumentation on Database and return it
+
+    With log_file, slow queries are also appended to that file.
+    """
+    from database import Database
+
+    if log_file:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+
+    return Database.set_instrumentation(QueryInstrumentation(slow_threshold_ms, **kwargs))
+
+
+def disable_instrumentation():
+    """Remove query instrumentation from Database"""
+    from database import Database
+
+    Database.set_instrumentation(None)
@@ -1,17 +1,30 @@
-import customtkinter as ctk
-from gui.main_window import MainWindow  # FIXED: gui not gul
-import os
-
-
-def main():
-    # Create data directory if it doesn't exist
-    if not os.path.exists('data'):
-        os.makedirs('data')
-
-    # Initialize and run the application
-    app = MainWindow()
-    app.mainloop()
-
-
-if __name__ == "__main__":
+import customtkinter as ctk
+from gui.main_window import MainWindow  # FIXED: gui not gul
+from database import Database
+import os
+
+
+def main():
+    # Create data directory if it doesn't exist
+    if not os.path.exists('data'):
+        os.makedirs('data')
+
+    # Optional slow-query log, e.g. TASK_MANAGER_SLOW_QUERY_MS=50
+    slow_query_ms = os.environ.get('TASK_MANAGER_SLOW_QUERY_MS')
+    if slow_query_ms:
+        from instrumentation import enable_instrumentation
+        enable_instrumentation(float(slow_query_ms), log_file=os.path.join('data', 'slow_queries.log'))
+
+    # Optional in-memory mode for demos and kiosks, e.g. TASK_MANAGER_IN_MEMORY=60 saves every minute
+    snapshot_interval = os.environ.get('TASK_MANAGER_IN_MEMORY')
+    if snapshot_interval:
+        Database.open_memory("task_manager.db", snapshot_path="task_manager.db",
+                             snapshot_interval=float(snapshot_interval))
+
+    # Initialize and run the application
+    app = MainWindow()
+    app.mainloop()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
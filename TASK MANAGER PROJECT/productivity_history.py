@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from database import Database
+from task_manager import TaskStatus
+
+
+HISTORY_COLUMNS = ('day', 'productivity_score', 'task_completion_rate', 'total_time_tracked',
+                   'habit_completion_rate', 'average_streak', 'overdue_tasks', 'total_habits')
+
+HISTORY_UPSERT = f'''
+                 INSERT OR REPLACE INTO productivity_history ({', '.join(HISTORY_COLUMNS)}, recorded_at)
+                 VALUES ({', '.join('?' * (len(HISTORY_COLUMNS) + 1))}) \
+                 '''
+
+
+def _sweep(events, boundary, position):
+    """Advance through (time, value) events before boundary; returns (new position, sum of values)"""
+    total = 0
+    while position < len(events) and events[position][0] < boundary:
+        total += events[position][1]
+        position += 1
+    return position, total
+
+
+class ProductivityHistory:
+    """Keeps one row of productivity insights per day in productivity_history
+
+    Past days are reconstructed from the raw tables the first time they are
+    missing: every table is read once and the days are swept in order, so
+    a year of backfill costs about as much as a single full read. Today's
+    row is rewritten from the live insights each time a snapshot is taken.
+    """
+
+    def __init__(self, db_path="task_manager.db", time_window_days=7):
+        self.db = Database(db_path)
+        self.time_window_days = time_window_days  # Matches get_productivity_insights(days=7)
+
+    def record(self, insights, score_function, today=None):
+        """Backfill missing days up to yesterday and store today's insights; returns rows written"""
+        today = today or datetime.now().date()
+        rows = [self._row(today, insights)]
+
+        last_day = self.last_recorded_day()
+        first_day = last_day + timedelta(days=1) if last_day else self.first_data_day()
+        if first_day and first_day < today:
+            rows.extend(self._row(day, values)
+                        for day, values in self.reconstruct(first_day, today - timedelta(days=1),
+                                                            score_function))
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.executemany(HISTORY_UPSERT, rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    def get_history(self, days=365, end_day=None):
+        """Get the daily rows of the last `days` days, oldest first"""
+        end_day = end_day or datetime.now().date()
+        start_day = end_day - timedelta(days=days - 1)
+        query = f'''
+                SELECT {', '.join(HISTORY_COLUMNS)}
+                FROM productivity_history
+                WHERE day BETWEEN ? AND ?
+                ORDER BY day \
+                '''
+        return self.db.fetch_all(query, (start_day.isoformat(), end_day.isoformat()),
+                                 lambda row: dict(zip(HISTORY_COLUMNS, row)))
+
+    def last_recorded_day(self):
+        """The newest day before today that has a row"""
+        today = datetime.now().date().isoformat()
+        day = self.db.fetch_all("SELECT MAX(day) FROM productivity_history WHERE day < ?", (today,))[0][0]
+        return datetime.fromisoformat(day).date() if day else None
+
+    def first_data_day(self):
+        """The first day any task, session or habit exists"""
+        first = self.db.fetch_all('''
+                                  SELECT MIN(first)
+                                  FROM (SELECT MIN(created_date) AS first FROM tasks
+                                        UNION ALL
+                                        SELECT MIN(start_time) FROM time_sessions
+                                        UNION ALL
+                                        SELECT MIN(created_date) FROM habits) \
+                                  ''')[0][0]
+        return datetime.fromisoformat(first).date() if first else None
+
+    def reconstruct(self, start_day, end_day, score_function):
+        """Yield (day, insights) for start_day..end_day as they stood at the end of each day"""
+        # Task events: (time, delta) for the total, completed and overdue counters
+        created, completed, overdue = [], [], []
+        query = "SELECT status, created_date, due_date, completed_date FROM tasks"
+        for status, created_date, due_date, completed_date in self.db.iter_query(query, batch_size=10000):
+            created.append((created_date, 1))
+            if completed_date and status == TaskStatus.COMPLETED:
+                completed.append((completed_date, 1))
+            if due_date and status != TaskStatus.CANCELLED:
+                overdue.append((due_date, 1))
+                if completed_date and status == TaskStatus.COMPLETED:
+                    overdue.append((max(due_date, completed_date), -1))
+        for events in (created, completed, overdue):
+            events.sort()
+
+        # Seconds tracked per day, from the rollups
+        seconds_by_day = dict(self.db.fetch_all(
+            "SELECT day, SUM(total_seconds) FROM time_rollups WHERE day <= ? GROUP BY day",
+            (end_day.isoformat(),)
+        ))
+
+        # Habits and the days each was completed
+        habits = sorted(self.db.fetch_all("SELECT id, created_date FROM habits"), key=lambda row: row[1])
+        completions = {}
+        for habit_id, day in self.db.iter_query(
+                "SELECT habit_id, DATE(completed_date) FROM habit_completions", batch_size=10000):
+            completions.setdefault(day, set()).add(habit_id)
+
+        positions = [0, 0, 0, 0]
+        total_tasks = completed_tasks = overdue_tasks = 0
+        habit_position = 0
+        live_habits = set()
+        streaks = {}  # habit_id -> run of consecutive days ending at its last completion
+        window = []  # Seconds of the time_window_days days ending at the current day
+
+        # Streaks and the time window need the days before start_day too
+        warmup_start = start_day - timedelta(days=self.time_window_days)
+        if completions:
+            warmup_start = min(warmup_start, datetime.fromisoformat(min(completions)).date())
+
+        day = warmup_start
+        while day <= end_day:
+            boundary = (day + timedelta(days=1)).isoformat()
+            day_text = day.isoformat()
+
+            positions[0], added = _sweep(created, boundary, positions[0])
+            positions[1], done = _sweep(completed, boundary, positions[1])
+            positions[2], late = _sweep(overdue, boundary, positions[2])
+            total_tasks += added
+            completed_tasks += done
+            overdue_tasks += late
+
+            while habit_position < len(habits) and habits[habit_position][1] < boundary:
+                live_habits.add(habits[habit_position][0])
+                habit_position += 1
+
+            completed_today = completions.get(day_text, set())
+            completed_yesterday = completions.get((day - timedelta(days=1)).isoformat(), set())
+            for habit_id in completed_today:
+                streaks[habit_id] = streaks.get(habit_id, 0) + 1 if habit_id in completed_yesterday else 1
+
+            window.append(seconds_by_day.get(day_text, 0))
+            if len(window) > self.time_window_days:  # The day itself and the days before it
+                window.pop(0)
+
+            if day >= start_day:
+                done_today = len(completed_today & live_habits)
+                insights = {
+                    'task_completion_rate': round(completed_tasks / total_tasks * 100, 2) if total_tasks else 0,
+                    'total_time_tracked': sum(window) // 60,
+                    'habit_completion_rate': round(done_today / len(live_habits) * 100, 1) if live_habits else 0,
+                    'average_streak': round(sum(streaks.get(habit_id, 0) for habit_id in live_habits)
+                                            / len(live_habits), 1) if live_habits else 0,
+                    'overdue_tasks': overdue_tasks,
+                    'total_habits': len(live_habits)
+                }
+                insights['productivity_score'] = score_function(insights)
+                yield day, insights
+
+            day += timedelta(days=1)
+
+    def _row(self, day, insights):
+        values = dict(insights, day=day.isoformat())
+        return tuple(values[column] for column in HISTORY_COLUMNS) + (datetime.now().isoformat(),)
@@ -0,0 +1,182 @@
+import calendar
+from datetime import datetime, timedelta, time
+
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# Friendly names accepted in Task.recurrence_pattern
+PATTERN_SHORTCUTS = {
+    'daily': 'FREQ=DAILY',
+    'weekdays': 'FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR',
+    'weekly': 'FREQ=WEEKLY',
+    'biweekly': 'FREQ=WEEKLY;INTERVAL=2',
+    'monthly': 'FREQ=MONTHLY',
+    'yearly': 'FREQ=YEARLY',
+}
+
+
+def _parse_datetime(value):
+    """Parse ISO or compact RRULE (YYYYMMDD[THHMMSS]) timestamps"""
+    value = value.strip()
+    if len(value) == 8 and value.isdigit():
+        return datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time.max)
+    if len(value) == 15 and value[8] == 'T':
+        return datetime.strptime(value, "%Y%m%dT%H%M%S")
+    if len(value) == 10:
+        return datetime.combine(datetime.fromisoformat(value).date(), time.max)
+    return datetime.fromisoformat(value)
+
+
+def add_months(value, months):
+    """Shift a datetime by whole months, clamping the day to the month length"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+class RecurrenceRule:
+    """A small RRULE-like recurrence (FREQ, INTERVAL, BYDAY, COUNT, UNTIL, DTSTART)
+
+    Occurrences are generated lazily and the generator jumps straight to
+    the requested window, so asking about next week of a task that has
+    recurred daily for decades costs the same as for a brand new one.
+    """
+
+    def __init__(self, freq, interval=1, by_day=None, count=None, until=None, dtstart=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency: {freq}")
+        if interval < 1:
+            raise ValueError("INTERVAL must be at least 1")
+        if by_day and freq != 'WEEKLY':
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        if count is not None and count < 1:
+            raise ValueError("COUNT must be at least 1")
+
+        self.freq = freq
+        self.interval = interval
+        self.by_day = sorted(set(by_day), key=WEEKDAYS.index) if by_day else None
+        self.count = count
+        self.until = until
+        self.dtstart = dtstart
+
+    @classmethod
+    def parse(cls, pattern):
+        """Build a rule from a shortcut name or 'KEY=VALUE;...' string"""
+        if not pattern or not pattern.strip():
+            raise ValueError("Empty recurrence pattern")
+
+        pattern = PATTERN_SHORTCUTS.get(pattern.strip().lower(), pattern)
+        if pattern.upper().startswith('RRULE:'):
+            pattern = pattern[6:]
+
+        parts = {}
+        for part in pattern.split(';'):
+            if not part.strip():
+                continue
+            if '=' not in part:
+                raise ValueError(f"Invalid recurrence part: {part}")
+            key, value = part.split('=', 1)
+            parts[key.strip().upper()] = value.strip()
+
+        by_day = None
+        if 'BYDAY' in parts:
+            by_day = [day.strip().upper() for day in parts['BYDAY'].split(',') if day.strip()]
+            unknown = [day for day in by_day if day not in WEEKDAYS]
+            if unknown:
+                raise ValueError(f"Unknown weekday(s): {', '.join(unknown)}")
+
+        try:
+            return cls(
+                freq=parts.get('FREQ', '').upper(),
+                interval=int(parts.get('INTERVAL', 1)),
+                by_day=by_day,
+                count=int(parts['COUNT']) if 'COUNT' in parts else None,
+                until=_parse_datetime(parts['UNTIL']) if 'UNTIL' in parts else None,
+                dtstart=datetime.fromisoformat(parts['DTSTART']) if 'DTSTART' in parts else None
+            )
+        except (TypeError, KeyError) as e:
+            raise ValueError(f"Invalid recurrence pattern: {pattern}") from e
+
+    def to_pattern(self):
+        """Serialize back to the 'KEY=VALUE;...' form"""
+        parts = [f"FREQ={self.freq}", f"INTERVAL={self.interval}"]
+        if self.by_day:
+            parts.append(f"BYDAY={','.join(self.by_day)}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.isoformat()}")
+        if self.dtstart is not None:
+            parts.append(f"DTSTART={self.dtstart.isoformat()}")
+        return ';'.join(parts)
+
+    def occurrences(self, anchor=None, start=None, end=None):
+        """Yield occurrences in [start, end), lazily and in order
+
+        anchor is the first occurrence of the series and is only used when
+        the rule has no DTSTART. Without end, COUNT or UNTIL the generator
+        is infinite, so bound it with itertools.islice.
+        """
+        anchor = self.dtstart or anchor
+        if anchor is None:
+            raise ValueError("A recurrence needs a DTSTART or an anchor date")
+
+        start = max(start, anchor) if start else anchor
+
+        if self.by_day:
+            occurrences = self._weekday_occurrences(anchor, start)
+        elif self.freq in ('DAILY', 'WEEKLY'):
+            occurrences = self._fixed_step_occurrences(anchor, start)
+        else:
+            occurrences = self._monthly_occurrences(anchor, start)
+
+        for index, occurrence in occurrences:
+            if self.count is not None and index >= self.count:
+                return
+            if self.until is not None and occurrence > self.until:
+                return
+            if end is not None and occurrence >= end:
+                return
+            yield occurrence
+
+    def next_after(self, after, anchor=None):
+        """Return the first occurrence strictly after a moment, or None"""
+        return next(self.occurrences(anchor, start=after + timedelta(microseconds=1)), None)
+
+    def _fixed_step_occurrences(self, anchor, start):
+        step = timedelta(days=self.interval * (7 if self.freq == 'WEEKLY' else 1))
+        index = max(0, -((anchor - start) // step))  # Ceiling division
+
+        while True:
+            yield index, anchor + index * step
+            index += 1
+
+    def _weekday_occurrences(self, anchor, start):
+        week_start = anchor - timedelta(days=anchor.weekday())
+        period = timedelta(days=7 * self.interval)
+        weekdays = [WEEKDAYS.index(day) for day in self.by_day]
+        # Days of the first week that fall before the anchor are not occurrences
+        skipped = sum(1 for weekday in weekdays if weekday < anchor.weekday())
+        period_index = max(0, (start - week_start) // period)
+
+        while True:
+            for position, weekday in enumerate(weekdays):
+                index = period_index * len(weekdays) + position - skipped
+                occurrence = week_start + period_index * period + timedelta(days=weekday)
+                if index >= 0 and occurrence >= start:
+                    yield index, occurrence
+            period_index += 1
+
+    def _monthly_occurrences(self, anchor, start):
+        step = self.interval * (12 if self.freq == 'YEARLY' else 1)
+        months = (start.year - anchor.year) * 12 + start.month - anchor.month
+        index = max(0, months // step)
+
+        while True:
+            occurrence = add_months(anchor, index * step)
+            if occurrence >= start:
+                yield index, occurrence
+            index += 1
@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from task_manager import TaskStatus
+
+
+class ReminderKind:
+    DUE_SOON = "due_soon"
+    OVERDUE = "overdue"
+
+
+class ReminderEngine:
+    """Fires callbacks when tasks become due or overdue
+
+    Upcoming deadlines live in a single heap served by one thread that
+    sleeps until the earliest one, so nothing polls the database. The heap
+    follows TaskManager change notifications. Every schedule() bumps the
+    task's version, so entries queued before a task was rescheduled (even
+    to the same date), completed or deleted are skipped when they come up,
+    and dropped in one pass once they outnumber the live entries.
+    """
+
+    def __init__(self, task_manager, callback=None, remind_before=timedelta(minutes=15)):
+        self.task_manager = task_manager
+        self.callback = callback
+        self.remind_before = remind_before
+        self.overdue = set()  # Task ids currently overdue
+
+        self._heap = []
+        self._due_dates = {}  # task_id -> current due date
+        self._versions = {}  # task_id -> version of its live heap entries
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        self._load()
+        self.task_manager.add_listener(self._on_task_changed)
+
+    def _load(self):
+        """Load pending deadlines from the database"""
+        query = '''
+                SELECT id, due_date \
+                FROM tasks
+                WHERE due_date IS NOT NULL \
+                  AND status NOT IN (?, ?) \
+                '''
+        rows = self.task_manager.db.fetch_all(query, (TaskStatus.COMPLETED, TaskStatus.CANCELLED))
+        now = datetime.now()
+
+        with self._condition:
+            for task_id, due_date in rows:
+                due_date = datetime.fromisoformat(due_date)
+                self._due_dates[task_id] = due_date
+                if due_date <= now:
+                    self.overdue.add(task_id)
+                else:
+                    self._push_entries(task_id, due_date, now, heapify=False)
+            heapq.heapify(self._heap)
+
+    def start(self):
+        """Start the reminder thread"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop the reminder thread and stop following task changes"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self.task_manager.remove_listener(self._on_task_changed)
+
+    def schedule(self, task_id, due_date):
+        """Set or replace the deadline of a task (None clears it)"""
+        with self._condition:
+            self._due_dates.pop(task_id, None)
+            self._versions[task_id] = self._versions.get(task_id, 0) + 1
+            self.overdue.discard(task_id)
+            self._compact()
+
+            if due_date is None:
+                return
+
+            self._due_dates[task_id] = due_date
+            now = datetime.now()
+            if due_date <= now:
+                self.overdue.add(task_id)
+            else:
+                self._push_entries(task_id, due_date, now)
+                self._condition.notify()
+
+    def cancel(self, task_id):
+        """Forget a task's deadline"""
+        self.schedule(task_id, None)
+
+    def pending_count(self):
+        """Number of tasks with a deadline still ahead"""
+        with self._condition:
+            return len(self._due_dates) - len(self.overdue)
+
+    def _compact(self):
+        """Drop stale entries once they outnumber the live ones (at most two per deadline)"""
+        if len(self._heap) > 4 * len(self._due_dates) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry):
+        task_id, version = entry[2], entry[3]
+        return task_id in self._due_dates and self._versions.get(task_id, 0) == version
+
+    def _push_entries(self, task_id, due_date, now, heapify=True):
+        push = heapq.heappush if heapify else list.append
+        version = self._versions.get(task_id, 0)
+        if self.remind_before:
+            remind_at = due_date - self.remind_before
+            if remind_at > now:
+                push(self._heap, (remind_at, next(self._counter), task_id, version, ReminderKind.DUE_SOON))
+        push(self._heap, (due_date, next(self._counter), task_id, version, ReminderKind.OVERDUE))
+
+    def _run(self):
+        """Sleep until the earliest deadline and fire everything that is due"""
+        while True:
+            fired = []
+
+            with self._condition:
+                if not self._running:
+                    return
+
+                now = datetime.now()
+                while self._heap and self._heap[0][0] <= now:
+                    entry = heapq.heappop(self._heap)
+                    if not self._is_live(entry):
+                        continue  # Stale entry
+                    task_id, kind = entry[2], entry[4]
+                    if kind == ReminderKind.OVERDUE:
+                        self.overdue.add(task_id)
+                    fired.append((kind, task_id))
+
+                if not fired:
+                    timeout = (self._heap[0][0] - now).total_seconds() if self._heap else None
+                    self._condition.wait(timeout)
+                    continue
+
+            if self.callback:
+                for kind, task_id in fired:
+                    self.callback(kind, task_id)
+
+    def _on_task_changed(self, event, task_id, task):
+        # Notifications come from writer threads while the reminder thread fires
+        with self._condition:
+            if task is None or task.status in (TaskStatus.COMPLETED, TaskStatus.CANCELLED):
+                self.cancel(task_id)
+            elif self._due_dates.get(task_id) != task.due_date:
+                self.schedule(task_id, task.due_date)
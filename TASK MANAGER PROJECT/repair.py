@@ -0,0 +1,47 @@
+"""Rebuild derived data from the raw tables
+
+Usage:
+
+    python repair.py                       # everything
+    python repair.py tracked-time --db data/alice.db
+    python repair.py rollups durations
+
+Tracked time, the daily time rollups, the duration statistics and the
+duration sketches are kept up to date incrementally; this recomputes them
+in one grouped pass each, e.g. after editing time_sessions or tasks by hand.
+"""
+import argparse
+import time
+from duration_estimator import DurationEstimator
+from sketches import DurationSketches
+from time_tracker import TimeTracker
+
+
+REPAIRS = {
+    'tracked-time': lambda db_path: TimeTracker(db_path).rebuild_tracked_time(),
+    'rollups': lambda db_path: TimeTracker(db_path).rebuild_rollups(),
+    'durations': lambda db_path: DurationEstimator(db_path).rebuild(),
+    'sketches': lambda db_path: DurationSketches(db_path).rebuild(),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild derived task manager data")
+    parser.add_argument('targets', nargs='*',
+                        help=f"What to rebuild: {', '.join(REPAIRS)} (default: everything)")
+    parser.add_argument('--db', default="task_manager.db", help="Database file")
+    args = parser.parse_args(argv)
+
+    unknown = [target for target in args.targets if target not in REPAIRS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+
+    # Tracked time first: the duration statistics fall back to it
+    for target in args.targets or list(REPAIRS):
+        started = time.perf_counter()
+        REPAIRS[target](args.db)
+        print(f"Rebuilt {target} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import threading
+from datetime import timedelta
+from task_manager import TaskStatus, Priority
+
+
+# How far ahead of its due date a task should be started, by priority
+PRIORITY_LEAD_TIME = {
+    Priority.URGENT: timedelta(days=3),
+    Priority.HIGH: timedelta(days=2),
+    Priority.MEDIUM: timedelta(days=1),
+    Priority.LOW: timedelta(0),
+}
+
+# Tasks without a due date are treated as due this long after creation
+PRIORITY_DEFAULT_HORIZON = {
+    Priority.URGENT: timedelta(days=1),
+    Priority.HIGH: timedelta(days=3),
+    Priority.MEDIUM: timedelta(days=7),
+    Priority.LOW: timedelta(days=14),
+}
+
+PRIORITY_RANK = {
+    Priority.URGENT: 0,
+    Priority.HIGH: 1,
+    Priority.MEDIUM: 2,
+    Priority.LOW: 3,
+}
+
+ACTIONABLE_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+
+def task_score(task):
+    """Return the sort key of a task (smaller means work on it sooner)
+
+    The key is the latest moment the task should be started: its due date
+    (or a priority-based horizon from creation), minus the estimated effort,
+    minus a priority lead time. It does not depend on the current time, so
+    heap entries never need to be re-scored as the clock moves.
+    """
+    if task.due_date:
+        deadline = task.due_date
+    else:
+        horizon = PRIORITY_DEFAULT_HORIZON.get(task.priority, PRIORITY_DEFAULT_HORIZON[Priority.MEDIUM])
+        deadline = task.created_date + horizon
+
+    lead_time = PRIORITY_LEAD_TIME.get(task.priority, PRIORITY_LEAD_TIME[Priority.MEDIUM])
+    effort = timedelta(minutes=task.estimated_duration or 0)
+    start_by = deadline - effort - lead_time
+
+    return start_by.timestamp(), PRIORITY_RANK.get(task.priority, len(PRIORITY_RANK))
+
+
+class TaskScheduler:
+    """Keeps actionable tasks in a heap to answer "what should I work on now"
+
+    The heap is filled once from the database and then kept up to date from
+    TaskManager change notifications, so picking the next tasks never
+    re-sorts the whole table. Replaced entries are invalidated lazily and
+    dropped when they reach the top of the heap. Notifications may arrive
+    from another thread (e.g. a WriteBehindQueue), so the heap is locked.
+    """
+
+    def __init__(self, task_manager):
+        self.task_manager = task_manager
+        self._heap = []
+        self._entries = {}  # task_id -> live heap entry
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self.reload()
+        self.task_manager.add_listener(self._on_task_changed)
+
+    def reload(self):
+        """Rebuild the heap from the database"""
+        tasks = []
+        for status in ACTIONABLE_STATUSES:
+            tasks.extend(self.task_manager.get_all_tasks(status=status))
+
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+
+            for task in tasks:
+                entry = [task_score(task), next(self._counter), task]
+                self._entries[task.id] = entry
+                self._heap.append(entry)
+
+            heapq.heapify(self._heap)
+
+    def close(self):
+        """Stop following task changes"""
+        self.task_manager.remove_listener(self._on_task_changed)
+
+    def update(self, task):
+        """Add, re-score or drop a task after it changed"""
+        with self._lock:
+            self.remove(task.id)
+
+            if task.status in ACTIONABLE_STATUSES:
+                entry = [task_score(task), next(self._counter), task]
+                self._entries[task.id] = entry
+                heapq.heappush(self._heap, entry)
+
+    def remove(self, task_id):
+        """Drop a task from the schedule"""
+        with self._lock:
+            entry = self._entries.pop(task_id, None)
+            if entry is not None:
+                entry[-1] = None  # Invalidate in place, discarded when popped
+
+    def next(self, n=1):
+        """Return the n tasks to work on next, most urgent first"""
+        picked = []
+
+        with self._lock:
+            while self._heap and len(picked) < n:
+                entry = heapq.heappop(self._heap)
+                if entry[-1] is not None:
+                    picked.append(entry)
+
+            for entry in picked:
+                heapq.heappush(self._heap, entry)
+
+        return [entry[-1] for entry in picked]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _on_task_changed(self, event, task_id, task):
+        with self._lock:
+            if task is None:
+                self.remove(task_id)
+            else:
+                self.update(task)
+
+            # Keep invalidated entries from piling up after many edits
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [entry for entry in self._heap if entry[-1] is not None]
+                heapq.heapify(self._heap)
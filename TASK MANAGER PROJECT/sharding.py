@@ -0,0 +1,206 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from task_manager import SPENT_MINUTES, TaskManager, TaskStatus
+from time_tracker import TimeTracker
+from habit_tracker import HabitTracker
+
+
+SHARD_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]{0,99}$')
+
+
+def task_partials(db):
+    """Mergeable task counts of one shard"""
+    partial = {'status': {}, 'priority': {}, 'time_sum': 0, 'time_count': 0, 'overdue': 0}
+
+    for status, priority, count in db.fetch_all(
+            "SELECT status, priority, COUNT(*) FROM tasks GROUP BY status, priority"):
+        partial['status'][status] = partial['status'].get(status, 0) + count
+        partial['priority'][priority] = partial['priority'].get(priority, 0) + count
+
+    time_sum, time_count = db.fetch_all(f'''
+                                        SELECT COALESCE(SUM({SPENT_MINUTES}), 0), COUNT(*)
+                                        FROM tasks
+                                        WHERE status = ? \
+                                          AND (actual_duration > 0 OR tracked_seconds > 0) \
+                                        ''', (TaskStatus.COMPLETED,))[0]
+    partial['time_sum'] = time_sum
+    partial['time_count'] = time_count
+
+    partial['overdue'] = db.fetch_all('''
+                                      SELECT COUNT(*)
+                                      FROM tasks
+                                      WHERE due_date < ? \
+                                        AND status NOT IN (?, ?) \
+                                      ''', (datetime.now().isoformat(), TaskStatus.COMPLETED,
+                                            TaskStatus.CANCELLED))[0][0]
+    return partial
+
+
+def merge_task_partials(partials):
+    """Combine task partials into the shape of TaskManager.get_task_statistics"""
+    status_counts = {}
+    priority_counts = {}
+    time_sum = time_count = overdue = 0
+
+    for partial in partials:
+        for status, count in partial['status'].items():
+            status_counts[status] = status_counts.get(status, 0) + count
+        for priority, count in partial['priority'].items():
+            priority_counts[priority] = priority_counts.get(priority, 0) + count
+        time_sum += partial['time_sum']
+        time_count += partial['time_count']
+        overdue += partial['overdue']
+
+    total_tasks = sum(status_counts.values())
+    completed_tasks = status_counts.get(TaskStatus.COMPLETED, 0)
+    return {
+        'total_tasks': total_tasks,
+        'status_distribution': status_counts,
+        'priority_distribution': priority_counts,
+        'completion_rate': round(completed_tasks / total_tasks * 100, 2) if total_tasks else 0,
+        'average_time_spent': round(time_sum / time_count, 2) if time_count else 0,
+        'overdue_tasks': overdue
+    }
+
+
+def habit_partials(db):
+    """Mergeable habit counts of one shard"""
+    total, streak_sum, longest = db.fetch_all(
+        "SELECT COUNT(*), COALESCE(SUM(streak_count), 0), COALESCE(MAX(streak_count), 0) FROM habits"
+    )[0]
+    completed_today = db.fetch_all('''
+                                   SELECT COUNT(DISTINCT c.habit_id)
+                                   FROM habit_completions c
+                                            JOIN habits h ON h.id = c.habit_id
+                                   WHERE DATE(c.completed_date) = ? \
+                                   ''', (datetime.now().date().isoformat(),))[0][0]
+    return {'total': total, 'streak_sum': streak_sum, 'longest': longest,
+            'completed_today': completed_today}
+
+
+def merge_habit_partials(partials):
+    """Combine habit partials into the shape of HabitTracker.get_habit_statistics"""
+    partials = list(partials)
+    total = sum(partial['total'] for partial in partials)
+    streak_sum = sum(partial['streak_sum'] for partial in partials)
+    completed_today = sum(partial['completed_today'] for partial in partials)
+    return {
+        'total_habits': total,
+        'total_streaks': streak_sum,
+        'average_streak': round(streak_sum / total, 1) if total else 0,
+        'completion_rate': round(completed_today / total * 100, 1) if total else 0,
+        'longest_streak': max((partial['longest'] for partial in partials), default=0),
+        'completed_today': completed_today
+    }
+
+
+def merge_daily_totals(partials):
+    """Sum [(day, seconds)] lists from several shards into one, ordered by day"""
+    totals = {}
+    for rows in partials:
+        for day, seconds in rows:
+            totals[day] = totals.get(day, 0) + seconds
+    return sorted(totals.items())
+
+
+class ShardRouter:
+    """Keeps each user's (or workspace's) data in its own SQLite file
+
+    Writes to different shards never contend for the same database lock.
+    Per-user managers are created on first use and cached. Aggregate
+    queries run a small partial query on every shard in parallel and merge
+    the partial counts, so team totals never copy rows between files.
+    """
+
+    def __init__(self, shard_dir=os.path.join("data", "shards"), max_workers=8):
+        self.shard_dir = shard_dir
+        self.max_workers = max_workers
+        self._managers = {}
+        self._lock = threading.Lock()
+        os.makedirs(shard_dir, exist_ok=True)
+
+    def shard_path(self, user):
+        """Database file of a user"""
+        if not SHARD_NAME.match(str(user)):
+            raise ValueError(f"Invalid user/workspace name for a shard: {user!r}")
+        return os.path.join(self.shard_dir, f"{user}.db")
+
+    def users(self):
+        """Users that have a shard"""
+        return sorted(name[:-3] for name in os.listdir(self.shard_dir)
+                      if name.endswith('.db') and SHARD_NAME.match(name[:-3]))
+
+    # Routing
+    def task_manager(self, user):
+        """TaskManager on the user's shard"""
+        return self._manager(TaskManager, user)
+
+    def time_tracker(self, user):
+        """TimeTracker on the user's shard"""
+        return self._manager(TimeTracker, user)
+
+    def habit_tracker(self, user):
+        """HabitTracker on the user's shard"""
+        return self._manager(HabitTracker, user)
+
+    def _manager(self, manager_class, user):
+        key = (manager_class, user)
+        with self._lock:
+            manager = self._managers.get(key)
+            if manager is None:
+                manager = self._managers[key] = manager_class(self.shard_path(user))
+            return manager
+
+    # Fan-out
+    def map_shards(self, func, users=None):
+        """Run func(user) for every shard in parallel and return {user: result}"""
+        users = self.users() if users is None else list(users)
+        if not users:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(users))) as executor:
+            return dict(zip(users, executor.map(func, users)))
+
+    def get_task_statistics(self, users=None):
+        """Task statistics across shards"""
+        partials = self.map_shards(lambda user: task_partials(self.task_manager(user).db), users)
+        return merge_task_partials(partials.values())
+
+    def get_habit_statistics(self, users=None):
+        """Habit statistics across shards"""
+        partials = self.map_shards(lambda user: habit_partials(self.habit_tracker(user).db), users)
+        return merge_habit_partials(partials.values())
+
+    def get_daily_totals(self, start_date, end_date=None, session_type=None, users=None):
+        """[(day, seconds)] tracked across shards for start_date <= day <= end_date"""
+        partials = self.map_shards(
+            lambda user: self.time_tracker(user).get_daily_totals(start_date, end_date, session_type), users
+        )
+        return merge_daily_totals(partials.values())
+
+    def get_team_statistics(self, days=7, users=None):
+        """Task, habit and time statistics of the given users (default: all shards)"""
+        users = self.users() if users is None else list(users)
+        start_date = datetime.now() - timedelta(days=days - 1)  # Today counts as one of the days
+
+        def shard_partials(user):
+            return (task_partials(self.task_manager(user).db),
+                    habit_partials(self.habit_tracker(user).db),
+                    self.time_tracker(user).get_daily_totals(start_date))
+
+        # One fan-out for all three aggregates
+        partials = list(self.map_shards(shard_partials, users).values())
+        daily_totals = merge_daily_totals(partial[2] for partial in partials)
+
+        return {
+            'users': len(users),
+            'tasks': merge_task_partials(partial[0] for partial in partials),
+            'habits': merge_habit_partials(partial[1] for partial in partials),
+            'time': {
+                'total_time_minutes': sum(seconds for _, seconds in daily_totals) // 60,
+                'daily_breakdown': [{'date': day, 'total_time': seconds}
+                                    for day, seconds in reversed(daily_totals)]
+            }
+        }
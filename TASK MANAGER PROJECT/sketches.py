@@ -0,0 +1,253 @@
+import json
+import math
+from datetime import datetime, timedelta
+from database import Database, begin_write
+
+
+# Relative error of every quantile; sketches can only be merged at the same accuracy
+RELATIVE_ACCURACY = 0.01
+
+# Sketch kinds: session lengths in seconds (keyed by session type),
+# task completion times in minutes (keyed by category)
+SESSION_KIND = 'session'
+TASK_KIND = 'task'
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+# Tasks in the task sketches: completed ones (the parameter) with a completion date and time spent
+SKETCHED_TASKS = "status = ? AND completed_date IS NOT NULL AND (actual_duration > 0 OR tracked_seconds > 0)"
+
+SKETCH_UPSERT = '''
+                INSERT OR REPLACE INTO duration_sketches (day, kind, key, count, total, min_value, max_value, bins)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?) \
+                '''
+
+
+class LogHistogram:
+    """Histogram with logarithmically sized buckets (as in DDSketch)
+
+    Bucket i holds values in (gamma^(i-1), gamma^i], so any quantile is
+    answered within RELATIVE_ACCURACY of the true value. Durations from a
+    second to a year need under a thousand buckets however many values are
+    added, and two histograms merge by adding their bucket counts.
+    """
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self, bins=None, count=0, total=0.0, min_value=None, max_value=None):
+        self.bins = bins or {}  # bucket index -> count
+        self.count = count
+        self.total = total
+        self.min_value = min_value
+        self.max_value = max_value
+
+    def add(self, value, weight=1):
+        if value is None or value <= 0:
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + weight
+        self.count += weight
+        self.total += value * weight
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+
+    def merge(self, other):
+        """Add the values of another histogram"""
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+
+    def quantile(self, q):
+        """Value below which a fraction q of the values fall (None if empty)"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min_value), self.max_value)
+        return self.max_value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        """Count, mean, min, max and the requested quantiles as p50, p90, ..."""
+        result = {
+            'count': self.count,
+            'mean': _round(self.mean),
+            'min': _round(self.min_value),
+            'max': _round(self.max_value)
+        }
+        for q in quantiles:
+            result[f"p{q * 100:g}"] = _round(self.quantile(q))
+        return result
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a histogram from (count, total, min_value, max_value, bins)"""
+        count, total, min_value, max_value, bins = row
+        return cls({int(index): value for index, value in json.loads(bins).items()},
+                   count, total, min_value, max_value)
+
+    def to_row(self):
+        return (self.count, self.total, self.min_value, self.max_value,
+                json.dumps(self.bins, separators=(',', ':')))
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def add_to_sketches(conn, observations):
+    """Add (day, kind, key, value) observations to the stored daily sketches
+
+    Observations are grouped first, so each affected sketch is read and
+    written once per call. The write lock is taken before the first read,
+    so concurrent additions to the same sketch are never lost.
+    """
+    grouped = {}
+    for day, kind, key, value in observations:
+        if value and value > 0:
+            histogram = grouped.get((day, kind, key or ""))
+            if histogram is None:
+                histogram = grouped[(day, kind, key or "")] = LogHistogram()
+            histogram.add(value)
+
+    if not grouped:
+        return
+    begin_write(conn)
+    rows = []
+    for sketch_key, histogram in grouped.items():
+        stored = conn.execute(
+            "SELECT count, total, min_value, max_value, bins FROM duration_sketches "
+            "WHERE day = ? AND kind = ? AND key = ?", sketch_key
+        ).fetchone()
+        if stored:
+            histogram.merge(LogHistogram.from_row(stored))
+        rows.append(sketch_key + histogram.to_row())
+    conn.executemany(SKETCH_UPSERT, rows)
+
+
+def add_session_sketches(conn, sessions):
+    """Add closed sessions, given as (task_id, start_time, duration, session_type), to the sketches"""
+    observations = []
+    for task_id, start_time, duration, session_type in sessions:
+        if duration and duration > 0:
+            day = start_time[:10] if isinstance(start_time, str) else start_time.date().isoformat()
+            observations.append((day, SESSION_KIND, session_type or 'pomodoro', duration))
+    add_to_sketches(conn, observations)
+
+
+class DurationSketches:
+    """Daily duration histograms of sessions and completed tasks
+
+    One small row per day, kind and key is kept in duration_sketches and
+    updated as sessions close and tasks complete. Percentiles over any
+    range of days merge those rows, so they cost a few kilobytes of memory
+    whether the range holds a hundred sessions or millions.
+    """
+
+    def __init__(self, db_path="task_manager.db"):
+        self.db = Database(db_path)
+        self._ensure_sketches()
+
+    def add_task(self, category, minutes, completed_date=None):
+        """Add a completed task's time spent (minutes)"""
+        day = (completed_date or datetime.now()).date().isoformat()
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                add_to_sketches(conn, [(day, TASK_KIND, category, minutes)])
+        finally:
+            conn.close()
+
+    def histogram(self, kind, start_day, end_day=None, key=None):
+        """Merged histogram of start_day <= day <= end_day, for one key or all"""
+        query = '''
+                SELECT count, total, min_value, max_value, bins
+                FROM duration_sketches
+                WHERE kind = ? \
+                  AND day BETWEEN ? AND ? \
+                '''
+        params = [kind, _day(start_day), _day(end_day or datetime.now())]
+        if key is not None:
+            query += " AND key = ?"
+            params.append(key)
+
+        merged = LogHistogram()
+        for row in self.db.iter_query(query, params):
+            merged.merge(LogHistogram.from_row(row))
+        return merged
+
+    def percentiles(self, kind, days=30, key=None, quantiles=DEFAULT_QUANTILES):
+        """Summary of the last `days` days (see LogHistogram.summary)"""
+        start_day = datetime.now() - timedelta(days=days - 1)
+        return self.histogram(kind, start_day, key=key).summary(quantiles)
+
+    def percentiles_by_key(self, kind, days=30, quantiles=DEFAULT_QUANTILES):
+        """{key: summary} of the last `days` days"""
+        start_day = datetime.now() - timedelta(days=days - 1)
+        keys = [row[0] for row in self.db.fetch_all(
+            "SELECT DISTINCT key FROM duration_sketches WHERE kind = ? AND day >= ? ORDER BY key",
+            (kind, _day(start_day))
+        )]
+        return {key: self.histogram(kind, start_day, key=key).summary(quantiles) for key in keys}
+
+    def rebuild(self):
+        """Recompute all sketches from sessions and completed tasks in one pass each"""
+        from task_manager import SPENT_MINUTES, TaskStatus  # task_manager imports this module
+
+        histograms = {}
+
+        def add(day, kind, key, value):
+            histogram = histograms.get((day, kind, key or ""))
+            if histogram is None:
+                histogram = histograms[(day, kind, key or "")] = LogHistogram()
+            histogram.add(value)
+
+        for start_time, duration, session_type in self.db.iter_query(
+                "SELECT start_time, duration, session_type FROM time_sessions WHERE duration > 0",
+                batch_size=10000):
+            add(start_time[:10], SESSION_KIND, session_type or 'pomodoro', duration)
+
+        query = f'''
+                SELECT completed_date, category, {SPENT_MINUTES}
+                FROM tasks
+                WHERE {SKETCHED_TASKS} \
+                '''
+        for completed_date, category, minutes in self.db.iter_query(query, (TaskStatus.COMPLETED,),
+                                                                    batch_size=10000):
+            add(completed_date[:10], TASK_KIND, category, minutes)
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM duration_sketches")
+                conn.executemany(SKETCH_UPSERT, (key + histogram.to_row()
+                                                 for key, histogram in histograms.items()))
+        finally:
+            conn.close()
+
+    def _ensure_sketches(self):
+        """Build the sketches for databases that have durations but no sketches yet"""
+        from task_manager import TaskStatus  # task_manager imports this module
+
+        if self.db.read_only or self.db.fetch_all("SELECT 1 FROM duration_sketches LIMIT 1"):
+            return
+        if (self.db.fetch_all("SELECT 1 FROM time_sessions WHERE duration > 0 LIMIT 1")
+                or self.db.fetch_all(f"SELECT 1 FROM tasks WHERE {SKETCHED_TASKS} LIMIT 1",
+                                     (TaskStatus.COMPLETED,))):
+            self.rebuild()
+
+
+def _day(value):
+    return value.date().isoformat() if isinstance(value, datetime) else str(value)[:10]
@@ -1,227 +1,481 @@
-import json
-from datetime import datetime, timedelta  # FIXED: timedelta not timedata
-from typing import List, Dict, Optional  # FIXED: Dict not Blet
-from database import Database
-
-
-class TaskStatus:
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled"
-
-
-class Priority:
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    URGENT = "urgent"
-
-
-class Task:
-    def __init__(self, id=None, title="", description="", status=TaskStatus.PENDING,
-                 priority=Priority.MEDIUM, created_date=None, due_date=None,
-                 completed_date=None, estimated_duration=0, actual_duration=0,
-                 category="", tags=None, recurring=False, recurrence_pattern=None):
-        self.id = id
-        self.title = title
-        self.description = description
-        self.status = status
-        self.priority = priority
-        self.created_date = created_date or datetime.now()
-        self.due_date = due_date
-        self.completed_date = completed_date
-        self.estimated_duration = estimated_duration
-        self.actual_duration = actual_duration
-        self.category = category
-        self.tags = tags or []
-        self.recurring = recurring
-        self.recurrence_pattern = recurrence_pattern
-
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'status': self.status,
-            'priority': self.priority,
-            'created_date': self.created_date.isoformat(),
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'completed_date': self.completed_date.isoformat() if self.completed_date else None,
-            'estimated_duration': self.estimated_duration,
-            'actual_duration': self.actual_duration,
-            'category': self.category,
-            'tags': json.dumps(self.tags),
-            'recurring': self.recurring,
-            'recurrence_pattern': self.recurrence_pattern
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        tags = json.loads(data['tags']) if data['tags'] else []
-        return cls(
-            id=data['id'],
-            title=data['title'],
-            description=data['description'],
-            status=data['status'],
-            priority=data['priority'],
-            created_date=datetime.fromisoformat(data['created_date']),
-            due_date=datetime.fromisoformat(data['due_date']) if data['due_date'] else None,
-            completed_date=datetime.fromisoformat(data['completed_date']) if data['completed_date'] else None,
-            estimated_duration=data['estimated_duration'],
-            actual_duration=data['actual_duration'],
-            category=data['category'],
-            tags=tags,
-            recurring=bool(data['recurring']),
-            recurrence_pattern=data['recurrence_pattern']
-        )
-
-
-class TaskManager:
-    def __init__(self, db_path="task_manager.db"):
-        self.db = Database(db_path)
-
-    def create_task(self, task):
-        """Create a new task and return its ID"""
-        task_data = task.to_dict()
-        del task_data['id']  # Remove ID for insertion
-
-        query = '''
-                INSERT INTO tasks (title, description, status, priority, created_date, due_date, \
-                                   completed_date, estimated_duration, actual_duration, category, \
-                                   tags, recurring, recurrence_pattern) \
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) \
-                '''
-
-        params = (
-            task_data['title'], task_data['description'], task_data['status'],
-            task_data['priority'], task_data['created_date'], task_data['due_date'],
-            task_data['completed_date'], task_data['estimated_duration'],
-            task_data['actual_duration'], task_data['category'], task_data['tags'],
-            task_data['recurring'], task_data['recurrence_pattern']
-        )
-
-        return self.db.execute_query(query, params)
-
-    def get_task(self, task_id):
-        """Retrieve a task by ID"""
-        query = "SELECT * FROM tasks WHERE id = ?"
-        results = self.db.execute_query(query, (task_id,))
-        return Task.from_dict(results[0]) if results else None
-
-    def get_all_tasks(self, status=None, category=None):
-        """Retrieve all tasks with optional filtering"""
-        query = "SELECT * FROM tasks WHERE 1=1"
-        params = []
-
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-
-        if category:
-            query += " AND category = ?"
-            params.append(category)
-
-        query += " ORDER BY created_date DESC"
-
-        results = self.db.execute_query(query, params)
-        return [Task.from_dict(data) for data in results]
-
-    def update_task(self, task_id, **kwargs):
-        """Update task properties"""
-        allowed_fields = ['title', 'description', 'status', 'priority', 'due_date',
-                          'estimated_duration', 'actual_duration', 'category', 'tags',
-                          'recurring', 'recurrence_pattern', 'completed_date']
-
-        update_fields = []
-        params = []
-
-        for field, value in kwargs.items():
-            if field in allowed_fields:
-                if field == 'tags':
-                    value = json.dumps(value)
-                elif field in ['due_date', 'completed_date'] and value:
-                    value = value.isoformat()
-
-                update_fields.append(f"{field} = ?")
-                params.append(value)
-
-        if not update_fields:
-            return False
-
-        params.append(task_id)
-        query = f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?"
-
-        result = self.db.execute_query(query, params)
-        return result is not None
-
-    def delete_task(self, task_id):
-        """Delete a task"""
-        query = "DELETE FROM tasks WHERE id = ?"
-        self.db.execute_query(query, (task_id,))
-        return True
-
-    def mark_task_complete(self, task_id, actual_duration=0):
-        """Mark a task as completed"""
-        completed_date = datetime.now()
-        return self.update_task(
-            task_id,
-            status=TaskStatus.COMPLETED,
-            completed_date=completed_date,
-            actual_duration=actual_duration
-        )
-
-    def start_task(self, task_id):
-        """Mark a task as in progress"""
-        return self.update_task(task_id, status=TaskStatus.IN_PROGRESS)
-
-    def get_overdue_tasks(self):
-        """Get tasks that are overdue"""
-        current_time = datetime.now().isoformat()
-        query = '''
-                SELECT * \
-                FROM tasks
-                WHERE due_date < ? \
-                  AND status NOT IN (?, ?)
-                ORDER BY due_date ASC \
-                '''
-        params = (current_time, TaskStatus.COMPLETED, TaskStatus.CANCELLED)
-
-        results = self.db.execute_query(query, params)
-        return [Task.from_dict(data) for data in results]
-
-    def get_task_statistics(self):
-        """Get comprehensive task statistics"""
-        # Total tasks by status
-        status_query = "SELECT status, COUNT(*) as count FROM tasks GROUP BY status"
-        status_results = self.db.execute_query(status_query)
-        status_counts = {result['status']: result['count'] for result in status_results}
-
-        # Tasks by priority
-        priority_query = "SELECT priority, COUNT(*) as count FROM tasks GROUP BY priority"
-        priority_results = self.db.execute_query(priority_query)
-        priority_counts = {result['priority']: result['count'] for result in priority_results}
-
-        # Completion statistics
-        total_tasks = sum(status_counts.values())
-        completed_tasks = status_counts.get(TaskStatus.COMPLETED, 0)
-        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-
-        # Average time spent
-        time_query = '''
-                     SELECT AVG(actual_duration) as avg_time
-                     FROM tasks
-                     WHERE status = ? \
-                       AND actual_duration > 0 \
-                     '''
-        time_result = self.db.execute_query(time_query, (TaskStatus.COMPLETED,))
-        avg_time_spent = time_result[0]['avg_time'] if time_result and time_result[0]['avg_time'] else 0
-
-        return {
-            'total_tasks': total_tasks,
-            'status_distribution': status_counts,
-            'priority_distribution': priority_counts,
-            'completion_rate': round(completion_rate, 2),
-            'average_time_spent': round(avg_time_spent, 2),
-            'overdue_tasks': len(self.get_overdue_tasks())
-        }
\ No newline at end of file
+import copy
+import json
+import threading
+from datetime import datetime, timedelta  # FIXED: timedelta not timedata
+from typing import List, Dict, Optional  # FIXED: Dict not Blet
+from database import Database
+from dependency_graph import DependencyGraph
+from duration_estimator import DurationEstimator
+from recurrence import RecurrenceRule
+from sketches import TASK_KIND, DurationSketches
+
+
+class TaskStatus:
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class Priority:
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
+
+
+# Column order used by Task.from_row
+TASK_COLUMNS = ('id', 'title', 'description', 'status', 'priority', 'created_date', 'due_date',
+                'completed_date', 'estimated_duration', 'actual_duration', 'category', 'tags',
+                'recurring', 'recurrence_pattern', 'tracked_seconds')
+TASK_SELECT = ', '.join(TASK_COLUMNS)
+
+# Minutes spent on a task: the duration entered on completion, else the time tracked in sessions
+SPENT_MINUTES = "CASE WHEN actual_duration > 0 THEN actual_duration ELSE tracked_seconds / 60.0 END"
+
+
+class Task:
+    def __init__(self, id=None, title="", description="", status=TaskStatus.PENDING,
+                 priority=Priority.MEDIUM, created_date=None, due_date=None,
+                 completed_date=None, estimated_duration=0, actual_duration=0,
+                 category="", tags=None, recurring=False, recurrence_pattern=None, tracked_seconds=0):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.priority = priority
+        self.created_date = created_date or datetime.now()
+        self.due_date = due_date
+        self.completed_date = completed_date
+        self.estimated_duration = estimated_duration
+        self.actual_duration = actual_duration
+        self.category = category
+        self.tags = tags or []
+        self.recurring = recurring
+        self.recurrence_pattern = recurrence_pattern
+        self.tracked_seconds = tracked_seconds  # Maintained by the database from time_sessions
+
+    @property
+    def spent_minutes(self):
+        """Minutes spent: actual_duration if entered, otherwise the tracked time"""
+        return self.actual_duration if self.actual_duration > 0 else self.tracked_seconds / 60
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'status': self.status,
+            'priority': self.priority,
+            'created_date': self.created_date.isoformat(),
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'completed_date': self.completed_date.isoformat() if self.completed_date else None,
+            'estimated_duration': self.estimated_duration,
+            'actual_duration': self.actual_duration,
+            'category': self.category,
+            'tags': json.dumps(self.tags),
+            'recurring': self.recurring,
+            'recurrence_pattern': self.recurrence_pattern,
+            'tracked_seconds': self.tracked_seconds
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tags = json.loads(data['tags']) if data['tags'] else []
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            description=data['description'],
+            status=data['status'],
+            priority=data['priority'],
+            created_date=datetime.fromisoformat(data['created_date']),
+            due_date=datetime.fromisoformat(data['due_date']) if data['due_date'] else None,
+            completed_date=datetime.fromisoformat(data['completed_date']) if data['completed_date'] else None,
+            estimated_duration=data['estimated_duration'],
+            actual_duration=data['actual_duration'],
+            category=data['category'],
+            tags=tags,
+            recurring=bool(data['recurring']),
+            recurrence_pattern=data['recurrence_pattern'],
+            tracked_seconds=data.get('tracked_seconds') or 0
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a task straight from a tuple in TASK_COLUMNS order"""
+        (id, title, description, status, priority, created_date, due_date, completed_date,
+         estimated_duration, actual_duration, category, tags, recurring, recurrence_pattern,
+         tracked_seconds) = row
+        return cls(
+            id, title, description, status, priority,
+            datetime.fromisoformat(created_date),
+            datetime.fromisoformat(due_date) if due_date else None,
+            datetime.fromisoformat(completed_date) if completed_date else None,
+            estimated_duration, actual_duration, category,
+            json.loads(tags) if tags and tags != '[]' else [],
+            bool(recurring), recurrence_pattern, tracked_seconds
+        )
+
+
+class OverdueCache:
+    """Overdue tasks per database file, kept until the answer can change
+
+    An entry stays valid until the next open task's due date passes or
+    the database's change feed moves on, which also catches writes from the
+    CLI, the API server or other processes. Writes through TaskManager or
+    the importer in this process also bump a generation, so a query that
+    raced with one never stores its stale result. Callers get copies of
+    the cached tasks, which they are free to modify.
+    """
+
+    def __init__(self):
+        self._entries = {}  # db_path -> (tasks, valid_until, generation, latest change seq)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_path, now, change):
+        """Return copies of the cached overdue tasks, or None if they must be queried"""
+        with self._lock:
+            entry = self._entries.get(db_path)
+            if (entry is None or entry[2] != self._generations.get(db_path, 0) or now > entry[1]
+                    or entry[3] != change):
+                return None
+            return copy.deepcopy(entry[0])
+
+    def generation(self, db_path):
+        with self._lock:
+            return self._generations.get(db_path, 0)
+
+    def put(self, db_path, tasks, valid_until, generation, change):
+        """Store a result queried at generation and change, unless a write happened since"""
+        with self._lock:
+            if generation == self._generations.get(db_path, 0):
+                self._entries[db_path] = (copy.deepcopy(tasks), valid_until, generation, change)
+
+    def invalidate(self, db_path):
+        with self._lock:
+            self._generations[db_path] = self._generations.get(db_path, 0) + 1
+            self._entries.pop(db_path, None)
+
+
+overdue_cache = OverdueCache()
+
+
+class TaskManager:
+    def __init__(self, db_path="task_manager.db"):
+        self.db = Database(db_path)
+        self.estimator = DurationEstimator(db_path)
+        self.sketches = DurationSketches(db_path)
+        self.dependencies = DependencyGraph.shared(db_path)
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Register callback(event, task_id, task) for task changes"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Unregister a task change callback"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, task_id):
+        """Tell listeners a task was created, updated or deleted, once the change is committed"""
+        db_path = self.db.db_path
+        self.db.after_commit(lambda: overdue_cache.invalidate(db_path))
+        if self._listeners:
+            self.db.after_commit(lambda: self._call_listeners(event, task_id))
+
+    def _call_listeners(self, event, task_id):
+        task = self.get_task(task_id) if event != 'deleted' else None
+        for callback in list(self._listeners):
+            callback(event, task_id, task)
+
+    def create_task(self, task):
+        """Create a new task and return its ID"""
+        task_data = task.to_dict()
+        del task_data['id']  # Remove ID for insertion
+
+        query = '''
+                INSERT INTO tasks (title, description, status, priority, created_date, due_date, \
+                                   completed_date, estimated_duration, actual_duration, category, \
+                                   tags, recurring, recurrence_pattern) \
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) \
+                '''
+
+        params = (
+            task_data['title'], task_data['description'], task_data['status'],
+            task_data['priority'], task_data['created_date'], task_data['due_date'],
+            task_data['completed_date'], task_data['estimated_duration'],
+            task_data['actual_duration'], task_data['category'], task_data['tags'],
+            task_data['recurring'], task_data['recurrence_pattern']
+        )
+
+        task_id = self.db.execute_query(query, params)
+        self._notify('created', task_id)
+        return task_id
+
+    def changes_since(self, seq=0, limit=None):
+        """Get task changes recorded after seq (see Database.changes_since)"""
+        return self.db.changes_since(seq, ('tasks',), limit)
+
+    def get_task(self, task_id):
+        """Retrieve a task by ID"""
+        query = f"SELECT {TASK_SELECT} FROM tasks WHERE id = ?"
+        results = self.db.fetch_all(query, (task_id,), Task.from_row)
+        return results[0] if results else None
+
+    def get_all_tasks(self, status=None, category=None):
+        """Retrieve all tasks with optional filtering"""
+        query, params = self._task_list_query(status, category)
+        return self.db.fetch_all(query, params, Task.from_row)
+
+    def iter_tasks(self, status=None, category=None, batch_size=1000):
+        """Stream tasks with optional filtering without loading them all at once"""
+        query, params = self._task_list_query(status, category)
+        return self.db.iter_query(query, params, Task.from_row, batch_size)
+
+    def _task_list_query(self, status=None, category=None):
+        query = f"SELECT {TASK_SELECT} FROM tasks WHERE 1=1"
+        params = []
+
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+
+        query += " ORDER BY created_date DESC"
+        return query, params
+
+    def update_task(self, task_id, **kwargs):
+        """Update task properties"""
+        allowed_fields = ['title', 'description', 'status', 'priority', 'due_date',
+                          'estimated_duration', 'actual_duration', 'category', 'tags',
+                          'recurring', 'recurrence_pattern', 'completed_date']
+
+        update_fields = []
+        params = []
+
+        for field, value in kwargs.items():
+            if field in allowed_fields:
+                if field == 'tags':
+                    value = json.dumps(value)
+                elif field in ['due_date', 'completed_date'] and value:
+                    value = value.isoformat()
+
+                update_fields.append(f"{field} = ?")
+                params.append(value)
+
+        if not update_fields:
+            return False
+
+        params.append(task_id)
+        query = f"UPDATE tasks SET {', '.join(update_fields)} WHERE id = ?"
+
+        result = self.db.execute_query(query, params)
+        self._notify('updated', task_id)
+        return result is not None
+
+    def delete_task(self, task_id):
+        """Delete a task"""
+        query = "DELETE FROM tasks WHERE id = ?"
+        self.db.execute_query(query, (task_id,))
+        self._notify('deleted', task_id)
+        return True
+
+    def mark_task_complete(self, task_id, actual_duration=0):
+        """Mark a task as completed"""
+        completed_date = datetime.now()
+        previous = self.get_task(task_id)
+        first_completion = previous is not None and previous.status != TaskStatus.COMPLETED
+
+        fields = {'status': TaskStatus.COMPLETED}
+        if first_completion:
+            fields['completed_date'] = completed_date  # Completing again keeps the original date
+        if actual_duration and actual_duration > 0:
+            fields['actual_duration'] = actual_duration  # 0 means "not entered", so keep what is stored
+        result = self.update_task(task_id, **fields)
+
+        # Everything below happens on the first completion only, so a retried
+        # or repeated completion neither counts twice nor spawns extra instances
+        if not (result and first_completion):
+            return result
+
+        spent = actual_duration if actual_duration and actual_duration > 0 else previous.spent_minutes
+        self.estimator.observe(previous.category, previous.priority, previous.estimated_duration, spent)
+        self.sketches.add_task(previous.category, spent, completed_date)
+
+        # Materialize the next instance of a recurring task
+        task = self.get_task(task_id)
+        if task and task.recurring and task.recurrence_pattern:
+            self._create_next_occurrence(task, completed_date)
+
+        return result
+
+    def predict_duration(self, task_id):
+        """Predicted duration of a task from how long similar tasks took"""
+        task = self.get_task(task_id)
+        return self.estimator.predict_task(task) if task else None
+
+    def add_dependency(self, task_id, depends_on):
+        """Make a task wait for another; raises DependencyCycle if that would form a loop"""
+        return self.dependencies.add_dependency(task_id, depends_on)
+
+    def add_subtask(self, parent_id, subtask_id):
+        """Make a task a subtask of another"""
+        return self.dependencies.add_subtask(parent_id, subtask_id)
+
+    def remove_dependency(self, task_id, depends_on):
+        """Stop a task from waiting for another"""
+        return self.dependencies.remove_dependency(task_id, depends_on)
+
+    def get_unblocked_tasks(self):
+        """Open tasks whose dependencies are all completed or cancelled"""
+        return self.dependencies.get_unblocked_tasks()
+
+    def get_critical_path(self, task_id=None):
+        """Longest chain of open dependent tasks by estimated duration"""
+        return self.dependencies.get_critical_path(task_id)
+
+    def get_pending_forecast(self):
+        """Predicted minutes of all pending and in-progress work"""
+        return self.estimator.predict_pending()
+
+    def _create_next_occurrence(self, task, after):
+        """Create the next pending instance of a recurring task"""
+        try:
+            rule = RecurrenceRule.parse(task.recurrence_pattern)
+        except ValueError:
+            return None
+
+        # Pin the series start so every instance follows the same schedule
+        anchor = task.due_date or task.created_date
+        if rule.dtstart is None:
+            rule.dtstart = anchor
+
+        next_due = rule.next_after(max(anchor, after))
+        if next_due is None:
+            return None
+
+        next_task = Task(
+            title=task.title,
+            description=task.description,
+            priority=task.priority,
+            due_date=next_due,
+            estimated_duration=task.estimated_duration,
+            category=task.category,
+            tags=task.tags,
+            recurring=True,
+            recurrence_pattern=rule.to_pattern()
+        )
+        return self.create_task(next_task)
+
+    def get_occurrences(self, start, end, limit=None):
+        """Get (task, occurrence) pairs of open recurring tasks in [start, end)"""
+        query = f'''
+                SELECT {TASK_SELECT} \
+                FROM tasks
+                WHERE recurring = 1 \
+                  AND status NOT IN (?, ?) \
+                '''
+        tasks = self.db.fetch_all(query, (TaskStatus.COMPLETED, TaskStatus.CANCELLED), Task.from_row)
+
+        occurrences = []
+        for task in tasks:
+            try:
+                rule = RecurrenceRule.parse(task.recurrence_pattern)
+            except ValueError:
+                continue
+
+            anchor = task.due_date or task.created_date
+            window = rule.occurrences(anchor, max(start, anchor), end)
+            for index, occurrence in enumerate(window):
+                if limit is not None and index >= limit:
+                    break
+                occurrences.append((task, occurrence))
+
+        occurrences.sort(key=lambda item: item[1])
+        return occurrences
+
+    def start_task(self, task_id):
+        """Mark a task as in progress"""
+        return self.update_task(task_id, status=TaskStatus.IN_PROGRESS)
+
+    def get_overdue_tasks(self):
+        """Get tasks that are overdue"""
+        now = datetime.now()
+        change = self.db.latest_change()  # Read first: a write during the queries only costs a re-query
+        cached = overdue_cache.get(self.db.db_path, now, change)
+        if cached is not None:
+            return cached
+
+        generation = overdue_cache.generation(self.db.db_path)
+        current_time = now.isoformat()
+        query = f'''
+                SELECT {TASK_SELECT} \
+                FROM tasks
+                WHERE due_date < ? \
+                  AND status NOT IN (?, ?)
+                ORDER BY due_date ASC \
+                '''
+        params = (current_time, TaskStatus.COMPLETED, TaskStatus.CANCELLED)
+        tasks = self.db.fetch_all(query, params, Task.from_row)
+
+        # The set only grows when the next open task's due date passes
+        next_due_query = '''
+                         SELECT MIN(due_date)
+                         FROM tasks
+                         WHERE due_date >= ? \
+                           AND status NOT IN (?, ?) \
+                         '''
+        next_due = self.db.fetch_all(next_due_query, params)[0][0]
+        valid_until = datetime.fromisoformat(next_due) if next_due else datetime.max
+
+        overdue_cache.put(self.db.db_path, tasks, valid_until, generation, change)
+        return tasks
+
+    def get_task_statistics(self):
+        """Get comprehensive task statistics"""
+        # Total tasks by status
+        status_query = "SELECT status, COUNT(*) as count FROM tasks GROUP BY status"
+        status_results = self.db.execute_query(status_query)
+        status_counts = {result['status']: result['count'] for result in status_results}
+
+        # Tasks by priority
+        priority_query = "SELECT priority, COUNT(*) as count FROM tasks GROUP BY priority"
+        priority_results = self.db.execute_query(priority_query)
+        priority_counts = {result['priority']: result['count'] for result in priority_results}
+
+        # Completion statistics
+        total_tasks = sum(status_counts.values())
+        completed_tasks = status_counts.get(TaskStatus.COMPLETED, 0)
+        completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+        # Average time spent, falling back to tracked time where none was entered
+        time_query = f'''
+                     SELECT AVG({SPENT_MINUTES}) as avg_time
+                     FROM tasks
+                     WHERE status = ? \
+                       AND (actual_duration > 0 OR tracked_seconds > 0) \
+                     '''
+        time_result = self.db.execute_query(time_query, (TaskStatus.COMPLETED,))
+        avg_time_spent = time_result[0]['avg_time'] if time_result and time_result[0]['avg_time'] else 0
+
+        return {
+            'total_tasks': total_tasks,
+            'status_distribution': status_counts,
+            'priority_distribution': priority_counts,
+            'completion_rate': round(completion_rate, 2),
+            'average_time_spent': round(avg_time_spent, 2),
+            'overdue_tasks': len(self.get_overdue_tasks())
+        }
+
+    def get_completion_percentiles(self, days=30, category=None):
+        """Count, mean and p50/p90/p99 of minutes spent on tasks completed in the last `days` days"""
+        return self.sketches.percentiles(TASK_KIND, days, category)
+
+    def get_completion_percentiles_by_category(self, days=30):
+        """Completion time percentiles per category"""
+        return self.sketches.percentiles_by_key(TASK_KIND, days)
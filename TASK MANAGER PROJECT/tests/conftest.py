@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+# The modules import each other as top-level modules, as when run from the project directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh database file per test"""
+    return str(tmp_path / "task_manager.db")
@@ -0,0 +1,99 @@
+import socket
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from api_server import MAX_BODY_SIZE, ApiError, TaskManagerApi, create_server
+from database import Database
+
+
+@pytest.fixture
+def api(db_path):
+    return TaskManagerApi(db_path)
+
+
+def _create(api, **fields):
+    status, task, _ = api.dispatch('POST', '/tasks', {}, dict({'title': "write report"}, **fields))
+    assert status == 201
+    return task
+
+
+def test_offset_dates_are_stored_as_local_time(api):
+    task = _create(api, due_date="2026-10-01T12:00:00Z")
+    local = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    assert task['due_date'] == local.isoformat()
+
+    status, task, _ = api.dispatch('PATCH', f"/tasks/{task['id']}", {}, {'due_date': "2026-10-01T14:00:00+02:00"})
+    assert status == 200
+    assert task['due_date'] == local.isoformat()
+
+    status, overdue, _ = api.dispatch('GET', '/tasks/overdue', {}, None)  # Compared with naive now()
+    assert status == 200 and [t['id'] for t in overdue] == [task['id']]
+
+
+@pytest.mark.parametrize("fields", [
+    {'due_date': "tomorrow"},
+    {'estimated_duration': "a while"},
+    {'estimated_duration': "inf"},
+    {'title': ""},
+    {'status': "someday"},
+    {'priority': "critical"},
+    {'unknown': 1},
+])
+def test_invalid_updates_are_rejected(api, fields):
+    task = _create(api, estimated_duration=30)
+
+    with pytest.raises(ApiError) as error:
+        api.dispatch('PATCH', f"/tasks/{task['id']}", {}, fields)
+    assert error.value.status == 400
+    assert api.dispatch('GET', f"/tasks/{task['id']}", {}, None)[1] == task
+
+
+def test_update_changes_only_the_given_fields(api):
+    task = _create(api, category="work", tags=["a"], estimated_duration=30)
+
+    status, updated, _ = api.dispatch('PATCH', f"/tasks/{task['id']}", {},
+                                      {'status': "In Progress", 'estimated_duration': "45", 'tags': "b, c"})
+    assert status == 200
+    assert (updated['status'], updated['estimated_duration'], updated['tags']) == ("in_progress", 45, ["b", "c"])
+    assert (updated['title'], updated['category'], updated['due_date']) == (task['title'], "work", None)
+
+
+@pytest.fixture
+def server(db_path):
+    server = create_server(db_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    Database.disable_pool(db_path)
+
+
+def _exchange(server, request):
+    """Send raw bytes on one connection and read until the server closes it"""
+    with socket.create_connection(server.server_address, timeout=5) as conn:
+        conn.sendall(request)
+        received = b''
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return received.decode('utf-8')
+            received += chunk
+
+
+def test_invalid_content_length_is_a_bad_request(server):
+    response = _exchange(server, b"POST /tasks HTTP/1.1\r\nHost: x\r\nContent-Length: ten\r\n\r\n")
+    assert response.startswith("HTTP/1.1 400")
+    assert "Invalid Content-Length" in response
+
+
+def test_unread_body_is_not_parsed_as_the_next_request(server):
+    # The oversized body hides a second request; the server must answer once and close
+    hidden = b"DELETE /tasks/1 HTTP/1.1\r\nHost: x\r\n\r\n"
+    request = (b"POST /tasks HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY_SIZE + 1)) + hidden
+    response = _exchange(server, request)
+
+    assert response.startswith("HTTP/1.1 413")
+    assert response.count("HTTP/1.1") == 1
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+from analytics import Analytics
+from async_api import AsyncAnalytics, AsyncTaskManager, DatabaseExecutor
+from task_manager import Task
+
+
+def test_gathered_calls_all_land(db_path):
+    async def main():
+        async with AsyncTaskManager(db_path) as tasks:
+            ids = await asyncio.gather(*(tasks.create_task(Task(title=f"task {i}")) for i in range(20)))
+            await asyncio.gather(*(tasks.mark_task_complete(task_id) for task_id in ids[:5]))
+            return ids, await tasks.get_all_tasks()
+
+    ids, stored = asyncio.run(main())
+    assert sorted(ids) == sorted(task.id for task in stored)
+    assert len(set(ids)) == 20
+
+
+def test_parallel_insights_match_the_blocking_ones(db_path):
+    async def main():
+        async with AsyncTaskManager(db_path) as tasks:
+            for i in range(4):
+                task_id = await tasks.create_task(Task(title=f"task {i}"))
+                if i % 2:
+                    await tasks.mark_task_complete(task_id)
+        analytics = AsyncAnalytics(db_path)
+        try:
+            return await analytics.get_productivity_insights()
+        finally:
+            analytics.close()
+
+    assert asyncio.run(main()) == Analytics(db_path).get_productivity_insights()
+
+
+def test_no_more_than_max_pending_calls_run_at_once():
+    executor = DatabaseExecutor(max_workers=8, max_pending=2)
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(executor.run(work) for _ in range(8)))
+
+    asyncio.run(main())
+    executor.shutdown()
+    assert peak[0] == 2
+
+
+def test_cancelled_calls_that_have_not_started_are_dropped():
+    executor = DatabaseExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    calls = []
+
+    def blocking():
+        release.wait(5)
+        calls.append("running call")
+
+    async def main():
+        running = asyncio.create_task(executor.run(blocking))
+        waiting = asyncio.create_task(executor.run(calls.append, "queued call"))
+        await asyncio.sleep(0.05)
+
+        waiting.cancel()
+        running.cancel()  # Already on a thread: it finishes, its result is dropped
+        release.set()
+        for task in (running, waiting):
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        assert running.cancelled() and waiting.cancelled()
+
+        # The slot is free again
+        return await executor.run(lambda: "after")
+
+    assert asyncio.run(main()) == "after"
+    executor.shutdown()
+    assert calls == ["running call"]
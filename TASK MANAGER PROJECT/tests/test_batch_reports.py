@@ -0,0 +1,94 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from database import Database
+from task_manager import Task, TaskManager
+from timer_service import TimerService
+
+
+def _user_database(db_path):
+    """A user database with a completed task and a running timer"""
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="report", category="work"))
+    task_manager.mark_task_complete(task_id, 20)
+
+    session_id = task_manager.db.execute_query("INSERT INTO time_sessions (start_time) VALUES (?)",
+                                               (datetime.now().isoformat(),))
+    timers = TimerService(db_path)
+    timers.start(3600, owner="default", session_id=session_id)
+    timers.shutdown()
+
+
+def _snapshot(db_path):
+    with open(db_path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def read_only(db_path):
+    yield lambda: Database.enable_read_only(db_path)
+    Database.disable_read_only(db_path)
+
+
+def test_read_only_databases_are_left_untouched(db_path, read_only):
+    _user_database(db_path)
+    before = _snapshot(db_path)
+    read_only()
+
+    from analytics import Analytics
+    analytics = Analytics(db_path)
+    insights = analytics.get_productivity_insights(7)
+    assert insights['task_completion_rate'] == 100.0
+    assert analytics.get_duration_percentiles()['tasks']['count'] == 1
+
+    with pytest.raises(sqlite3.OperationalError):
+        analytics.task_manager.create_task(Task(title="not allowed"))
+    assert _snapshot(db_path) == before
+
+
+def test_missing_derived_data_is_not_seeded_read_only(db_path, read_only):
+    from analytics import Analytics
+    from time_tracker import TimeTracker
+
+    _user_database(db_path)
+    db = Database(db_path)
+    db.execute_query("UPDATE time_sessions SET end_time = start_time, duration = 600")
+    for table in ('time_rollups', 'duration_stats', 'duration_sketches'):
+        db.execute_query(f"DELETE FROM {table}")
+    before = _snapshot(db_path)
+
+    read_only()
+    assert Analytics(db_path).get_productivity_insights(7)['task_completion_rate'] == 100.0
+    assert _snapshot(db_path) == before
+
+    Database.disable_read_only(db_path)
+    assert not Database(db_path).read_only
+    TimeTracker(db_path)  # Writable again, so the rollups are seeded
+    assert db.fetch_all("SELECT SUM(total_seconds) FROM time_rollups") == [(600,)]
+
+
+def test_report_on_an_old_database_fails_cleanly(tmp_path):
+    from batch_reports import render_report
+
+    old_path = str(tmp_path / "old.db")
+    sqlite3.connect(old_path).close()  # No tables: never opened by this version
+
+    with pytest.raises(RuntimeError, match="needs upgrading"):
+        render_report(old_path, str(tmp_path / "report"))
+    assert not Database(old_path).read_only
+    assert not os.path.exists(tmp_path / "report")
+
+
+def test_reports_do_not_write_to_user_databases(db_path, tmp_path):
+    pytest.importorskip("matplotlib")
+    from batch_reports import render_report
+
+    _user_database(db_path)
+    before = _snapshot(db_path)
+    summary = render_report(db_path, str(tmp_path / "report"))
+
+    assert os.path.exists(os.path.join(summary['report_dir'], 'insights.json'))
+    assert _snapshot(db_path) == before
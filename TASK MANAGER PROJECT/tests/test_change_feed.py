@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from database import CHANGE_RETENTION, Database
+from task_manager import Task, TaskManager
+
+
+def _age_changes(db, up_to_seq, age):
+    db.execute_query("UPDATE changes SET changed_at = ? WHERE seq <= ?",
+                     ((datetime.now() - age).isoformat(), up_to_seq))
+
+
+def test_changes_are_recorded_in_order(db_path):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="a"))
+    task_manager.update_task(task_id, title="b")
+    task_manager.delete_task(task_id)
+
+    changes = task_manager.changes_since(0)
+    assert [(c['row_id'], c['operation']) for c in changes] == [
+        (task_id, 'insert'), (task_id, 'update'), (task_id, 'delete')
+    ]
+    assert task_manager.changes_since(changes[1]['seq']) == changes[2:]
+
+
+def test_expired_changes_are_pruned_when_a_database_is_opened(db_path):
+    task_manager = TaskManager(db_path)
+    for title in "abcd":
+        task_manager.create_task(Task(title=title))
+    db = task_manager.db
+    _age_changes(db, 2, CHANGE_RETENTION + timedelta(days=1))
+
+    Database._pruned_at.pop(db_path, None)
+    Database(db_path)
+
+    assert [change['seq'] for change in db.changes_since(0)] == [3, 4]
+    assert db.oldest_change() == 3
+    assert db.latest_change() == 4
+
+
+def test_pruning_keeps_the_cursor_position_when_everything_expired(db_path):
+    task_manager = TaskManager(db_path)
+    task_manager.create_task(Task(title="a"))
+    db = task_manager.db
+    _age_changes(db, 1, CHANGE_RETENTION * 2)
+
+    Database._pruned_at.pop(db_path, None)
+    Database(db_path)
+
+    assert db.changes_since(0) == []
+    assert db.oldest_change() == 2  # A cursor at 0 missed change 1
+    task_manager.create_task(Task(title="b"))
+    assert [change['seq'] for change in db.changes_since(1)] == [2]
+
+
+def test_pruning_is_throttled_per_process(db_path):
+    task_manager = TaskManager(db_path)
+    task_manager.create_task(Task(title="a"))
+    _age_changes(task_manager.db, 1, CHANGE_RETENTION * 2)
+
+    Database(db_path)  # Pruned moments ago by TaskManager's Database
+    assert len(task_manager.changes_since(0)) == 1
@@ -0,0 +1,46 @@
+import io
+import json
+import sys
+
+import pytest
+
+from cli import main
+from task_manager import TaskManager
+
+
+def _run(db_path, *argv, stdin=None, monkeypatch=None):
+    if stdin is not None:
+        monkeypatch.setattr(sys, 'stdin', io.StringIO(stdin))
+    main(['--db', db_path, '--json', *argv])
+
+
+def test_add_from_stdin_in_one_transaction(db_path, monkeypatch, capsys):
+    _run(db_path, 'add', '-', '--category', 'inbox', monkeypatch=monkeypatch,
+         stdin='buy milk\n{"title": "file taxes", "priority": "high"}\n# comment\n\n')
+
+    assert len(json.loads(capsys.readouterr().out)['ids']) == 2
+    tasks = {task.title: task for task in TaskManager(db_path).get_all_tasks()}
+    assert tasks['buy milk'].category == "inbox"
+    assert tasks['file taxes'].priority == "high"
+
+
+@pytest.mark.parametrize("line, message", [
+    ('{bad json', "Line 2: invalid task: not valid JSON"),
+    ('{"priority": "high"}', "Line 2: invalid task: title is required"),
+])
+def test_a_bad_stdin_line_adds_nothing(db_path, monkeypatch, capsys, line, message):
+    with pytest.raises(SystemExit) as exit_info:
+        _run(db_path, 'add', '-', monkeypatch=monkeypatch, stdin=f"fine\n{line}\n")
+
+    assert exit_info.value.code == 1
+    assert message in capsys.readouterr().err
+    assert TaskManager(db_path).get_all_tasks() == []
+
+
+@pytest.mark.parametrize("minutes", ['0', '-3', 'ten'])
+def test_track_start_rejects_non_positive_minutes(db_path, capsys, minutes):
+    with pytest.raises(SystemExit) as exit_info:
+        _run(db_path, 'track', 'start', '--minutes', minutes)
+
+    assert exit_info.value.code == 2
+    assert "--minutes" in capsys.readouterr().err
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from dependency_graph import DependencyCycle, DependencyGraph
+from task_manager import Task, TaskManager, TaskStatus
+
+
+def _tasks(manager, count, minutes=10):
+    return [manager.create_task(Task(title=f"Task {i}", estimated_duration=minutes)) for i in range(count)]
+
+
+def _assert_ordered(graph):
+    order = graph._order
+    for source, targets in graph._successors.items():
+        for target in targets:
+            assert order[source] < order[target]
+
+
+def test_random_inserts_keep_a_topological_order(db_path):
+    manager = TaskManager(db_path)
+    ids = _tasks(manager, 40)
+    graph = DependencyGraph(db_path)
+    rng = random.Random(7)
+
+    for _ in range(300):
+        task_id, depends_on = rng.sample(ids, 2)
+        try:
+            graph.add_dependency(task_id, depends_on)
+        except DependencyCycle as error:
+            assert error.cycle[0] == error.cycle[-1] == depends_on
+        _assert_ordered(graph)
+
+    # A fresh load of the stored edges agrees with the incremental graph
+    fresh = DependencyGraph(db_path)
+    fresh._refresh()
+    assert fresh._successors == graph._successors
+    _assert_ordered(fresh)
+
+
+def test_cycle_reports_the_blocking_chain(db_path):
+    manager = TaskManager(db_path)
+    a, b, c = _tasks(manager, 3)
+    graph = DependencyGraph(db_path)
+    graph.add_dependency(b, a)
+    graph.add_dependency(c, b)
+
+    with pytest.raises(DependencyCycle) as raised:
+        graph.add_dependency(a, c)
+    assert raised.value.cycle == [c, a, b, c]
+    assert graph.get_dependencies(a) == []
+
+
+def test_subtask_has_one_parent(db_path):
+    manager = TaskManager(db_path)
+    parent, other, subtask = _tasks(manager, 3)
+    graph = DependencyGraph(db_path)
+    assert graph.add_subtask(parent, subtask)
+    assert not graph.add_subtask(parent, subtask)
+
+    with pytest.raises(ValueError):
+        graph.add_subtask(other, subtask)
+
+
+def test_critical_path_follows_the_longest_open_chain(db_path):
+    manager = TaskManager(db_path)
+    a, b, c, d = _tasks(manager, 4)
+    long_task = manager.create_task(Task(title="Long", estimated_duration=100))
+    graph = DependencyGraph(db_path)
+    graph.add_dependency(b, a)
+    graph.add_dependency(c, b)
+    graph.add_dependency(c, long_task)
+    graph.add_dependency(d, a)
+
+    assert graph.get_critical_path() == {'tasks': [long_task, c], 'minutes': 110}
+    assert graph.get_critical_path(b) == {'tasks': [a, b], 'minutes': 20}
+
+    manager.mark_task_complete(long_task)
+    assert graph.get_critical_path() == {'tasks': [a, b, c], 'minutes': 30}
+
+
+def test_unblocked_tasks_match_a_brute_force_check(db_path):
+    manager = TaskManager(db_path)
+    ids = _tasks(manager, 15)
+    graph = DependencyGraph(db_path)
+    rng = random.Random(11)
+    for _ in range(25):
+        task_id, depends_on = rng.sample(ids, 2)
+        try:
+            graph.add_dependency(task_id, depends_on)
+        except DependencyCycle:
+            pass
+    for task_id in rng.sample(ids, 5):
+        manager.mark_task_complete(task_id)
+
+    status = {task.id: task.status for task in manager.get_all_tasks()}
+    open_statuses = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+    expected = {task_id for task_id in ids
+                if status[task_id] in open_statuses
+                and all(status[blocker] not in open_statuses for blocker, _ in graph.get_dependencies(task_id))}
+    assert {task.id for task in graph.get_unblocked_tasks()} == expected
+
+
+def test_cycle_is_found_across_graph_instances(db_path):
+    # Two processes each hold their own graph of the same database
+    manager = TaskManager(db_path)
+    x, y = _tasks(manager, 2)
+    first, second = DependencyGraph(db_path), DependencyGraph(db_path)
+    second.get_critical_path()  # Loaded before the other process adds its edge
+
+    first.add_dependency(y, x)
+    with pytest.raises(DependencyCycle):
+        second.add_dependency(x, y)
+    assert len(manager.db.fetch_all("SELECT 1 FROM task_dependencies")) == 1
+
+    second.remove_dependency(y, x)
+    first.add_dependency(x, y)  # Allowed again now that the first edge is gone
+    assert first.get_dependencies(x) == [(y, 'blocks')]
+
+
+def test_deleted_task_leaves_the_graph(db_path):
+    manager = TaskManager(db_path)
+    a, b, c = _tasks(manager, 3)
+    graph = DependencyGraph(db_path)
+    graph.add_dependency(b, a)
+    graph.add_dependency(c, b)
+
+    manager.delete_task(b)
+    assert graph.get_critical_path(c) == {'tasks': [c], 'minutes': 10}
+    assert b not in graph._order
@@ -0,0 +1,56 @@
+import math
+from datetime import date
+
+from downsample import bucket_starts, choose_bucket, downsample_series, lttb, next_bucket
+
+
+def test_lttb_keeps_the_ends_and_the_threshold():
+    points = [(x, math.sin(x / 10)) for x in range(1000)]
+    sampled = lttb(points, 50)
+
+    assert len(sampled) == 50
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert [x for x, _ in sampled] == sorted(x for x, _ in sampled)
+
+
+def test_lttb_keeps_spikes_that_averaging_would_flatten():
+    points = [(x, 1.0) for x in range(1000)]
+    points[377] = (377, 500.0)
+    points[712] = (712, -300.0)
+
+    sampled = lttb(points, 20)
+    assert (377, 500.0) in sampled
+    assert (712, -300.0) in sampled
+
+
+def test_lttb_returns_short_series_unchanged():
+    points = [(0, 1), (1, 5), (2, 3)]
+    assert lttb(points, 10) == points
+    assert lttb(points, 2) == points
+
+
+def test_downsample_series_keeps_the_original_days():
+    first = date(2026, 1, 1).toordinal()
+    series = [(date.fromordinal(first + i).isoformat(), i % 7) for i in range(400)]
+
+    sampled = downsample_series(series, 100)
+    assert len(sampled) == 100
+    assert set(sampled) <= set(series)
+    assert downsample_series(series[:50], 100) == series[:50]
+
+
+def test_choose_bucket_fits_the_budget():
+    start = date(2026, 1, 1)
+    assert choose_bucket(start, date(2026, 3, 1), 100) == 'day'
+    assert choose_bucket(start, date(2027, 1, 1), 100) == 'week'
+    assert choose_bucket(date(2016, 1, 1), date(2026, 1, 1), 200) == 'month'
+    assert choose_bucket(date(1900, 1, 1), date(2026, 1, 1), 100) == 'year'
+
+
+def test_bucket_starts_cover_the_range():
+    assert bucket_starts(date(2026, 10, 14), date(2026, 10, 20), 'week') == [date(2026, 10, 12),
+                                                                         date(2026, 10, 19)]
+    assert bucket_starts(date(2026, 11, 15), date(2027, 1, 2), 'month') == [
+        date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)
+    ]
+    assert next_bucket(date(2026, 12, 1), 'month') == date(2027, 1, 1)
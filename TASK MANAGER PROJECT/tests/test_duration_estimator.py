@@ -0,0 +1,81 @@
+import random
+import statistics
+import threading
+
+import pytest
+
+from duration_estimator import DurationEstimator, RunningStats
+from task_manager import Priority, Task, TaskManager
+
+
+def test_running_stats_match_the_statistics_module():
+    values = [3, 17.5, 240, 60, 45.25, 90, 12]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.stddev == pytest.approx(statistics.stdev(values))
+
+
+def test_merged_stats_equal_stats_of_all_values():
+    rng = random.Random(7)
+    left_values = [rng.gauss(60, 20) for _ in range(500)]
+    right_values = [rng.gauss(300, 5) for _ in range(40)]
+    left, right, combined = RunningStats(), RunningStats(), RunningStats()
+    for value in left_values:
+        left.add(value)
+        combined.add(value)
+    for value in right_values:
+        right.add(value)
+        combined.add(value)
+
+    left.merge(right)
+    left.merge(RunningStats())
+    assert left.count == combined.count
+    assert left.mean == pytest.approx(combined.mean)
+    assert left.stddev == pytest.approx(combined.stddev)
+
+
+def test_predictions_fall_back_to_broader_groups(db_path):
+    estimator = DurationEstimator(db_path, min_samples=3)
+    for actual in (50, 60, 70):
+        estimator.observe("work", Priority.HIGH, 30, actual)
+    estimator.observe("home", Priority.LOW, 0, 10)
+
+    specific = estimator.predict("work", Priority.HIGH, estimated=40)
+    assert specific['minutes'] == pytest.approx(40 * 2, rel=0.01)
+    assert specific['samples'] == 3
+
+    fallback = estimator.predict("home", Priority.LOW)  # One sample: use everything
+    assert fallback['samples'] == 4
+    assert fallback['minutes'] == pytest.approx(47.5)
+
+
+def test_concurrent_observations_are_not_lost(db_path):
+    estimator = DurationEstimator(db_path)
+    per_thread = 40
+
+    def complete_tasks():
+        for _ in range(per_thread):
+            estimator.observe("work", Priority.MEDIUM, 10, 20)
+
+    threads = [threading.Thread(target=complete_tasks) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert estimator.get_statistics()[0]['completed'] == 4 * per_thread
+
+
+def test_open_tasks_with_durations_do_not_trigger_a_rebuild_each_time(db_path, monkeypatch):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="half done"))
+    task_manager.update_task(task_id, actual_duration=30)
+
+    rebuilds = []
+    monkeypatch.setattr(DurationEstimator, 'rebuild', lambda self: rebuilds.append(self))
+    DurationEstimator(db_path)
+    assert rebuilds == []
@@ -0,0 +1,75 @@
+import csv
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from export import EXPORT_TABLES, Exporter
+from importer import Importer
+from task_manager import Priority, Task, TaskManager
+
+
+def _tasks(task_manager):
+    task_manager.create_task(Task(title="report, draft 2", description='has "quotes"\nand a newline',
+                                  priority=Priority.HIGH, due_date=datetime(2026, 11, 1, 17, 0),
+                                  tags=["work", "writing"], estimated_duration=90))
+    done = task_manager.create_task(Task(title="plants", category="home", recurring=True,
+                                         recurrence_pattern="weekly"))
+    task_manager.mark_task_complete(done, 15)
+
+
+def _comparable(task_manager):
+    return sorted((task.title, task.description, task.status, task.priority, task.due_date, task.completed_date,
+                   task.estimated_duration, task.actual_duration, task.category, task.tags, bool(task.recurring),
+                   task.recurrence_pattern) for task in task_manager.get_all_tasks())
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_tasks_round_trip_through_the_importer(db_path, tmp_path, fmt):
+    source = TaskManager(db_path)
+    _tasks(source)
+    path = str(tmp_path / f"tasks.{fmt}")
+    progress = []
+
+    count = Exporter(db_path, chunk_size=2).export_table('tasks', path, fmt, progress.append)
+    assert count == len(source.get_all_tasks()) == 3  # The completed recurring task has a next occurrence
+    assert progress == [2, 3]
+
+    copy_path = str(tmp_path / "copy.db")
+    summary = Importer(copy_path).import_file('tasks', path)
+    assert (summary['imported'], summary['skipped']) == (3, 0)
+    assert _comparable(TaskManager(copy_path)) == _comparable(source)
+
+
+def test_csv_and_jsonl_hold_the_same_rows(db_path, tmp_path):
+    _tasks(TaskManager(db_path))
+    counts = Exporter(db_path).export_all(str(tmp_path / "csv"), 'csv')
+    Exporter(db_path).export_all(str(tmp_path / "jsonl"), 'jsonl')
+    assert set(counts) == set(EXPORT_TABLES)
+
+    with open(tmp_path / "csv" / "tasks.csv", newline='', encoding='utf-8') as f:
+        from_csv = list(csv.DictReader(f))
+    with open(tmp_path / "jsonl" / "tasks.jsonl", encoding='utf-8') as f:
+        from_jsonl = [json.loads(line) for line in f]
+    assert len(from_csv) == len(from_jsonl) == counts['tasks']
+    for csv_row, json_row in zip(from_csv, from_jsonl):
+        assert csv_row == {key: "" if value is None else str(value) for key, value in json_row.items()}
+
+
+def test_parquet_without_pyarrow_fails_clearly(db_path, tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)  # Makes `import pyarrow` raise ImportError
+    monkeypatch.setitem(sys.modules, 'pyarrow.parquet', None)
+    path = tmp_path / "tasks.parquet"
+
+    with pytest.raises(RuntimeError, match="needs pyarrow"):
+        Exporter(db_path).export_table('tasks', str(path), 'parquet')
+    assert not path.exists()
+
+
+def test_unknown_tables_and_formats_are_rejected(db_path, tmp_path):
+    exporter = Exporter(db_path)
+    with pytest.raises(ValueError):
+        exporter.export_table('sqlite_master', str(tmp_path / "x.csv"))
+    with pytest.raises(ValueError):
+        exporter.export_table('tasks', str(tmp_path / "x.xml"), 'xml')
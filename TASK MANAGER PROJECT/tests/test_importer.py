@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from importer import Importer, InvalidRecord, parse_date, session_row, task_from_record
+from reminders import ReminderEngine
+from task_manager import Task, TaskManager
+
+
+def test_parse_date_converts_offsets_to_naive_local_time():
+    utc = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+    expected = utc.astimezone().replace(tzinfo=None)
+
+    assert parse_date("2026-10-01T12:00:00Z") == expected
+    assert parse_date("2026-10-01T14:00:00+02:00") == expected
+    assert parse_date("2026-10-01T12:00:00").tzinfo is None
+
+
+def test_aware_due_dates_compare_with_naive_ones():
+    task = task_from_record({'title': "call", 'due_date': "2026-10-01T09:00:00-05:00"})
+
+    assert task.due_date.tzinfo is None
+    assert task.due_date < datetime(2100, 1, 1)
+
+
+@pytest.mark.parametrize("record", [
+    {'title': "x", 'estimated_duration': "inf"},
+    {'title': "x", 'estimated_duration': "-inf"},
+    {'title': "x", 'estimated_duration': "nan"},
+    {'title': "x", 'estimated_duration': "soon"},
+    {'title': "x", 'due_date': "next tuesday"},
+    {'title': "x", 'status': "someday"},
+    {'title': " "},
+])
+def test_invalid_task_records(record):
+    with pytest.raises(InvalidRecord):
+        task_from_record(record)
+
+
+def test_session_row_duration_from_mixed_offsets():
+    row = session_row({'start_time': "2026-10-01T10:00:00Z", 'end_time': "2026-10-01T12:30:00+02:00"})
+
+    assert row[3] == 30 * 60
+    assert "+" not in row[1] and "+" not in row[2]
+
+
+def test_imported_offsets_load_into_the_reminder_engine(db_path, tmp_path):
+    due = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    source = tmp_path / "tasks.jsonl"
+    source.write_text("\n".join(json.dumps(record) for record in [
+        {'title': "aware", 'due_date': due},
+        {'title': "overdue", 'due_date': "2020-01-01T00:00:00+09:00"},
+        {'title': "bad", 'estimated_duration': "inf"},
+    ]))
+
+    summary = Importer(db_path).import_file('tasks', str(source))
+    assert (summary['imported'], summary['skipped']) == (2, 1)
+
+    task_manager = TaskManager(db_path)
+    engine = ReminderEngine(task_manager)  # Raised TypeError on aware dates
+    assert engine.pending_count() == 1
+    assert [task.title for task in task_manager.get_overdue_tasks()] == ["overdue"]
+
+
+def test_sessions_with_only_a_duration_reach_the_rollups(db_path, tmp_path):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="write report"))
+    source = tmp_path / "sessions.jsonl"
+    source.write_text("\n".join(json.dumps(record) for record in [
+        {'task_id': task_id, 'start_time': "2026-10-01T09:00:00", 'duration': 1500},
+        {'task_id': task_id, 'start_time': "2026-10-01T23:50:00", 'end_time': "2026-10-02T00:10:00"},
+        {'task_id': task_id, 'start_time': "2026-10-03T09:00:00"},  # Still open
+    ]))
+
+    summary = Importer(db_path).import_file('time_sessions', str(source))
+    assert summary['imported'] == 3
+
+    rolled_up = task_manager.db.fetch_all("SELECT SUM(total_seconds) FROM time_rollups WHERE task_id = ?",
+                                          (task_id,))[0][0]
+    assert rolled_up == task_manager.get_task(task_id).tracked_seconds == 1500 + 1200
+    end_time = task_manager.db.fetch_all("SELECT end_time FROM time_sessions WHERE duration = 1500")[0][0]
+    assert end_time == "2026-10-01T09:25:00"
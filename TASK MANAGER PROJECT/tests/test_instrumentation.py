@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import Database
+from instrumentation import disable_instrumentation, enable_instrumentation, normalize_sql
+from task_manager import Task, TaskManager
+from time_tracker import close_session
+
+
+@pytest.fixture
+def instrumentation():
+    yield enable_instrumentation(slow_threshold_ms=10000)
+    disable_instrumentation()
+
+
+def _statement(instrumentation, prefix):
+    matches = [stats for stats in instrumentation.snapshot() if stats['sql'].startswith(prefix)]
+    assert matches, f"no statement starting with {prefix!r}"
+    return matches[0]
+
+
+def test_normalize_sql_groups_statements_by_shape():
+    assert normalize_sql("SELECT * FROM tasks WHERE id IN (1, 2,3) AND title = 'it''s'") == \
+        "SELECT * FROM tasks WHERE id IN (?, ...) AND title = ?"
+    assert normalize_sql("SELECT  *\n FROM tasks WHERE id = ?") == "SELECT * FROM tasks WHERE id = ?"
+
+
+def test_helper_queries_are_counted_with_their_rows(db_path, instrumentation):
+    db = Database(db_path)
+    for title in ("a", "b", "c"):
+        db.execute_query("INSERT INTO tasks (title, created_date) VALUES (?, ?)", (title, datetime.now().isoformat()))
+    db.fetch_all("SELECT title FROM tasks")
+    db.fetch_all("SELECT title FROM tasks")
+
+    insert = _statement(instrumentation, "INSERT INTO tasks (title, created_date)")
+    select = _statement(instrumentation, "SELECT title FROM tasks")
+    assert (insert['calls'], insert['rows']) == (3, 3)
+    assert (select['calls'], select['rows']) == (2, 6)
+    assert select['p50_ms'] <= select['max_ms']
+
+
+def test_writes_on_get_connection_are_recorded(db_path, instrumentation):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="report"))
+    db = task_manager.db
+    start_time = datetime(2026, 10, 1, 9, 0)
+    session_id = db.execute_query("INSERT INTO time_sessions (task_id, start_time) VALUES (?, ?)",
+                                  (task_id, start_time.isoformat()))
+
+    close_session(db, session_id, task_id, start_time, start_time + timedelta(minutes=25), 1500, 'pomodoro_work')
+    task_manager.mark_task_complete(task_id)
+
+    closed = _statement(instrumentation, "UPDATE time_sessions SET end_time = ?")
+    assert (closed['calls'], closed['rows']) == (1, 1)
+    _statement(instrumentation, "INSERT INTO time_rollups")
+    _statement(instrumentation, "UPDATE tasks SET status = ?")
+
+
+def test_slow_queries_are_logged_with_their_caller(db_path):
+    instrumentation = enable_instrumentation(slow_threshold_ms=0)
+    try:
+        TaskManager(db_path).get_all_tasks()
+    finally:
+        disable_instrumentation()
+
+    callers = {entry['caller'] for entry in instrumentation.slow_queries}
+    assert "TaskManager.get_all_tasks" in callers
+    instrumentation.reset()
+    assert instrumentation.snapshot() == [] and not instrumentation.slow_queries
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from database import Database
+from task_manager import Task, TaskManager
+
+NAME = "memory-test.db"
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    yield str(tmp_path / "snapshot.db")
+    Database.close_memory(NAME, snapshot=False)
+
+
+def _titles(db_path):
+    return sorted(task.title for task in TaskManager(db_path).get_all_tasks())
+
+
+def test_data_lives_in_memory_until_a_snapshot(snapshot_path):
+    memory = Database.open_memory(NAME, snapshot_path=snapshot_path, snapshot_interval=None)
+    TaskManager(NAME).create_task(Task(title="Write report"))
+
+    assert not os.path.exists(NAME) and not os.path.exists(snapshot_path)
+    assert memory.snapshot()
+    assert not memory.snapshot()  # Nothing changed since
+    assert _titles(snapshot_path) == ["Write report"]
+
+    TaskManager(NAME).create_task(Task(title="Send report"))
+    assert _titles(snapshot_path) == ["Write report"]
+    assert memory.snapshot()
+    assert _titles(snapshot_path) == ["Send report", "Write report"]
+
+
+def test_close_persists_and_the_next_start_reloads(snapshot_path):
+    Database.open_memory(NAME, snapshot_path=snapshot_path, snapshot_interval=None)
+    TaskManager(NAME).create_task(Task(title="Kept"))
+    Database.close_memory(NAME)
+
+    Database.open_memory(NAME, snapshot_path=snapshot_path, snapshot_interval=None)
+    assert _titles(NAME) == ["Kept"]
+    TaskManager(NAME).create_task(Task(title="Dropped"))
+    Database.close_memory(NAME, snapshot=False)
+
+    Database.open_memory(NAME, snapshot_path=snapshot_path, snapshot_interval=None)
+    assert _titles(NAME) == ["Kept"]
+
+
+def test_failed_write_is_rolled_back_on_the_shared_connection(snapshot_path):
+    Database.open_memory(NAME, snapshot_path=snapshot_path, snapshot_interval=None)
+    db = Database(NAME)
+    TaskManager(NAME).create_task(Task(title="First"))
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            TaskManager(NAME).create_task(Task(title="Half done"))
+            raise RuntimeError("interrupted")
+    assert _titles(NAME) == ["First"]
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from task_manager import Task, TaskManager, TaskStatus
+
+
+def _titles(tasks):
+    return [task.title for task in tasks]
+
+
+def test_write_from_another_process_is_seen(db_path):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="late", due_date=datetime.now() - timedelta(days=1)))
+    assert _titles(task_manager.get_overdue_tasks()) == ["late"]
+
+    # Another process (CLI, API server) writes without touching this process's cache
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE tasks SET status = ? WHERE id = ?", (TaskStatus.COMPLETED, task_id))
+    conn.close()
+
+    assert task_manager.get_overdue_tasks() == []
+
+
+def test_cached_tasks_are_copies(db_path):
+    task_manager = TaskManager(db_path)
+    task_manager.create_task(Task(title="late", due_date=datetime.now() - timedelta(days=1)))
+
+    task_manager.get_overdue_tasks()[0].title = "changed by a caller"
+    assert _titles(task_manager.get_overdue_tasks()) == ["late"]
+
+
+def test_entry_expires_at_the_next_due_date(db_path):
+    task_manager = TaskManager(db_path)
+    task_manager.create_task(Task(title="late", due_date=datetime.now() - timedelta(days=1)))
+    task_manager.create_task(Task(title="soon", due_date=datetime.now() + timedelta(seconds=0.5)))
+    assert _titles(task_manager.get_overdue_tasks()) == ["late"]
+
+    time.sleep(0.6)
+    assert _titles(task_manager.get_overdue_tasks()) == ["late", "soon"]
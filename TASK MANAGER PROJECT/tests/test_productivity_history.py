@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import habit_tracker
+import productivity_history
+import task_manager
+import time_tracker
+from analytics import Analytics
+from habit_tracker import Habit
+from task_manager import Task
+from time_tracker import close_session
+
+FIRST_DAY = datetime(2026, 3, 2)
+DAYS = 12
+
+
+class _Clock(datetime):
+    """datetime whose now() is set by the test"""
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    for module in (task_manager, habit_tracker, time_tracker, productivity_history):
+        monkeypatch.setattr(module, 'datetime', _Clock)
+    return _Clock
+
+
+def _track(db, start_time, minutes):
+    session_id = db.execute_query("INSERT INTO time_sessions (start_time, session_type) VALUES (?, ?)",
+                                  (start_time.isoformat(), 'pomodoro_work'))
+    close_session(db, session_id, None, start_time, start_time + timedelta(minutes=minutes), minutes * 60,
+                  'pomodoro_work')
+
+
+def _live_days(db_path, clock):
+    """Run a fixed scenario day by day; returns {day: insights at the end of that day}"""
+    analytics = Analytics(db_path)
+    tasks, habits = analytics.task_manager, analytics.habit_tracker
+    ids = {}
+    live = {}
+
+    for offset in range(DAYS):
+        morning = FIRST_DAY + timedelta(days=offset, hours=9)
+        clock.current = morning
+
+        if offset == 0:
+            ids['reading'] = habits.create_habit(Habit(name="reading"))
+            ids['running'] = habits.create_habit(Habit(name="running"))
+            for name, due_in in (('report', 2), ('taxes', 5), ('someday', None), ('slides', 3)):
+                due = FIRST_DAY + timedelta(days=due_in, hours=17) if due_in is not None else None
+                ids[name] = tasks.create_task(Task(title=name, due_date=due))
+        if offset == 5:
+            ids['stretching'] = habits.create_habit(Habit(name="stretching"))
+            ids['review'] = tasks.create_task(Task(title="review", due_date=morning + timedelta(days=2)))
+
+        if offset != 4:
+            habits.mark_habit_complete(ids['reading'])
+        if offset in (1, 2, 3, 7, 8):
+            habits.mark_habit_complete(ids['running'])
+        if offset in (5, 6, 9):
+            habits.mark_habit_complete(ids['stretching'])
+
+        if offset == 2:
+            tasks.mark_task_complete(ids['slides'])
+        if offset == 3:
+            tasks.mark_task_complete(ids['report'])  # A day late
+        if offset == 6:
+            tasks.mark_task_complete(ids['someday'])
+        if offset == 9:
+            tasks.mark_task_complete(ids['review'])  # Overdue for two days
+
+        _track(analytics.time_tracker.db, morning + timedelta(hours=1), 30 + 15 * (offset % 4))
+
+        clock.current = morning + timedelta(hours=14, minutes=59)  # 23:59
+        live[clock.current.date()] = analytics.get_productivity_insights()
+
+    return analytics, live
+
+
+def test_reconstructed_days_match_the_live_insights(db_path, clock):
+    analytics, live = _live_days(db_path, clock)
+    last_day = max(live)
+
+    reconstructed = dict(analytics.history.reconstruct(min(live), last_day,
+                                                       analytics._calculate_productivity_score))
+    assert reconstructed == live
+
+
+def test_snapshot_backfills_every_missing_day(db_path, clock):
+    analytics, live = _live_days(db_path, clock)
+    last_day = max(live)
+
+    assert analytics.record_daily_snapshot() == DAYS
+    rows = analytics.history.get_history(DAYS)
+    assert [row['day'] for row in rows] == [day.isoformat() for day in sorted(live)]
+    for row in rows:
+        expected = live[datetime.fromisoformat(row['day']).date()]
+        assert {key: value for key, value in row.items() if key != 'day'} == expected
+
+    # A later snapshot only adds the days since
+    clock.current += timedelta(days=2)
+    assert analytics.record_daily_snapshot() == 2  # The day in between and the new today
+    assert analytics.history.last_recorded_day() == last_day + timedelta(days=1)
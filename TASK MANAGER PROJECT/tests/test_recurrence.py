@@ -0,0 +1,79 @@
+import itertools
+from datetime import datetime, timedelta
+
+import pytest
+
+from recurrence import RecurrenceRule, add_months
+from task_manager import Task, TaskManager, TaskStatus
+
+
+def test_daily_interval_and_count():
+    rule = RecurrenceRule.parse("FREQ=DAILY;INTERVAL=2;COUNT=3")
+    anchor = datetime(2026, 1, 1, 9, 0)
+
+    assert list(rule.occurrences(anchor)) == [
+        datetime(2026, 1, 1, 9, 0), datetime(2026, 1, 3, 9, 0), datetime(2026, 1, 5, 9, 0)
+    ]
+
+
+def test_weekdays_shortcut_skips_weekends():
+    rule = RecurrenceRule.parse("weekdays")
+    friday = datetime(2026, 10, 16, 8, 0)
+
+    days = [occurrence.strftime("%a") for occurrence in itertools.islice(rule.occurrences(friday), 4)]
+    assert days == ["Fri", "Mon", "Tue", "Wed"]
+
+
+def test_monthly_clamps_to_month_end():
+    rule = RecurrenceRule.parse("FREQ=MONTHLY;COUNT=3")
+    anchor = datetime(2026, 1, 31)
+
+    assert [occurrence.date().isoformat() for occurrence in rule.occurrences(anchor)] == [
+        "2026-01-31", "2026-02-28", "2026-03-31"
+    ]
+    assert add_months(datetime(2024, 1, 31), 1) == datetime(2024, 2, 29)
+
+
+def test_window_jumps_ahead_without_walking_the_series():
+    rule = RecurrenceRule.parse("FREQ=DAILY")
+    anchor = datetime(1990, 1, 1, 7, 30)
+    start = datetime(2026, 10, 1)
+
+    window = list(rule.occurrences(anchor, start, start + timedelta(days=3)))
+    assert window == [datetime(2026, 10, d, 7, 30) for d in (1, 2, 3)]
+
+
+def test_until_and_next_after():
+    rule = RecurrenceRule.parse("FREQ=WEEKLY;UNTIL=20261020")
+    anchor = datetime(2026, 10, 1, 12, 0)
+
+    assert rule.next_after(anchor, anchor) == datetime(2026, 10, 8, 12, 0)
+    assert rule.next_after(datetime(2026, 10, 15, 12, 0), anchor) is None
+
+
+def test_pattern_round_trip():
+    rule = RecurrenceRule.parse("FREQ=WEEKLY;INTERVAL=2;BYDAY=FR,MO;COUNT=5;DTSTART=2026-10-01T09:00:00")
+
+    assert RecurrenceRule.parse(rule.to_pattern()).to_pattern() == rule.to_pattern()
+    assert rule.by_day == ['MO', 'FR']
+
+
+@pytest.mark.parametrize("pattern", ["", "FREQ=HOURLY", "FREQ=DAILY;INTERVAL=0", "FREQ=DAILY;BYDAY=MO",
+                                     "FREQ=WEEKLY;BYDAY=XX", "FREQ"])
+def test_invalid_patterns(pattern):
+    with pytest.raises(ValueError):
+        RecurrenceRule.parse(pattern)
+
+
+def test_completing_twice_creates_one_next_instance(db_path):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="standup", due_date=datetime.now() + timedelta(hours=1),
+                                            recurring=True, recurrence_pattern="daily"))
+
+    task_manager.mark_task_complete(task_id)
+    completed_date = task_manager.get_task(task_id).completed_date
+    task_manager.mark_task_complete(task_id)
+
+    pending = task_manager.get_all_tasks(status=TaskStatus.PENDING)
+    assert [task.title for task in pending] == ["standup"]
+    assert task_manager.get_task(task_id).completed_date == completed_date
@@ -0,0 +1,74 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from reminders import ReminderEngine, ReminderKind
+from task_manager import Task, TaskManager
+
+
+def _engine(db_path):
+    fired = []
+    done = threading.Event()
+
+    def callback(kind, task_id):
+        fired.append((kind, task_id))
+        done.set()
+
+    engine = ReminderEngine(TaskManager(db_path), callback, remind_before=None)
+    return engine, fired, done
+
+
+def test_rescheduling_to_the_same_date_fires_once(db_path):
+    engine, fired, done = _engine(db_path)
+    due = datetime.now() + timedelta(seconds=0.3)
+    task_id = engine.task_manager.create_task(Task(title="report", due_date=due))
+
+    engine.schedule(task_id, due)
+    engine.schedule(task_id, due)
+    engine.start()
+    assert done.wait(2)
+    time.sleep(0.2)
+    engine.stop()
+
+    assert fired == [(ReminderKind.OVERDUE, task_id)]
+    assert engine.overdue == {task_id}
+
+
+def test_cancelled_and_completed_tasks_do_not_fire(db_path):
+    engine, fired, done = _engine(db_path)
+    due = datetime.now() + timedelta(seconds=0.2)
+    task_manager = engine.task_manager
+    completed = task_manager.create_task(Task(title="done early", due_date=due))
+    cancelled = task_manager.create_task(Task(title="dropped", due_date=due))
+    kept = task_manager.create_task(Task(title="kept", due_date=due + timedelta(seconds=0.1)))
+
+    task_manager.mark_task_complete(completed)
+    engine.cancel(cancelled)
+    engine.start()
+    assert done.wait(2)
+    time.sleep(0.2)
+    engine.stop()
+
+    assert fired == [(ReminderKind.OVERDUE, kept)]
+    assert engine.pending_count() == 0
+
+
+def test_stale_entries_are_compacted(db_path):
+    engine, fired, done = _engine(db_path)
+    engine.remind_before = timedelta(minutes=15)
+    task_manager = engine.task_manager
+    later = task_manager.create_task(Task(title="later", due_date=datetime.now() + timedelta(days=1)))
+    task_id = task_manager.create_task(Task(title="report"))
+
+    start = datetime.now() + timedelta(days=2)
+    for minutes in range(300):
+        task_manager.update_task(task_id, due_date=start + timedelta(minutes=minutes))
+    assert len(engine._heap) <= 4 * 2 + 64 + 2
+
+    engine.schedule(task_id, datetime.now() + timedelta(seconds=0.2))
+    engine.start()
+    assert done.wait(2)
+    time.sleep(0.2)
+    engine.stop()
+    assert fired == [(ReminderKind.OVERDUE, task_id)]  # Too close for a due-soon reminder
+    assert engine.pending_count() == 1 and later not in engine.overdue
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from scheduler import TaskScheduler, task_score
+from task_manager import Priority, Task, TaskManager
+
+
+def test_task_score_orders_by_latest_start():
+    now = datetime(2026, 10, 1, 9, 0)
+    short = Task(priority=Priority.MEDIUM, due_date=now + timedelta(days=2), estimated_duration=30)
+    long = Task(priority=Priority.MEDIUM, due_date=now + timedelta(days=2), estimated_duration=600)
+    urgent = Task(priority=Priority.URGENT, due_date=now + timedelta(days=2), estimated_duration=30)
+
+    assert task_score(long) < task_score(short)
+    assert task_score(urgent) < task_score(short)
+
+
+def test_task_score_without_due_date_uses_priority_horizon():
+    created = datetime(2026, 10, 1, 9, 0)
+    high = Task(priority=Priority.HIGH, created_date=created)
+    low = Task(priority=Priority.LOW, created_date=created)
+
+    assert task_score(high) < task_score(low)
+
+
+def test_next_follows_task_changes(db_path):
+    task_manager = TaskManager(db_path)
+    now = datetime.now()
+    later = task_manager.create_task(Task(title="later", due_date=now + timedelta(days=10)))
+    sooner = task_manager.create_task(Task(title="sooner", due_date=now + timedelta(days=5)))
+    scheduler = TaskScheduler(task_manager)
+
+    assert [task.id for task in scheduler.next(2)] == [sooner, later]
+
+    # Re-scoring moves a task to the front; the replaced entry is skipped
+    task_manager.update_task(later, due_date=now + timedelta(days=1))
+    assert [task.id for task in scheduler.next(2)] == [later, sooner]
+    assert len(scheduler) == 2
+
+    task_manager.mark_task_complete(later)
+    assert [task.id for task in scheduler.next(2)] == [sooner]
+
+    task_manager.delete_task(sooner)
+    assert scheduler.next() == []
+    assert len(scheduler) == 0
+    scheduler.close()
+
+
+def test_next_does_not_consume_the_heap(db_path):
+    task_manager = TaskManager(db_path)
+    for days in (3, 1, 2):
+        task_manager.create_task(Task(title=f"in {days} days", due_date=datetime.now() + timedelta(days=days)))
+    scheduler = TaskScheduler(task_manager)
+
+    first = [task.title for task in scheduler.next(3)]
+    assert first == ["in 1 days", "in 2 days", "in 3 days"]
+    assert [task.title for task in scheduler.next(3)] == first
@@ -0,0 +1,83 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from habit_tracker import Habit, HabitTracker
+from sharding import ShardRouter, merge_daily_totals
+from task_manager import Priority, Task, TaskManager
+from time_tracker import close_session
+
+USERS = ['alice', 'bob', 'carol']
+
+
+def _fill(task_manager, habit_tracker, user_index):
+    """Some tasks and habits whose counts differ per user"""
+    for i in range(user_index + 2):
+        task_id = task_manager.create_task(Task(title=f"Task {i}", priority=Priority.HIGH if i % 2 else Priority.LOW,
+                                                due_date=datetime.now() - timedelta(days=1) if i == 0 else None))
+        if i % 2:
+            task_manager.mark_task_complete(task_id, actual_duration=10 * (user_index + i))
+    for i in range(user_index + 1):
+        habit_id = habit_tracker.create_habit(Habit(name=f"Habit {i}"))
+        if i == 0:
+            habit_tracker.mark_habit_complete(habit_id)
+
+
+def _track(db, start_time, seconds):
+    session_id = db.execute_query("INSERT INTO time_sessions (start_time, session_type) VALUES (?, ?)",
+                                  (start_time.isoformat(), 'pomodoro_work'))
+    close_session(db, session_id, None, start_time, start_time + timedelta(seconds=seconds), seconds,
+                  'pomodoro_work')
+
+
+def test_fan_out_matches_one_database_holding_every_shard(tmp_path):
+    router = ShardRouter(str(tmp_path / "shards"))
+    combined = str(tmp_path / "combined.db")
+    for index, user in enumerate(USERS):
+        _fill(router.task_manager(user), router.habit_tracker(user), index)
+        _fill(TaskManager(combined), HabitTracker(combined), index)
+
+    assert router.get_task_statistics() == TaskManager(combined).get_task_statistics()
+    assert router.get_habit_statistics() == HabitTracker(combined).get_habit_statistics()
+
+    # Only the named shards take part
+    assert router.get_task_statistics(['bob'])['total_tasks'] == 3
+
+
+def test_daily_totals_are_summed_per_day_and_ordered(tmp_path):
+    router = ShardRouter(str(tmp_path / "shards"))
+    day = datetime(2026, 10, 5, 9, 0)
+    _track(router.time_tracker('carol').db, day + timedelta(days=2), 600)
+    _track(router.time_tracker('alice').db, day, 300)
+    _track(router.time_tracker('bob').db, day + timedelta(days=2), 60)
+    _track(router.time_tracker('bob').db, day + timedelta(days=1), 120)
+
+    assert router.get_daily_totals(day) == [('2026-10-05', 300), ('2026-10-06', 120), ('2026-10-07', 660)]
+    assert router.get_daily_totals(day, day + timedelta(days=1), users=['bob']) == [('2026-10-06', 120)]
+    assert merge_daily_totals([[('2026-10-02', 5)], [], [('2026-10-01', 1), ('2026-10-02', 2)]]) == \
+        [('2026-10-01', 1), ('2026-10-02', 7)]
+
+
+def test_users_are_routed_to_the_same_shard_every_time(tmp_path):
+    shard_dir = str(tmp_path / "shards")
+    router = ShardRouter(shard_dir)
+    task_id = router.task_manager('alice').create_task(Task(title="Alice's task"))
+    router.task_manager('bob')
+
+    assert router.task_manager('alice') is router.task_manager('alice')
+    assert router.shard_path('alice') == os.path.join(shard_dir, "alice.db")
+    assert router.users() == ['alice', 'bob']
+
+    # A new router (another process) finds the task on the same shard and nowhere else
+    reopened = ShardRouter(shard_dir)
+    assert reopened.shard_path('alice') == router.shard_path('alice')
+    assert reopened.task_manager('alice').get_task(task_id).title == "Alice's task"
+    assert reopened.task_manager('bob').get_all_tasks() == []
+
+
+@pytest.mark.parametrize('user', ['', '../alice', 'a/b', '.hidden', 'x' * 101])
+def test_unsafe_shard_names_are_rejected(tmp_path, user):
+    router = ShardRouter(str(tmp_path / "shards"))
+    with pytest.raises(ValueError):
+        router.shard_path(user)
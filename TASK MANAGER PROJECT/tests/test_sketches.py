@@ -0,0 +1,85 @@
+import random
+import threading
+from datetime import datetime
+
+import pytest
+
+from sketches import RELATIVE_ACCURACY, TASK_KIND, DurationSketches, LogHistogram
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_within_the_relative_accuracy():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(7, 1.2) for _ in range(20000)]
+    histogram = LogHistogram()
+    for value in values:
+        histogram.add(value)
+
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        assert histogram.quantile(q) == pytest.approx(_exact_quantile(values, q), rel=RELATIVE_ACCURACY)
+    assert histogram.count == len(values)
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+    assert len(histogram.bins) < 1000
+
+
+def test_merging_equals_adding_everything_to_one_histogram():
+    rng = random.Random(5)
+    parts = [[rng.uniform(1, 3600) for _ in range(1000)] for _ in range(3)]
+    merged, combined = LogHistogram(), LogHistogram()
+    for part in parts:
+        histogram = LogHistogram()
+        for value in part:
+            histogram.add(value)
+            combined.add(value)
+        merged.merge(histogram)
+
+    assert merged.bins == combined.bins
+    assert (merged.count, merged.min_value, merged.max_value) == (combined.count, combined.min_value,
+                                                                  combined.max_value)
+
+
+def test_row_round_trip_and_empty_histograms():
+    histogram = LogHistogram()
+    assert histogram.quantile(0.5) is None and histogram.summary()['p50'] is None
+    histogram.add(0)  # Not a duration
+    histogram.add(None)
+    assert histogram.count == 0
+
+    for value in (1, 60, 1500):
+        histogram.add(value)
+    restored = LogHistogram.from_row(histogram.to_row())
+    assert restored.summary() == histogram.summary()
+    assert restored.quantile(0) == 1
+    assert restored.quantile(1) == pytest.approx(1500, rel=RELATIVE_ACCURACY)
+
+
+def test_task_percentiles_by_category(db_path):
+    sketches = DurationSketches(db_path)
+    for minutes in (10, 20, 30, 40):
+        sketches.add_task("work", minutes)
+    sketches.add_task("home", 5, datetime(2020, 1, 1))  # Outside the window
+
+    summary = sketches.percentiles(TASK_KIND, days=7)
+    assert summary['count'] == 4
+    assert summary['p50'] == pytest.approx(20, rel=RELATIVE_ACCURACY)
+    assert list(sketches.percentiles_by_key(TASK_KIND, days=7)) == ["work"]
+
+
+def test_concurrent_additions_are_not_lost(db_path):
+    sketches = DurationSketches(db_path)
+
+    def complete_tasks():
+        for _ in range(40):
+            sketches.add_task("work", 25)
+
+    threads = [threading.Thread(target=complete_tasks) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sketches.percentiles(TASK_KIND, days=1)['count'] == 160
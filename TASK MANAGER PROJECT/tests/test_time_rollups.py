@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from database import Database
+from time_tracker import TimeTracker, close_session, parse_start_time
+
+
+def _close(db, start_time, seconds, session_type='pomodoro_work', task_id=None):
+    session_id = db.execute_query("INSERT INTO time_sessions (task_id, start_time, session_type) VALUES (?, ?, ?)",
+                                  (task_id, start_time.isoformat(), session_type))
+    close_session(db, session_id, task_id, start_time, start_time + timedelta(seconds=seconds), seconds,
+                  session_type)
+
+
+def _rollups(db):
+    return db.fetch_all("SELECT day, session_type, task_id, total_seconds, session_count FROM time_rollups "
+                        "ORDER BY day, session_type, task_id")
+
+
+def test_session_across_midnight_is_split_and_counted_once(db_path):
+    db = Database(db_path)
+    _close(db, datetime(2026, 10, 1, 23, 30), 3600)
+
+    assert _rollups(db) == [
+        ('2026-10-01', 'pomodoro_work', 0, 1800, 1),
+        ('2026-10-02', 'pomodoro_work', 0, 1800, 0),
+    ]
+
+
+def test_rebuild_matches_the_incremental_rollups(db_path):
+    tracker = TimeTracker(db_path)
+    db = tracker.db
+    _close(db, datetime(2026, 10, 1, 9, 0), 1500)
+    _close(db, datetime(2026, 10, 1, 23, 50), 1200, 'pomodoro_break')
+    _close(db, datetime(2026, 10, 2, 22, 0), 2 * 86400 + 600, task_id=7)
+    _close(db, datetime(2026, 10, 3, 10, 0), 300, task_id=7)
+    incremental = _rollups(db)
+
+    tracker.rebuild_rollups()
+    assert _rollups(db) == incremental
+
+
+def test_rebuild_parses_date_only_and_offset_start_times(db_path):
+    tracker = TimeTracker(db_path)
+    db = tracker.db
+    offset_start = "2026-10-05T23:30:00+00:00"
+    db.execute_query("INSERT INTO time_sessions (start_time, end_time, duration, session_type) "
+                     "VALUES (?, ?, ?, ?)", ("2026-10-04", "2026-10-04T00:25:00", 1500, 'pomodoro_work'))
+    db.execute_query("INSERT INTO time_sessions (start_time, end_time, duration, session_type) "
+                     "VALUES (?, ?, ?, ?)", (offset_start, None, 600, 'pomodoro_work'))
+
+    tracker.rebuild_rollups()
+    local_start = parse_start_time(offset_start)
+    assert local_start.tzinfo is None
+    totals = dict(db.fetch_all("SELECT day, SUM(total_seconds) FROM time_rollups GROUP BY day"))
+    assert totals.pop('2026-10-04') == 1500
+    assert sum(totals.values()) == 600 and min(totals) == local_start.date().isoformat()
+
+
+def test_time_statistics_cover_exactly_the_requested_days(db_path):
+    tracker = TimeTracker(db_path)
+    today = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    for days_ago in range(3):
+        _close(tracker.db, today - timedelta(days=days_ago), 600)
+
+    stats = tracker.get_time_statistics(days=2)
+    assert [entry['date'] for entry in stats['daily_breakdown']] == [
+        today.date().isoformat(), (today - timedelta(days=1)).date().isoformat()
+    ]
+    assert stats['total_time_minutes'] == 20
+    assert len(tracker.get_time_statistics(days=10)['daily_breakdown']) == 3
@@ -0,0 +1,132 @@
+import threading
+import time
+from datetime import datetime
+
+from database import Database
+from timer_service import TimerService, TimerState
+from time_tracker import TimeTracker, close_session, split_by_day
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_timers_finish_in_deadline_order(db_path):
+    service = TimerService(db_path)
+    finished = []
+    done = threading.Event()
+
+    def on_complete(timer):
+        finished.append(timer.id)
+        if len(finished) == 3:
+            done.set()
+
+    slow = service.start(0.3, on_complete=on_complete)
+    fast = service.start(0.1, on_complete=on_complete)
+    middle = service.start(0.2, on_complete=on_complete)
+    assert done.wait(3)
+    service.shutdown()
+
+    assert finished == [fast.id, middle.id, slow.id]
+    assert service.active_timers() == []
+
+
+def test_paused_and_stopped_timers_do_not_fire(db_path):
+    service = TimerService(db_path)
+    finished = []
+    paused = service.start(0.1, on_complete=finished.append)
+    stopped = service.start(0.1, on_complete=finished.append)
+
+    assert service.pause(paused.id)
+    assert service.stop(stopped.id) is stopped
+    time.sleep(0.3)
+    assert finished == []
+    assert paused.state == TimerState.PAUSED and 0 < paused.remaining() <= 0.1
+
+    assert service.resume(paused.id)
+    assert _wait_for(lambda: finished == [paused])
+    service.shutdown()
+
+
+def test_a_raising_callback_does_not_stop_other_timers(db_path, caplog):
+    service = TimerService(db_path)
+    finished = []
+
+    def broken(timer):
+        raise RuntimeError("widget was destroyed")
+
+    service.start(0.05, on_tick=broken, on_complete=broken)
+    later = service.start(0.3, on_complete=finished.append)
+
+    assert _wait_for(lambda: finished == [later])
+    service.shutdown()
+    assert "callback failed" in caplog.text
+
+
+def test_running_timers_survive_a_restart(db_path):
+    first = TimerService(db_path)
+    timer = first.start(60, owner="alice")
+    first.shutdown()
+
+    restored = TimerService(db_path).active_timers("alice")
+    assert [t.id for t in restored] == [timer.id]
+    assert 55 < restored[0].remaining() <= 60
+
+
+def _open_session(db, start_time):
+    return db.execute_query("INSERT INTO time_sessions (start_time, session_type) VALUES (?, ?)",
+                            (start_time.isoformat(), 'pomodoro_work'))
+
+
+def test_closing_a_session_twice_counts_it_once(db_path):
+    db = Database(db_path)
+    start_time = datetime(2026, 10, 1, 9, 0)
+    session_id = _open_session(db, start_time)
+
+    end_time = datetime(2026, 10, 1, 9, 25)
+    assert close_session(db, session_id, None, start_time, end_time, 1500, 'pomodoro_work')
+    assert not close_session(db, session_id, None, start_time, end_time, 1500, 'pomodoro_work')
+
+    assert db.fetch_all("SELECT day, total_seconds, session_count FROM time_rollups") == [
+        ('2026-10-01', 1500, 1)
+    ]
+    assert db.fetch_all("SELECT count FROM duration_sketches") == [(1,)]
+
+
+def test_two_processes_finishing_one_timer_count_it_once(db_path):
+    tracker = TimeTracker(db_path, timer_service=TimerService(db_path))
+    tracker.work_duration = 1
+    assert tracker.start_pomodoro()
+    other_process = TimerService(db_path)  # Restores the same running timer
+
+    db = tracker.db
+    assert _wait_for(lambda: db.fetch_all("SELECT end_time FROM time_sessions")[0][0] is not None)
+    time.sleep(0.3)
+    tracker.timers.shutdown()
+    other_process.shutdown()
+
+    assert db.fetch_all("SELECT SUM(total_seconds), SUM(session_count) FROM time_rollups") == [(1, 1)]
+
+
+def test_statistics_trackers_never_load_timers(db_path):
+    starter = TimeTracker(db_path, timer_service=TimerService(db_path), owner="alice")
+    assert starter.start_pomodoro()
+
+    reader = TimeTracker(db_path, owner="alice")
+    reader.get_time_statistics()
+    assert db_path not in TimerService._shared
+
+    assert reader.is_running  # The first timer call restores the running timer
+    assert reader.current_session == starter.current_session
+    assert db_path in TimerService._shared
+    TimerService._shared.pop(db_path).shutdown()
+    starter.timers.shutdown()
+
+
+def test_split_by_day_at_midnight():
+    assert split_by_day(datetime(2026, 10, 1, 23, 50), 1200) == [('2026-10-01', 600), ('2026-10-02', 600)]
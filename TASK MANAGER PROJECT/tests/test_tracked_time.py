@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+import repair
+from task_manager import Task, TaskManager
+from time_tracker import close_session
+
+
+def _tracked(manager, task_id):
+    return manager.db.fetch_all("SELECT tracked_seconds FROM tasks WHERE id = ?", (task_id,))[0][0]
+
+
+def _close(db, task_id, seconds, start_time=datetime(2026, 10, 1, 9, 0)):
+    session_id = db.execute_query("INSERT INTO time_sessions (task_id, start_time, session_type) VALUES (?, ?, ?)",
+                                  (task_id, start_time.isoformat(), 'pomodoro_work'))
+    close_session(db, session_id, task_id, start_time, start_time + timedelta(seconds=seconds), seconds,
+                  'pomodoro_work')
+    return session_id
+
+
+def test_triggers_follow_session_inserts_updates_and_deletes(db_path):
+    manager = TaskManager(db_path)
+    db = manager.db
+    first, second = (manager.create_task(Task(title=title)) for title in ("First", "Second"))
+
+    # An open session counts once it is closed with a duration
+    session_id = _close(db, first, 1500)
+    assert _tracked(manager, first) == 1500
+    db.execute_query("INSERT INTO time_sessions (task_id, start_time, duration, session_type) VALUES (?, ?, ?, ?)",
+                     (first, datetime(2026, 10, 1, 10, 0).isoformat(), 300, 'pomodoro_work'))
+    assert _tracked(manager, first) == 1800
+
+    db.execute_query("UPDATE time_sessions SET duration = 1200 WHERE id = ?", (session_id,))
+    assert _tracked(manager, first) == 1500
+
+    # Moving a session moves its time
+    db.execute_query("UPDATE time_sessions SET task_id = ? WHERE id = ?", (second, session_id))
+    assert (_tracked(manager, first), _tracked(manager, second)) == (300, 1200)
+
+    db.execute_query("DELETE FROM time_sessions WHERE id = ?", (session_id,))
+    assert (_tracked(manager, first), _tracked(manager, second)) == (300, 0)
+
+
+def test_statistics_use_tracked_time_of_completed_tasks(db_path):
+    manager = TaskManager(db_path)
+    tracked, entered = (manager.create_task(Task(title=title)) for title in ("Tracked", "Entered"))
+    _close(manager.db, tracked, 1800)
+    manager.mark_task_complete(tracked)
+    manager.mark_task_complete(entered, actual_duration=50)
+
+    assert manager.get_task_statistics()['average_time_spent'] == 40
+
+
+def test_repair_rebuilds_corrupted_totals(db_path, capsys):
+    manager = TaskManager(db_path)
+    db = manager.db
+    first, second = (manager.create_task(Task(title=title)) for title in ("First", "Second"))
+    _close(db, first, 1500)
+    _close(db, first, 600, datetime(2026, 10, 2, 23, 55))
+    _close(db, second, 900)
+    rollups_query = "SELECT day, task_id, total_seconds, session_count FROM time_rollups ORDER BY day, task_id"
+    rollups = db.fetch_all(rollups_query)
+
+    db.execute_query("UPDATE tasks SET tracked_seconds = 99999 WHERE id = ?", (first,))
+    db.execute_query("UPDATE tasks SET tracked_seconds = -5 WHERE id = ?", (second,))
+    db.execute_query("UPDATE time_rollups SET total_seconds = 1, session_count = 7")
+    db.execute_query("DELETE FROM time_rollups WHERE day = '2026-10-03'")
+
+    repair.main(['tracked-time', 'rollups', '--db', db_path])
+
+    assert (_tracked(manager, first), _tracked(manager, second)) == (2100, 900)
+    assert db.fetch_all(rollups_query) == rollups
+    assert "Rebuilt tracked-time" in capsys.readouterr().out
@@ -0,0 +1,108 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from task_manager import Task, TaskManager, TaskStatus
+from write_queue import WriteBehindQueue
+
+
+@pytest.fixture
+def queue(db_path):
+    queue = WriteBehindQueue(db_path, max_delay=0.2)
+    yield queue
+    queue.close()
+
+
+def _hold(queue):
+    """Keep the writer busy until the returned event is set, so the next submits stay queued"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    queue.submit(hold)
+    assert started.wait(5)
+    return release
+
+
+def test_same_function_and_key_coalesce(queue):
+    calls = []
+    release = _hold(queue)
+    first = queue.submit(lambda **fields: calls.append(fields), key=('task', 1), title="a")
+    second = queue.submit(first.func, key=('task', 1), priority="high")
+    third = queue.submit(first.func, key=('task', 1), title="b")
+    release.set()
+
+    assert first is second is third
+    assert queue.flush(5)
+    assert calls == [{'title': "b", 'priority': "high"}]
+
+
+def test_different_functions_on_one_key_all_run_in_order(queue):
+    calls = []
+    release = _hold(queue)
+    queue.submit(lambda: calls.append("complete"), key=('task', 1))
+    queue.submit(lambda: calls.append("delete"), key=('task', 1))
+    queue.submit(lambda: calls.append("other task"), key=('task', 2))
+    release.set()
+
+    assert queue.flush(5)
+    assert calls == ["complete", "delete", "other task"]
+
+
+def test_complete_then_delete_keeps_the_completion_side_effects(db_path, queue):
+    task_manager = TaskManager(db_path)
+    task_id = task_manager.create_task(Task(title="water plants", due_date=datetime.now() + timedelta(hours=1),
+                                            recurring=True, recurrence_pattern="daily"))
+
+    release = _hold(queue)
+    completed = queue.submit(task_manager.mark_task_complete, task_id, key=('task', task_id))
+    deleted = queue.submit(task_manager.delete_task, task_id, key=('task', task_id))
+    release.set()
+
+    assert completed.wait(5) and deleted.wait(5)
+    assert task_manager.get_task(task_id) is None
+    assert [task.title for task in task_manager.get_all_tasks(TaskStatus.PENDING)] == ["water plants"]
+
+
+def test_a_failing_write_does_not_undo_the_others(db_path, queue):
+    task_manager = TaskManager(db_path)
+    results = []
+    release = _hold(queue)
+    good = queue.submit(task_manager.create_task, Task(title="kept"))
+    bad = queue.submit(task_manager.create_task, Task(title=None))  # NOT NULL violation
+    queue.submit(task_manager.create_task, Task(title="also kept"), callback=lambda *r: results.append(r))
+    release.set()
+
+    assert queue.flush(5)
+    assert good.wait() and results[0][1] is None
+    with pytest.raises(Exception):
+        bad.wait()
+    assert sorted(task.title for task in task_manager.get_all_tasks()) == ["also kept", "kept"]
+
+
+def test_a_failing_write_does_not_reach_the_scheduler(db_path, queue):
+    from scheduler import TaskScheduler
+
+    task_manager = TaskManager(db_path)
+    now = datetime.now()
+    first = task_manager.create_task(Task(title="first", due_date=now + timedelta(days=2)))
+    second = task_manager.create_task(Task(title="second", due_date=now + timedelta(days=5)))
+    scheduler = TaskScheduler(task_manager)
+
+    def reschedule_then_fail():
+        task_manager.update_task(second, due_date=now + timedelta(hours=1))
+        raise RuntimeError("rejected")
+
+    failed = queue.submit(reschedule_then_fail)
+    assert queue.flush(5)
+    with pytest.raises(RuntimeError):
+        failed.wait()
+    assert [task.id for task in scheduler.next(2)] == [first, second]
+
+    queue.submit(task_manager.update_task, second, due_date=now + timedelta(hours=1))
+    assert queue.flush(5)
+    assert [task.id for task in scheduler.next(2)] == [second, first]
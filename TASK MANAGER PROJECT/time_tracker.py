@@ -1,164 +1,375 @@
-import time
-import threading
-from datetime import datetime, timedelta
-from database import Database
-
-
-class TimeTracker:
-    def __init__(self, db_path="task_manager.db"):
-        self.db = Database(db_path)
-        self.is_running = False
-        self.current_session = None
-        self.start_time = None
-        self.duration = 0
-        self.on_tick = None
-        self.on_complete = None
-
-        # Pomodoro settings
-        self.work_duration = 25 * 60  # 25 minutes
-        self.break_duration = 5 * 60  # 5 minutes
-        self.is_break = False
-
-    def start_pomodoro(self, task_id=None, on_tick=None, on_complete=None):
-        """Start a Pomodoro session"""
-        if self.is_running:
-            return False
-
-        self.is_running = True
-        self.is_break = False
-        self.duration = self.work_duration
-        self.start_time = datetime.now()
-        self.on_tick = on_tick
-        self.on_complete = on_complete
-
-        # Create time session record
-        query = '''
-                INSERT INTO time_sessions (task_id, start_time, session_type)
-                VALUES (?, ?, ?) \
-                '''
-        self.current_session = self.db.execute_query(
-            query, (task_id, self.start_time.isoformat(), 'pomodoro_work')
-        )
-
-        # Start the timer thread
-        self.timer_thread = threading.Thread(target=self._run_timer)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
-
-        return True
-
-    def start_break(self):
-        """Start a break session"""
-        if self.is_running:
-            return False
-
-        self.is_running = True
-        self.is_break = True
-        self.duration = self.break_duration
-        self.start_time = datetime.now()
-
-        query = '''
-                INSERT INTO time_sessions (start_time, session_type)
-                VALUES (?, ?) \
-                '''
-        self.current_session = self.db.execute_query(
-            query, (self.start_time.isoformat(), 'pomodoro_break')
-        )
-
-        self.timer_thread = threading.Thread(target=self._run_timer)
-        self.timer_thread.daemon = True
-        self.timer_thread.start()
-
-        return True
-
-    def stop_timer(self):
-        """Stop the current timer"""
-        if not self.is_running:
-            return
-
-        self.is_running = False
-        end_time = datetime.now()
-
-        # Calculate total duration
-        total_seconds = (end_time - self.start_time).total_seconds()
-
-        # Update the time session
-        if self.current_session:
-            query = '''
-                    UPDATE time_sessions
-                    SET end_time = ?, \
-                        duration = ?
-                    WHERE id = ? \
-                    '''
-            self.db.execute_query(
-                query, (end_time.isoformat(), int(total_seconds), self.current_session)
-            )
-
-    def _run_timer(self):
-        """Internal timer loop"""
-        while self.is_running and self.duration > 0:
-            time.sleep(1)
-            self.duration -= 1
-
-            if self.on_tick:
-                minutes = self.duration // 60
-                seconds = self.duration % 60
-                self.on_tick(minutes, seconds, self.is_break)
-
-        if self.is_running:  # Timer completed naturally
-            self.is_running = False
-            if self.on_complete:
-                self.on_complete(self.is_break)
-
-    def get_time_statistics(self, days=7):
-        """Get time tracking statistics"""
-        start_date = (datetime.now() - timedelta(days=days)).isoformat()
-
-        # Total time spent
-        query = '''
-                SELECT SUM(duration) as total_time
-                FROM time_sessions
-                WHERE start_time >= ? \
-                  AND duration > 0 \
-                '''
-        result = self.db.execute_query(query, (start_date,))
-        total_time = result[0]['total_time'] if result and result[0]['total_time'] else 0
-
-        # Time by session type
-        type_query = '''
-                     SELECT session_type, SUM(duration) as total_time
-                     FROM time_sessions
-                     WHERE start_time >= ? \
-                       AND duration > 0
-                     GROUP BY session_type \
-                     '''
-        type_results = self.db.execute_query(type_query, (start_date,))
-        time_by_type = {result['session_type']: result['total_time'] for result in type_results}
-
-        # Daily time spent
-        daily_query = '''
-                      SELECT DATE (start_time) as date, SUM (duration) as total_time
-                      FROM time_sessions
-                      WHERE start_time >= ? AND duration > 0
-                      GROUP BY DATE (start_time)
-                      ORDER BY date DESC
-                          LIMIT 7 \
-                      '''
-        daily_results = self.db.execute_query(daily_query, (start_date,))
-
-        return {
-            'total_time_minutes': total_time // 60 if total_time else 0,
-            'time_by_type': time_by_type,
-            'daily_breakdown': daily_results
-        }
-
-    def set_pomodoro_durations(self, work_minutes=25, break_minutes=5):
-        """Set custom Pomodoro durations"""
-        self.work_duration = work_minutes * 60
-        self.break_duration = break_minutes * 60
-
-    def get_remaining_time(self):
-        """Get remaining time in minutes and seconds"""
-        if not self.is_running:
-            return 0, 0
-        return self.duration // 60, self.duration % 60
\ No newline at end of file
+from datetime import datetime, timedelta
+from database import Database, rebuild_tracked_time
+from downsample import BUCKET_SQL, bucket_starts, choose_bucket, to_date
+from sketches import SESSION_KIND, DurationSketches, add_session_sketches
+from timer_service import TimerService, TimerState
+
+
+ROLLUP_UPSERT = '''
+                INSERT INTO time_rollups (day, session_type, task_id, total_seconds, session_count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (day, session_type, task_id) DO UPDATE
+                    SET total_seconds = total_seconds + excluded.total_seconds,
+                        session_count = session_count + excluded.session_count \
+                '''
+
+
+def parse_start_time(value):
+    """datetime of a stored start_time; date-only values start at midnight, offsets become local time"""
+    start_time = datetime.fromisoformat(value)
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone().replace(tzinfo=None)
+    return start_time
+
+
+def split_by_day(start_time, duration):
+    """Split a session into (day, seconds) pieces at midnight boundaries"""
+    pieces = []
+    remaining = duration
+    current = start_time
+
+    while remaining > 0:
+        next_midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
+        seconds = min(remaining, max(1, int((next_midnight - current).total_seconds())))
+        pieces.append((current.date().isoformat(), seconds))
+        remaining -= seconds
+        current = next_midnight
+
+    return pieces
+
+
+def rollup_rows(task_id, start_time, duration, session_type):
+    """Rows for ROLLUP_UPSERT; the session is counted on its first day only"""
+    return [
+        (day, session_type or 'pomodoro', task_id or 0, seconds, 1 if index == 0 else 0)
+        for index, (day, seconds) in enumerate(split_by_day(start_time, duration))
+    ]
+
+
+def add_session_rollups(conn, sessions):
+    """Add closed sessions, given as (task_id, start_time, duration, session_type), to time_rollups
+
+    The duration sketches of the sessions are updated in the same transaction.
+    """
+    sessions = list(sessions)
+    rows = []
+    for task_id, start_time, duration, session_type in sessions:
+        if duration and duration > 0:
+            if isinstance(start_time, str):
+                start_time = parse_start_time(start_time)
+            rows.extend(rollup_rows(task_id, start_time, duration, session_type))
+    if rows:
+        conn.executemany(ROLLUP_UPSERT, rows)
+    add_session_sketches(conn, sessions)
+
+
+def close_session(db, session_id, task_id, start_time, end_time, duration, session_type):
+    """Record the end of a session and add it to the daily rollups in one transaction
+
+    Only a session that is still open is closed, so when two processes both
+    finish the same timer the second call changes nothing and returns False.
+    """
+    conn = db.get_connection()
+    try:
+        with conn:
+            closed = conn.execute('''
+                                  UPDATE time_sessions
+                                  SET end_time = ?, \
+                                      duration = ?
+                                  WHERE id = ? \
+                                    AND end_time IS NULL \
+                                  ''', (end_time.isoformat(), duration, session_id)).rowcount == 1
+            if closed:
+                add_session_rollups(conn, [(task_id, start_time, duration, session_type)])
+    finally:
+        conn.close()
+    return closed
+
+
+class TimeTracker:
+    def __init__(self, db_path="task_manager.db", timer_service=None, owner="default"):
+        self.db = Database(db_path)
+        self._ensure_rollups()
+        self.sketches = DurationSketches(db_path)
+        self._timers = timer_service
+        self._timer = None
+        self._restored = False
+        self.owner = owner
+        self.current_session = None
+        self.current_task_id = None
+        self.current_session_type = None
+        self.start_time = None
+        self.duration = 0
+        self.on_tick = None
+        self.on_complete = None
+
+        # Pomodoro settings
+        self.work_duration = 25 * 60  # 25 minutes
+        self.break_duration = 5 * 60  # 5 minutes
+        self.is_break = False
+
+    @property
+    def timers(self):
+        """The timer service, loaded on first use
+
+        Trackers that only read statistics (Analytics, reports, repair,
+        shards) never load it, so they never restore or finish timers.
+        """
+        if self._timers is None:
+            self._timers = TimerService.shared(self.db.db_path)
+        return self._timers
+
+    @property
+    def timer(self):
+        """This owner's active timer, picked up from the timer service on first use"""
+        if not self._restored:
+            self._restore_timer()
+        return self._timer
+
+    @property
+    def is_running(self):
+        return self.timer is not None and self.timer.is_active
+
+    @property
+    def is_paused(self):
+        return self.timer is not None and self.timer.state == TimerState.PAUSED
+
+    def start_pomodoro(self, task_id=None, on_tick=None, on_complete=None):
+        """Start a Pomodoro session"""
+        return self._start(self.work_duration, 'pomodoro_work', task_id, on_tick, on_complete)
+
+    def start_break(self, on_tick=None, on_complete=None):
+        """Start a break session"""
+        return self._start(self.break_duration, 'pomodoro_break', None, on_tick, on_complete)
+
+    def _start(self, duration, session_type, task_id, on_tick, on_complete):
+        if self.is_running:
+            return False
+
+        self.is_break = session_type == 'pomodoro_break'
+        self.duration = duration
+        self.start_time = datetime.now()
+        self.on_tick = on_tick
+        self.on_complete = on_complete
+        self.current_task_id = task_id
+        self.current_session_type = session_type
+
+        # Create time session record
+        query = '''
+                INSERT INTO time_sessions (task_id, start_time, session_type)
+                VALUES (?, ?, ?) \
+                '''
+        self.current_session = self.db.execute_query(
+            query, (task_id, self.start_time.isoformat(), session_type)
+        )
+
+        # The shared timer service closes the session when the time is up
+        self._timer = self.timers.start(
+            duration, owner=self.owner, task_id=task_id, session_id=self.current_session,
+            session_type=session_type, on_tick=self._handle_tick, on_complete=self._handle_complete
+        )
+        return True
+
+    def pause_timer(self):
+        """Pause the current timer"""
+        return self.timer is not None and self.timers.pause(self.timer.id)
+
+    def resume_timer(self):
+        """Resume a paused timer"""
+        return self.timer is not None and self.timers.resume(self.timer.id)
+
+    def stop_timer(self):
+        """Stop the current timer"""
+        if not self.is_running:
+            return
+
+        timer = self.timers.stop(self.timer.id)
+        if timer is not None and self.current_session:
+            close_session(self.db, self.current_session, self.current_task_id, self.start_time,
+                          datetime.now(), int(timer.elapsed()), self.current_session_type)
+        self.current_session = None
+
+    def _restore_timer(self):
+        """Pick up this owner's timer if one was still active
+
+        Callbacks are not re-attached here, so a tracker that only looks at
+        the timer never takes over another tracker's callbacks.
+        """
+        self._restored = True
+        for timer in self.timers.active_timers(self.owner):
+            if timer.session_id is None:
+                continue
+            self._timer = timer
+            self.current_session = timer.session_id
+            self.current_task_id = timer.task_id
+            self.current_session_type = timer.session_type
+            self.is_break = timer.session_type == 'pomodoro_break'
+            self.start_time = timer.started_at
+            self.duration = int(timer.remaining())
+            break
+
+    def _handle_tick(self, timer):
+        minutes, seconds = timer.remaining_display()
+        self.duration = minutes * 60 + seconds
+        if self.on_tick:
+            self.on_tick(minutes, seconds, self.is_break)
+
+    def _handle_complete(self, timer):
+        self.duration = 0
+        self.current_session = None
+        if self.on_complete:
+            self.on_complete(self.is_break)
+
+    def changes_since(self, seq=0, limit=None):
+        """Get time session changes recorded after seq (see Database.changes_since)"""
+        return self.db.changes_since(seq, ('time_sessions',), limit)
+
+    def get_time_statistics(self, days=7):
+        """Get time tracking statistics of the last `days` days, today included
+
+        daily_breakdown has one entry per day with tracked time, newest
+        first, for the whole range (it used to stop at seven days).
+        """
+        start_day = (datetime.now() - timedelta(days=days - 1)).date().isoformat()
+
+        # One read of the daily rollups covers all three breakdowns
+        query = '''
+                SELECT day, session_type, SUM(total_seconds) as total_time
+                FROM time_rollups
+                WHERE day >= ?
+                GROUP BY day, session_type \
+                '''
+        results = self.db.fetch_all(query, (start_day,))
+
+        total_time = 0
+        time_by_type = {}
+        time_by_day = {}
+        for day, session_type, seconds in results:
+            total_time += seconds
+            time_by_type[session_type] = time_by_type.get(session_type, 0) + seconds
+            time_by_day[day] = time_by_day.get(day, 0) + seconds
+
+        # Daily time spent, newest first
+        daily_results = [
+            {'date': day, 'total_time': time_by_day[day]}
+            for day in sorted(time_by_day, reverse=True)
+        ]
+
+        return {
+            'total_time_minutes': total_time // 60 if total_time else 0,
+            'time_by_type': time_by_type,
+            'daily_breakdown': daily_results
+        }
+
+    def get_time_series(self, start_date, end_date=None, max_buckets=400, session_type=None):
+        """Seconds tracked per bucket over any range, aggregated in SQL from the rollups
+
+        The bucket (day, week, month or year) is the smallest that keeps the
+        range within max_buckets. Returns (bucket, [(first day, seconds)])
+        with a zero for every bucket without time.
+        """
+        start_day = to_date(start_date)
+        end_day = to_date(end_date or datetime.now())
+        bucket = choose_bucket(start_day, end_day, max_buckets)
+
+        # Sum per day first so the bucket expression runs once per day, not once per rollup row
+        query = "SELECT day, SUM(total_seconds) AS seconds FROM time_rollups WHERE day BETWEEN ? AND ?"
+        params = [start_day.isoformat(), end_day.isoformat()]
+        if session_type:
+            query += " AND session_type = ?"
+            params.append(session_type)
+        query += " GROUP BY day"
+        query = f"SELECT {BUCKET_SQL[bucket]} AS bucket, SUM(seconds) FROM ({query}) GROUP BY bucket"
+        totals = dict(self.db.fetch_all(query, params))
+
+        return bucket, [(day.isoformat(), totals.get(day.isoformat(), 0))
+                        for day in bucket_starts(start_day, end_day, bucket)]
+
+    def get_daily_totals(self, start_date, end_date=None, session_type=None, task_id=None):
+        """Get [(day, seconds)] from the rollups for start_date <= day <= end_date"""
+        query = "SELECT day, SUM(total_seconds) FROM time_rollups WHERE day >= ?"
+        params = [start_date.isoformat()[:10]]
+
+        if end_date:
+            query += " AND day <= ?"
+            params.append(end_date.isoformat()[:10])
+
+        if session_type:
+            query += " AND session_type = ?"
+            params.append(session_type)
+
+        if task_id is not None:
+            query += " AND task_id = ?"
+            params.append(task_id)
+
+        query += " GROUP BY day ORDER BY day"
+        return self.db.fetch_all(query, params)
+
+    def get_session_percentiles(self, days=30, session_type=None):
+        """Count, mean and p50/p90/p99 of session lengths (seconds) over the last `days` days"""
+        return self.sketches.percentiles(SESSION_KIND, days, session_type)
+
+    def get_session_percentiles_by_type(self, days=30):
+        """Session length percentiles per session type"""
+        return self.sketches.percentiles_by_key(SESSION_KIND, days)
+
+    def rebuild_rollups(self):
+        """Recompute time_rollups from all closed sessions in one pass"""
+        totals = {}
+        query = "SELECT task_id, start_time, duration, session_type FROM time_sessions WHERE duration > 0"
+        for task_id, start_time, duration, session_type in self.db.iter_query(query, batch_size=10000):
+            start_time = parse_start_time(start_time)
+            # Most sessions end on the day they start; skip splitting for those
+            seconds_into_day = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+            if duration <= 86400 - seconds_into_day:
+                rows = [(start_time.date().isoformat(), session_type or 'pomodoro', task_id or 0, duration, 1)]
+            else:
+                rows = rollup_rows(task_id, start_time, duration, session_type)
+
+            for row in rows:
+                key = row[:3]
+                entry = totals.get(key)
+                if entry is None:
+                    totals[key] = [row[3], row[4]]
+                else:
+                    entry[0] += row[3]
+                    entry[1] += row[4]
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM time_rollups")
+                conn.executemany(
+                    "INSERT INTO time_rollups (day, session_type, task_id, total_seconds, session_count) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key + tuple(value) for key, value in totals.items())
+                )
+        finally:
+            conn.close()
+
+    def rebuild_tracked_time(self):
+        """Recompute every task's tracked_seconds from its sessions in one grouped pass"""
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                rebuild_tracked_time(conn.cursor())
+        finally:
+            conn.close()
+
+    def _ensure_rollups(self):
+        """Build the rollups for databases that have sessions but no rollups yet"""
+        if self.db.read_only or self.db.fetch_all("SELECT 1 FROM time_rollups LIMIT 1"):
+            return
+        if self.db.fetch_all("SELECT 1 FROM time_sessions WHERE duration > 0 LIMIT 1"):
+            self.rebuild_rollups()
+
+    def set_pomodoro_durations(self, work_minutes=25, break_minutes=5):
+        """Set custom Pomodoro durations"""
+        self.work_duration = work_minutes * 60
+        self.break_duration = break_minutes * 60
+
+    def get_remaining_time(self):
+        """Get remaining time in minutes and seconds"""
+        if not self.is_running:
+            return 0, 0
+        return self.timer.remaining_display()
\ No newline at end of file
@@ -0,0 +1,322 @@
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from database import Database
+
+
+class TimerState:
+    RUNNING = "running"
+    PAUSED = "paused"
+    FINISHED = "finished"
+    STOPPED = "stopped"
+
+
+ACTIVE_STATES = (TimerState.RUNNING, TimerState.PAUSED)
+
+logger = logging.getLogger("task_manager.timers")
+
+
+class Timer:
+    """A countdown owned by a TimerService"""
+
+    def __init__(self, id, duration, remaining=None, owner=None, task_id=None, session_id=None,
+                 session_type=None, state=TimerState.RUNNING, started_at=None):
+        self.id = id
+        self.duration = duration
+        self.owner = owner
+        self.task_id = task_id
+        self.session_id = session_id
+        self.session_type = session_type
+        self.state = state
+        self.started_at = started_at or datetime.now()
+        self.on_tick = None
+        self.on_complete = None
+
+        self._remaining = duration if remaining is None else remaining  # While paused
+        self._deadline = None  # time.monotonic() deadline while running
+        self._version = 0  # Bumped to invalidate queued heap entries
+
+    def remaining(self):
+        """Seconds left on the timer"""
+        if self.state == TimerState.RUNNING:
+            return max(0.0, self._deadline - time.monotonic())
+        if self.state == TimerState.FINISHED:
+            return 0.0
+        return self._remaining
+
+    def remaining_display(self):
+        """(minutes, seconds) left, rounded up to whole seconds"""
+        seconds = math.ceil(self.remaining())
+        return seconds // 60, seconds % 60
+
+    def elapsed(self):
+        """Seconds the timer has actually been running"""
+        return self.duration - self.remaining()
+
+    @property
+    def is_active(self):
+        return self.state in ACTIVE_STATES
+
+
+class TimerService:
+    """Runs any number of timers from a single scheduler thread
+
+    Upcoming ticks and deadlines of all running timers share one heap; the
+    thread sleeps until the earliest entry. Timers without an on_tick
+    callback only ever have their deadline queued. Timer state is kept in
+    the timers table so running and paused timers survive a restart.
+    Callbacks run on the scheduler thread and should return quickly.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path="task_manager.db"):
+        """Return the process-wide service for a database"""
+        with cls._shared_lock:
+            service = cls._shared.get(db_path)
+            if service is None:
+                service = cls._shared[db_path] = cls(db_path)
+            return service
+
+    def __init__(self, db_path="task_manager.db", tick_interval=1.0):
+        self.db = Database(db_path)
+        self.tick_interval = tick_interval
+        self._timers = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._load()
+
+    # Public API
+    def start(self, duration, owner=None, task_id=None, session_id=None, session_type=None,
+              on_tick=None, on_complete=None):
+        """Start a new timer of duration seconds and return it"""
+        started_at = datetime.now()
+        timer_id = self.db.execute_query('''
+                                         INSERT INTO timers (owner, task_id, session_id, session_type, duration,
+                                                             remaining, state, ends_at, started_at, updated_at)
+                                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) \
+                                         ''', (owner, task_id, session_id, session_type, duration, duration,
+                                               TimerState.RUNNING,
+                                               (started_at + timedelta(seconds=duration)).isoformat(),
+                                               started_at.isoformat(), started_at.isoformat()))
+
+        timer = Timer(timer_id, duration, owner=owner, task_id=task_id, session_id=session_id,
+                      session_type=session_type, started_at=started_at)
+        timer.on_tick = on_tick
+        timer.on_complete = on_complete
+
+        with self._condition:
+            self._timers[timer_id] = timer
+            self._schedule(timer, duration)
+        self._ensure_thread()
+        return timer
+
+    def attach(self, timer_id, on_tick=None, on_complete=None):
+        """Set the callbacks of a timer, e.g. one restored after a restart"""
+        with self._condition:
+            timer = self._timers.get(timer_id)
+            if timer is None:
+                return None
+            timer.on_tick = on_tick
+            timer.on_complete = on_complete
+            if timer.state == TimerState.RUNNING:
+                self._schedule(timer, timer.remaining())
+            return timer
+
+    def pause(self, timer_id):
+        """Pause a running timer"""
+        with self._condition:
+            timer = self._timers.get(timer_id)
+            if timer is None or timer.state != TimerState.RUNNING:
+                return False
+            timer._remaining = timer.remaining()
+            timer.state = TimerState.PAUSED
+            timer._version += 1
+        self._save(timer)
+        return True
+
+    def resume(self, timer_id):
+        """Resume a paused timer"""
+        with self._condition:
+            timer = self._timers.get(timer_id)
+            if timer is None or timer.state != TimerState.PAUSED:
+                return False
+            timer.state = TimerState.RUNNING
+            self._schedule(timer, timer._remaining)
+        self._save(timer)
+        self._ensure_thread()
+        return True
+
+    def stop(self, timer_id):
+        """Stop a timer early and return it (None if it was not active)"""
+        with self._condition:
+            timer = self._timers.pop(timer_id, None)
+            if timer is None:
+                return None
+            timer._remaining = timer.remaining()
+            timer.state = TimerState.STOPPED
+            timer._version += 1
+        self._save(timer)
+        return timer
+
+    def get(self, timer_id):
+        """Return an active timer"""
+        return self._timers.get(timer_id)
+
+    def active_timers(self, owner=None):
+        """Return running and paused timers, optionally only those of one owner"""
+        with self._condition:
+            return [timer for timer in self._timers.values()
+                    if owner is None or timer.owner == owner]
+
+    def shutdown(self):
+        """Stop the scheduler thread; active timers stay persisted"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    # Scheduling
+    def _schedule(self, timer, remaining):
+        timer._deadline = time.monotonic() + remaining
+        timer._version += 1
+        self._push(timer, time.monotonic())
+        self._condition.notify()
+
+    def _push(self, timer, now):
+        """Queue the next event of a running timer: its next tick or its deadline"""
+        when = timer._deadline
+        if timer.on_tick is not None:
+            when = min(when, now + self.tick_interval)
+        heapq.heappush(self._heap, (when, next(self._counter), timer.id, timer._version))
+
+    def _ensure_thread(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="timer-service")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            ticks = []
+            finished = []
+
+            with self._condition:
+                if not self._running:
+                    return
+
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, timer_id, version = heapq.heappop(self._heap)
+                    timer = self._timers.get(timer_id)
+                    if timer is None or timer._version != version or timer.state != TimerState.RUNNING:
+                        continue  # Stale entry
+
+                    if timer._deadline <= now:
+                        timer.state = TimerState.FINISHED
+                        timer._remaining = 0
+                        del self._timers[timer_id]
+                        finished.append(timer)
+                    else:
+                        self._push(timer, now)
+                        ticks.append(timer)
+
+                if not ticks and not finished:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._condition.wait(timeout)
+                    continue
+
+            for timer in ticks:
+                self._callback(timer.on_tick, timer)
+
+            # One thread runs every timer of the process, so nothing may escape from here
+            if finished:
+                try:
+                    self._save(*finished)
+                except Exception:
+                    logger.exception("Could not save %d finished timer(s)", len(finished))
+            for timer in finished:
+                try:
+                    self._close_session(timer)
+                except Exception:
+                    logger.exception("Could not close the session of timer %s", timer.id)
+                self._callback(timer.on_complete, timer)
+
+    def _callback(self, callback, timer):
+        if callback is None:
+            return
+        try:
+            callback(timer)
+        except Exception:
+            logger.exception("Timer %s callback failed", timer.id)  # e.g. a destroyed Tk widget
+
+    # Persistence
+    def _load(self):
+        """Restore running and paused timers saved by an earlier process"""
+        rows = self.db.fetch_all('''
+                                 SELECT id, owner, task_id, session_id, session_type, duration, remaining,
+                                        state, ends_at, started_at
+                                 FROM timers
+                                 WHERE state IN (?, ?) \
+                                 ''', ACTIVE_STATES)
+        now = datetime.now()
+        has_running = False
+
+        with self._condition:
+            for (timer_id, owner, task_id, session_id, session_type, duration, remaining,
+                 state, ends_at, started_at) in rows:
+                timer = Timer(timer_id, duration, remaining, owner, task_id, session_id, session_type,
+                              state, datetime.fromisoformat(started_at))
+                self._timers[timer_id] = timer
+                if state == TimerState.RUNNING:
+                    # Wall-clock time passed while we were down still counts
+                    left = (datetime.fromisoformat(ends_at) - now).total_seconds()
+                    self._schedule(timer, max(0.0, left))
+                    has_running = True
+
+        if has_running:
+            self._ensure_thread()
+
+    def _save(self, *timers):
+        """Write the state of one or more timers in a single transaction"""
+        now = datetime.now()
+        rows = []
+        for timer in timers:
+            remaining = timer.remaining()
+            ends_at = None
+            if timer.state == TimerState.RUNNING:
+                ends_at = (now + timedelta(seconds=remaining)).isoformat()
+            rows.append((remaining, timer.state, ends_at, now.isoformat(), timer.id))
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.executemany('''
+                                 UPDATE timers
+                                 SET remaining  = ?,
+                                     state      = ?,
+                                     ends_at    = ?,
+                                     updated_at = ?
+                                 WHERE id = ? \
+                                 ''', rows)
+        finally:
+            conn.close()
+
+    def _close_session(self, timer):
+        """Close the time session a finished timer was tracking"""
+        if timer.session_id is None:
+            return
+        from time_tracker import close_session  # time_tracker imports this module
+        close_session(self.db, timer.session_id, timer.task_id, timer.started_at,
+                      datetime.now(), int(timer.duration), timer.session_type)
@@ -0,0 +1,170 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from database import Database
+
+
+class PendingWrite:
+    """A queued call; callbacks get (result, error) once it has been committed"""
+
+    def __init__(self, func, args, kwargs, key=None, callback=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.callbacks = [callback] if callback else []
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the write has been committed (or failed) and return its result"""
+        if not self.done.wait(timeout):
+            raise TimeoutError("Write still pending")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class WriteBehindQueue:
+    """Applies writes on a background thread in grouped transactions
+
+    submit() returns at once. Redundant writes coalesce while they are
+    still queued: a call of the same function as the last queued write with
+    the same key merges its arguments into that write. A call of another
+    function is queued behind it, so e.g. completing and then deleting a
+    task runs both, in order. The writer thread takes up to max_batch
+    writes at a time, waiting up to max_delay seconds for more to arrive,
+    and commits them in one transaction; each write runs in its own
+    savepoint, so a failing write does not undo the others, and its change
+    notifications are dropped with it. Listeners hear of the other writes
+    once the batch has committed. Callbacks are called through dispatch
+    (e.g. a Tk after() wrapper) or on the writer thread if none is given.
+    Queued writes are flushed at exit.
+    """
+
+    def __init__(self, db_path="task_manager.db", dispatch=None, max_batch=100, max_delay=0.05):
+        self.db = Database(db_path)
+        self.dispatch = dispatch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = OrderedDict()  # sequence number -> PendingWrite, in submission order
+        self._latest = {}  # key -> its most recent PendingWrite still queued
+        self._counter = 0
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind")
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, func, *args, key=None, callback=None, **kwargs):
+        """Queue func(*args, **kwargs) and return its PendingWrite"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+
+            queued = self._latest.get(key) if key is not None else None
+            if queued is not None and queued.func == func:
+                # Same operation on the same row again: the newest arguments win
+                queued.args = args
+                queued.kwargs.update(kwargs)
+                if callback:
+                    queued.callbacks.append(callback)
+                self._condition.notify()
+                return queued
+
+            write = PendingWrite(func, args, dict(kwargs), key, callback)
+            self._counter += 1
+            self._pending[self._counter] = write
+            if key is not None:
+                self._latest[key] = write
+            self._condition.notify()
+            return write
+
+    def pending_count(self):
+        """Writes queued or being committed"""
+        with self._condition:
+            return len(self._pending) + self._in_flight
+
+    def flush(self, timeout=None):
+        """Wait until every write submitted so far has been committed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        """Flush queued writes and stop the writer thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                # Give a burst of clicks a moment to coalesce into one transaction
+                deadline = time.monotonic() + self.max_delay
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = []
+                while self._pending and len(batch) < self.max_batch:
+                    write = self._pending.popitem(last=False)[1]
+                    if write.key is not None and self._latest.get(write.key) is write:
+                        del self._latest[write.key]
+                    batch.append(write)
+                self._in_flight = len(batch)
+
+            self._apply(batch)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _apply(self, batch):
+        try:
+            with self.db.transaction():
+                for write in batch:
+                    try:
+                        with self.db.savepoint():
+                            write.result = write.func(*write.args, **write.kwargs)
+                    except Exception as e:
+                        write.error = e
+        except Exception as e:
+            # The commit itself failed, so none of the batch was stored
+            for write in batch:
+                write.result = None
+                write.error = e
+
+        for write in batch:
+            write.done.set()
+            for callback in write.callbacks:
+                self._report(callback, write.result, write.error)
+
+    def _report(self, callback, result, error):
+        try:
+            if self.dispatch is not None:
+                self.dispatch(lambda: callback(result, error))
+            else:
+                callback(result, error)
+        except Exception:
+            pass  # A broken callback (or a closed window) must not stop the writer